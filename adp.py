@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+
+from matching import PlayerMatcher
+
+# ADP sources in data.csv; the second "Sleeper" header column holds ESPN ADP
+ADP_SOURCES = ['Underdog', 'Sleeper', 'ESPN']
+
+
+# Read the ADP CSV and coerce the ADP columns to numbers
+def read_adp_data(path='data.csv'):
+    data = pd.read_csv(path)
+    data.rename(columns={'Sleeper.1': 'ESPN'}, inplace=True)
+    data[ADP_SOURCES] = data[ADP_SOURCES].apply(pd.to_numeric, errors='coerce')
+    return data
+
+
+class AdpIndex:
+    """Player-name index over the ADP table.
+
+    Built once per process so every lookup is a dict hit (or a blocked fuzzy
+    match, see ``matching.PlayerMatcher``) instead of a lowercase scan over
+    the whole ``Name`` column.
+    """
+
+    def __init__(self, data, aliases=None, player_ids=None):
+        self.data = data
+        self.values = data[ADP_SOURCES].to_numpy(dtype=np.float32)
+        self.columns = {source: i for i, source in enumerate(ADP_SOURCES)}
+        self.matcher = PlayerMatcher(data['Name'], aliases=aliases, player_ids=player_ids,
+                                     positions=data['Pos'] if 'Pos' in data else None)
+        self.player_table = None
+        self.table_positions = None
+        self._value_curve = None
+
+    # Resolve Sleeper player_ids through a player_table.PlayerTable with one gather per column
+    def attach_player_table(self, table):
+        self.table_positions = np.full(len(table), -1, dtype=np.int64)
+        for row in np.flatnonzero(np.asarray(table.adp_row) >= 0):
+            adp_row = self.matcher.row_for_name(table.adp_name[row])
+            self.table_positions[row] = -1 if adp_row is None else adp_row
+        self.player_table = table
+
+    # Pick-value curve over this table (see value_curve.py), built on first use
+    @property
+    def value_curve(self):
+        if self._value_curve is None:
+            from value_curve import ValueCurve
+
+            self._value_curve = ValueCurve(self.values)
+        return self._value_curve
+
+    @property
+    def has_player_ids(self):
+        return self.player_table is not None or bool(self.matcher.player_ids)
+
+    def __contains__(self, player_name):
+        return self.position(player_name) is not None
+
+    # Return the row position for a player, or None if they aren't listed.
+    # player_position (the pick's position) keeps fuzzy matches to the same position.
+    def position(self, player_name, player_id=None, player_position=None):
+        return self.matcher.match(player_name, player_id, player_position)
+
+    # Row positions for a column of names (and optional Sleeper IDs and positions), -1 when unmatched
+    def positions(self, names, player_ids=None, player_positions=None):
+        if player_ids is not None and self.player_table is not None:
+            rows = self.player_table.rows_for(player_ids)
+            positions = np.where(rows >= 0, self.table_positions[np.maximum(rows, 0)], -1)
+            misses = positions < 0
+            if misses.any():
+                miss_positions = None if player_positions is None else np.asarray(player_positions, dtype=object)[misses]
+                positions[misses] = self.positions(np.asarray(names)[misses], player_positions=miss_positions)
+            return positions
+        player_positions = [None] * len(names) if player_positions is None else list(player_positions)
+        if player_ids is None:
+            pairs = list(zip(names, player_positions))
+            unique = {pair: self.position(pair[0], player_position=pair[1]) for pair in dict.fromkeys(pairs)}
+            return np.array([-1 if unique[pair] is None else unique[pair] for pair in pairs], dtype=np.int64)
+        return np.array(
+            [-1 if (p := self.position(name, player_id, position)) is None else p
+             for name, player_id, position in zip(names, player_ids, player_positions)],
+            dtype=np.int64,
+        )
+
+    # Return the ADP row for a player as a Series, or None if they aren't listed
+    def row(self, player_name):
+        position = self.position(player_name)
+        if position is None:
+            return None
+        return self.data.iloc[position]
+
+    # Return the ADP from one source, or NaN if the player or value is missing
+    def adp(self, player_name, column_name):
+        position = self.position(player_name)
+        if position is None:
+            return np.nan
+        return self.values[position, self.columns[column_name]]
+
+
+# Convenience wrapper used by the apps' cached loaders
+def build_adp_index(data, aliases=None, player_ids=None, player_table=None):
+    adp_index = AdpIndex(data, aliases=aliases, player_ids=player_ids)
+    if player_table is not None:
+        adp_index.attach_player_table(player_table)
+    return adp_index
@@ -0,0 +1,208 @@
+"""Multi-source, multi-season ADP history.
+
+Dated ADP snapshots are ingested into a SQLite table indexed by
+(source, player, date). Only change points are stored: a row is written when
+a player's ADP from a source differs from its latest value (NULL marks a
+player dropping off a source), so snapshots must be ingested in date order.
+``adp_as_of(date)`` rebuilds the ADP table in ``load_adp_table``'s shape
+from the latest change point per player and source, so no snapshot file is
+ever reread. Players are keyed by their name as the source spells it
+(``canonical_key`` without nickname expansion), so "Mike Thomas" and
+"Michael Thomas" stay two players; a snapshot listing one key twice is
+rejected.
+
+    python adp_history.py data.csv 2024-08-20
+    python adp_history.py adp_snapshots/        # files named YYYY-MM-DD*.csv
+    python adp_history.py underdog.csv 2024-08-20 Underdog   # Name,ADP[,Team,Pos]
+"""
+import datetime
+import glob
+import hashlib
+import os
+import re
+import sys
+
+import numpy as np
+import pandas as pd
+
+from adp import ADP_SOURCES
+from adp_store import validate_adp_csv
+from matching import canonical_key
+from storage import SQLiteStore
+
+HISTORY_PATH = 'adp_history.sqlite'
+
+_DATED_FILE = re.compile(r'(\d{4}-\d{2}-\d{2})')
+
+
+class AdpHistory(SQLiteStore):
+    """Append-only store of ADP change points per (source, player, date)."""
+
+    def __init__(self, path=HISTORY_PATH):
+        super().__init__(path)
+        conn = self._connect()
+        with conn:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS adp_history (
+                    source TEXT NOT NULL,
+                    player_key TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    adp REAL,
+                    PRIMARY KEY (source, player_key, date)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS adp_current (
+                    source TEXT NOT NULL,
+                    player_key TEXT NOT NULL,
+                    adp REAL,
+                    PRIMARY KEY (source, player_key)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS players (
+                    player_key TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    team TEXT,
+                    pos TEXT
+                );
+                CREATE TABLE IF NOT EXISTS snapshots (
+                    sha1 TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    path TEXT,
+                    PRIMARY KEY (sha1, source)
+                );
+                """
+            )
+
+    # Latest ingested snapshot date per source
+    def latest_dates(self):
+        return dict(self._connect().execute('SELECT source, MAX(date) FROM snapshots GROUP BY source'))
+
+    # Ingest one source's ADP for a date: a DataFrame with Name, ADP and optional Team/Pos.
+    # Snapshots must arrive in date order per source; returns the number of rows written.
+    def ingest_frame(self, frame, source, date, sha1=None, path=None):
+        date = _iso_date(date)
+        conn = self._connect()
+        if sha1 is not None and conn.execute(
+            'SELECT 1 FROM snapshots WHERE sha1 = ? AND source = ?', (sha1, source)
+        ).fetchone():
+            return 0
+        latest = self.latest_dates().get(source)
+        if latest is not None and date < latest:
+            raise ValueError(f"{source} snapshot for {date} is older than the latest ingested ({latest})")
+
+        keys = frame['Name'].map(player_key)
+        duplicated = frame['Name'][keys.duplicated(keep=False)]
+        if len(duplicated):
+            raise ValueError(f"{source} snapshot for {date} lists players under the same key: {', '.join(duplicated)}")
+        adp = pd.to_numeric(frame['ADP'], errors='coerce')
+        snapshot = {key: None if pd.isna(value) else float(value) for key, value in zip(keys, adp)}
+        current = dict(conn.execute('SELECT player_key, adp FROM adp_current WHERE source = ?', (source,)))
+
+        changes = [(source, key, date, value) for key, value in snapshot.items() if current.get(key, None) != value]
+        # Players that dropped off the source since the last snapshot
+        changes += [(source, key, date, None) for key, value in current.items() if value is not None and key not in snapshot]
+
+        with conn:
+            conn.executemany(
+                'INSERT INTO players VALUES (?, ?, ?, ?) ON CONFLICT (player_key) DO UPDATE SET '
+                'name = excluded.name, team = COALESCE(excluded.team, team), pos = COALESCE(excluded.pos, pos)',
+                zip(keys, frame['Name'], frame.get('Team', [None] * len(frame)), frame.get('Pos', [None] * len(frame))),
+            )
+            conn.executemany('INSERT OR REPLACE INTO adp_history VALUES (?, ?, ?, ?)', changes)
+            conn.executemany(
+                'INSERT OR REPLACE INTO adp_current VALUES (?, ?, ?)', [(s, key, value) for s, key, _, value in changes]
+            )
+            conn.execute(
+                'INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?)', (sha1 or f'{source}:{date}', source, date, path)
+            )
+        return len(changes)
+
+    # Ingest a CSV snapshot. Without a source it must be in data.csv's multi-source layout.
+    def ingest_file(self, path, date=None, source=None):
+        if date is None:
+            match = _DATED_FILE.search(os.path.basename(path))
+            if match is None:
+                raise ValueError(f"{path}: no date given and none in the file name")
+            date = match.group(1)
+        with open(path, 'rb') as f:
+            sha1 = hashlib.sha1(f.read()).hexdigest()
+
+        written = 0
+        if source is None:
+            data = validate_adp_csv(path)
+            for column in ADP_SOURCES:
+                frame = data[['Name', 'Team', 'Pos']].astype(object).assign(ADP=data[column])
+                written += self.ingest_frame(frame, column, date, sha1, path)
+        else:
+            written += self.ingest_frame(pd.read_csv(path), source, date, sha1, path)
+        return written
+
+    # Ingest every dated CSV in a directory, oldest first, skipping files already seen
+    def ingest_directory(self, directory, source=None):
+        dated = []
+        for path in glob.glob(os.path.join(directory, '*.csv')):
+            match = _DATED_FILE.search(os.path.basename(path))
+            if match is not None:
+                dated.append((match.group(1), path))
+        return sum(self.ingest_file(path, date, source) for date, path in sorted(dated))
+
+    # {player_key: adp} in force for one source on a date; one index seek per player
+    def _state(self, source, date):
+        rows = self._connect().execute(
+            """
+            SELECT player_key, (
+                SELECT adp FROM adp_history h
+                WHERE h.source = ? AND h.player_key = p.player_key AND h.date <= ?
+                ORDER BY h.date DESC LIMIT 1
+            ) FROM players p
+            """,
+            (source, date),
+        )
+        return {key: adp for key, adp in rows if adp is not None}
+
+    # ADP table (Rank, Name, Team, Pos and one column per source) as it stood on a date
+    def adp_as_of(self, date):
+        date = _iso_date(date)
+        conn = self._connect()
+        players = pd.read_sql_query('SELECT player_key, name AS Name, team AS Team, pos AS Pos FROM players', conn)
+        data = players.set_index('player_key')
+        for source in ADP_SOURCES:
+            state = self._state(source, date)
+            data[source] = pd.Series(state, dtype='float64').reindex(data.index).astype(np.float32)
+        data = data.dropna(subset=ADP_SOURCES, how='all')
+        # Rank the way data.csv does: by Sleeper ADP, then the other sources
+        data = data.sort_values(['Sleeper', 'Underdog', 'ESPN'], na_position='last', kind='stable')
+        data.insert(0, 'Rank', np.arange(1, len(data) + 1, dtype=np.int32))
+        return data.reset_index(drop=True)
+
+    # Whether anything has been ingested on or before a date
+    def has_data(self, date=None):
+        query, args = 'SELECT 1 FROM snapshots', ()
+        if date is not None:
+            query, args = query + ' WHERE date <= ?', (_iso_date(date),)
+        return self._connect().execute(query + ' LIMIT 1', args).fetchone() is not None
+
+
+# History key for a player name: normalized, but nicknames are kept so different players never collide
+def player_key(name):
+    return canonical_key(name, nicknames=False)
+
+
+# Accept dates, datetimes, Sleeper millisecond timestamps or ISO strings
+def _iso_date(value):
+    if isinstance(value, (int, float, np.integer)):
+        return datetime.datetime.fromtimestamp(value / 1000, tz=datetime.timezone.utc).date().isoformat()
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()[:10]
+    return pd.Timestamp(value).date().isoformat()
+
+
+if __name__ == '__main__':
+    history = AdpHistory()
+    target = sys.argv[1]
+    if os.path.isdir(target):
+        written = history.ingest_directory(target, source=sys.argv[2] if len(sys.argv) > 2 else None)
+    else:
+        written = history.ingest_file(target, sys.argv[2] if len(sys.argv) > 2 else None,
+                                      sys.argv[3] if len(sys.argv) > 3 else None)
+    print(f"Wrote {written} ADP changes to {history.path}")
@@ -0,0 +1,121 @@
+"""Compact, pre-parsed ADP store.
+
+``python adp_store.py [data.csv] [adp_store]`` validates the ADP CSV once and
+writes one ``.npy`` file per column: int32 ranks and uint8 team/position codes
+(with their category lists alongside), plus the float32 ADPs of every source
+as one column-major array. The apps load the store with ``mmap_mode='r'``, so
+the arrays are shared from the page cache instead of being re-parsed and
+copied into every worker: the loaded frame's numeric columns, and the ADP
+matrix ``adp.AdpIndex`` takes from it, are views of the mapped files.
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from adp import ADP_SOURCES
+from storage import atomic_directory
+
+STORE_PATH = 'adp_store'
+
+# Placeholder the ADP sources use for "not drafted"
+MISSING_ADP = '-'
+
+
+# Validate the raw CSV and return it typed, raising ValueError on bad rows
+def validate_adp_csv(path='data.csv'):
+    raw = pd.read_csv(path, dtype=str, keep_default_na=False)
+    raw.rename(columns={'Sleeper.1': 'ESPN'}, inplace=True)
+
+    missing_columns = [c for c in ['Rank', 'Name', 'Team', 'Pos'] + ADP_SOURCES if c not in raw]
+    if missing_columns:
+        raise ValueError(f"{path}: missing columns {missing_columns}")
+
+    errors = []
+    ranks = raw['Rank'].str.extract(r'^(T?)(\d+)$')
+    for row in raw.index[ranks[1].isna()]:
+        errors.append(f"row {row + 2}: bad Rank {raw.at[row, 'Rank']!r}")
+    for column in ['Name', 'Team', 'Pos']:
+        for row in raw.index[raw[column].str.strip() == '']:
+            errors.append(f"row {row + 2}: empty {column}")
+
+    adp = {}
+    for source in ADP_SOURCES:
+        values = pd.to_numeric(raw[source].replace(MISSING_ADP, np.nan), errors='coerce')
+        bad = values.isna() & (raw[source] != MISSING_ADP) | (values <= 0)
+        for row in raw.index[bad]:
+            errors.append(f"row {row + 2}: bad {source} ADP {raw.at[row, source]!r}")
+        adp[source] = values.astype(np.float32)
+
+    if errors:
+        raise ValueError(f"{path}: " + '; '.join(errors[:20]))
+
+    return pd.DataFrame({
+        'Rank': ranks[1].astype(np.int32),
+        'Tied': ranks[0] == 'T',
+        'Name': raw['Name'].str.strip(),
+        'Team': pd.Categorical(raw['Team'].str.strip()),
+        'Pos': pd.Categorical(raw['Pos'].str.strip()),
+        **adp,
+    })
+
+
+# Write a validated ADP table to a store directory, replacing it atomically
+def write_adp_store(data, store_path=STORE_PATH):
+    with atomic_directory(store_path) as staging:
+        names = data['Name'].to_numpy(dtype=str)
+        np.save(os.path.join(staging, 'Rank.npy'), data['Rank'].to_numpy(dtype=np.int32))
+        np.save(os.path.join(staging, 'Tied.npy'), data['Tied'].to_numpy(dtype=bool))
+        np.save(os.path.join(staging, 'Name.npy'), names)
+        for column in ['Team', 'Pos']:
+            categorical = data[column].astype('category')
+            np.save(os.path.join(staging, f'{column}.npy'), categorical.cat.codes.to_numpy(dtype=np.uint8))
+            np.save(os.path.join(staging, f'{column}_categories.npy'), categorical.cat.categories.to_numpy(dtype=str))
+        # Column-major, so each source is a contiguous column and the frame can use the whole array as one block
+        np.save(os.path.join(staging, 'ADP.npy'), np.asfortranarray(data[ADP_SOURCES].to_numpy(dtype=np.float32)))
+        np.save(os.path.join(staging, 'ADP_columns.npy'), np.array(ADP_SOURCES))
+
+
+# Validate the CSV once and write its store
+def ingest_adp_csv(path='data.csv', store_path=STORE_PATH):
+    data = validate_adp_csv(path)
+    write_adp_store(data, store_path)
+    return data
+
+
+# Load a store as a DataFrame backed by read-only memory maps
+def load_adp_store(store_path=STORE_PATH):
+    # Plain ndarray views of the maps, so pandas doesn't carry the memmap subclass around
+    def column(name):
+        return np.asarray(np.load(os.path.join(store_path, f'{name}.npy'), mmap_mode='r'))
+
+    data = pd.DataFrame(column('ADP'), columns=column('ADP_columns').tolist(), copy=False)
+    # Inserted one at a time: building the frame from a dict consolidates, and so copies, the columns.
+    # Names become pandas strings and the categoricals take their own codes, so those three are copies.
+    data.insert(0, 'Rank', pd.Series(column('Rank'), copy=False))
+    data.insert(1, 'Tied', pd.Series(column('Tied'), copy=False))
+    data.insert(2, 'Name', column('Name'))
+    for i, name in enumerate(['Team', 'Pos'], start=3):
+        data.insert(i, name, pd.Categorical.from_codes(column(name), categories=column(f'{name}_categories')))
+    return data
+
+
+# Whether the store is missing or older than its CSV
+def store_is_stale(path='data.csv', store_path=STORE_PATH):
+    marker = os.path.join(store_path, 'ADP.npy')
+    return not os.path.exists(marker) or os.path.getmtime(marker) < os.path.getmtime(path)
+
+
+# Load the ADP table, (re)building the store first if the CSV changed
+def load_adp_table(path='data.csv', store_path=STORE_PATH):
+    if store_is_stale(path, store_path):
+        ingest_adp_csv(path, store_path)
+    return load_adp_store(store_path)
+
+
+if __name__ == '__main__':
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else 'data.csv'
+    output_path = sys.argv[2] if len(sys.argv) > 2 else STORE_PATH
+    ingested = ingest_adp_csv(csv_path, output_path)
+    print(f"Wrote {len(ingested)} players from {csv_path} to {output_path}/")
@@ -0,0 +1,424 @@
+"""Micro-benchmarks for the draft pipeline on synthetic inputs.
+
+Run with ``python bench.py`` (or ``python bench.py fetch stages`` for a
+subset). Each benchmark prints the best of a few runs. Fetch benchmarks run
+against ``fake_sleeper.FakeSleeperServer`` with simulated latency, the
+replay benchmark load-tests ``replay.ReplayServer`` with recorded drafts,
+the app benchmark reruns ``test2.py`` under Streamlit's ``AppTest``, and the
+stage benchmark reports ``timing`` stages at several league scales.
+
+Every benchmark also records its metrics. ``--json`` saves them, and
+``--baseline`` compares a run against a saved one, exiting non-zero when a
+metric regressed by more than ``--tolerance``:
+
+    python bench.py --json baseline.json
+    python bench.py --baseline baseline.json --tolerance 0.3
+"""
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from adp import ADP_SOURCES, read_adp_data, build_adp_index
+from draft_cache import GradedDraftCache, estimate_size
+from draft_sim import DraftSimulator
+from fake_sleeper import FakeSleeperServer, synthetic_adp, synthetic_league, synthetic_picks
+from grading import add_pick_values, grade_picks, picks_to_frame, select_adp_source
+from http_cache import ResponseCache
+from keeper_optimizer import optimize_keepers
+from matching import NICKNAMES, PlayerMatcher
+from pipeline import AdpResolver, grade_draft
+from render import pick_cards_html
+from replay import FixtureArchive, ReplayProcess, load_test, record_session, recorded_drafts
+from scarcity import PositionIndex, PositionScarcity
+from sleeper import SleeperClient
+from timing import start_recording, stop_recording
+from value_curve import ValueCurve
+from value_index import PlayerValueIndex
+
+
+# Every metric recorded this run, {"benchmark.metric": value}; times are in the unit their name ends in
+RESULTS = {}
+
+# Metrics where a bigger number is better; everything else (times, requests, error rates) should shrink
+HIGHER_IS_BETTER = ('per_second', 'correct', 'speedup')
+
+
+def record(benchmark, **metrics):
+    for metric, value in metrics.items():
+        RESULTS[f"{benchmark}.{metric}"] = round(float(value), 4)
+
+
+# Best wall time of fn over a few repeats, in seconds
+def best_of(fn, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+# The per-pick loop test2.py used before grading.py, kept as the baseline
+def legacy_grade(draft_picks, adp_data, players_per_round, team_id_to_name):
+    rows = []
+    for pick in draft_picks:
+        player_name = f"{pick['metadata'].get('first_name', '')} {pick['metadata'].get('last_name', '')}"
+        adp_row = adp_data[adp_data["Name"].str.lower() == player_name.lower()]
+        graded = {}
+        for column_name in ADP_SOURCES:
+            if not adp_row.empty and pd.notna(adp_row[column_name].values[0]):
+                adp_round = int(np.ceil(adp_row[column_name].values[0] / players_per_round))
+                graded[column_name] = adp_round - pick['round']
+            else:
+                graded[column_name] = None
+        rows.append({
+            'team_name': team_id_to_name.get(pick['roster_id'], "Unknown Team"),
+            'full_name': player_name,
+            'round': pick['round'],
+            **graded,
+        })
+    return pd.DataFrame(rows)
+
+
+def bench_grading(adp_data, adp_index, num_picks=10_000, num_teams=12):
+    draft_picks = synthetic_picks(adp_data, num_picks, num_teams)
+    team_id_to_name = {i: f"Team {i}" for i in range(1, num_teams + 1)}
+
+    legacy = best_of(lambda: legacy_grade(draft_picks, adp_data, num_teams, team_id_to_name), repeat=1)
+    vectorized = best_of(lambda: grade_picks(picks_to_frame(draft_picks), adp_index, num_teams, team_id_to_name))
+    record('grading', loop_ms=legacy * 1000, vectorized_ms=vectorized * 1000, speedup=legacy / vectorized)
+    print(f"grade {num_picks} picks x {len(ADP_SOURCES)} sources: "
+          f"loop {legacy * 1000:.0f} ms, vectorized {vectorized * 1000:.1f} ms ({legacy / vectorized:.0f}x)")
+
+
+# Name variants Sleeper produces that an exact lowercase match misses
+def perturb_name(name, rng):
+    first_name, _, last_name = name.partition(' ')
+    nicknames = {full: nick for nick, full in NICKNAMES.items()}
+    variant = rng.integers(5)
+    if variant == 0:
+        return f"{name} Jr."
+    if variant == 1:
+        return name.replace('.', '').replace("'", '').replace('-', ' ')
+    if variant == 2 and first_name.lower() in nicknames:
+        return f"{nicknames[first_name.lower()].title()} {last_name}"
+    if variant == 3 and len(last_name) > 4:
+        i = int(rng.integers(1, len(last_name) - 1))
+        return f"{first_name} {last_name[:i]}{last_name[i + 1:]}"
+    return name.upper()
+
+
+def bench_matching(adp_data, num_teams=12, rounds=16, seed=0):
+    rng = np.random.default_rng(seed)
+    names = adp_data['Name'].to_numpy()[:num_teams * rounds]
+    pick_positions = adp_data['Pos'].to_numpy()[:num_teams * rounds]
+    queries = [perturb_name(name, rng) for name in names]
+
+    exact = {name.lower(): i for i, name in enumerate(adp_data['Name'])}
+    exact_rate = np.mean([query.lower() in exact for query in queries])
+
+    matcher = PlayerMatcher(adp_data['Name'], positions=adp_data['Pos'])
+    start = time.perf_counter()
+    matched = [matcher.match(query, player_position=position) for query, position in zip(queries, pick_positions)]
+    elapsed = time.perf_counter() - start
+    correct = np.mean([m is not None and adp_data['Name'].iloc[m] == name for m, name in zip(matched, names)])
+
+    # Players missing from the sheet (rookies, older snapshots) must stay unmatched, not borrow a similar name
+    held_out = rng.random(len(adp_data)) < 0.2
+    listed = adp_data[~held_out].reset_index(drop=True)
+    unlisted = PlayerMatcher(listed['Name'], positions=listed['Pos'])
+    false_positives = [(name, listed['Name'].iloc[m]) for name, position in zip(adp_data['Name'][held_out], adp_data['Pos'][held_out])
+                       if (m := unlisted.match(name, player_position=position)) is not None]
+    false_rate = len(false_positives) / held_out.sum()
+    record('matching', correct=correct, us_per_pick=elapsed / len(queries) * 1e6, false_match_rate=false_rate)
+    print(f"match {len(queries)} perturbed draft names: exact {exact_rate:.0%}, "
+          f"matcher {correct:.0%} correct, {elapsed / len(queries) * 1e6:.0f} us/pick cold; "
+          f"{held_out.sum()} unlisted names, {false_rate:.1%} false matches"
+          + (f" (e.g. {false_positives[0][0]} -> {false_positives[0][1]})" if false_positives else ''))
+
+
+def bench_render(adp_data, adp_index, num_picks=240, num_teams=12):
+    graded = grade_picks(picks_to_frame(synthetic_picks(adp_data, num_picks, num_teams)), adp_index, num_teams,
+                         {i: f"Team {i}" for i in range(1, num_teams + 1)})
+    elapsed = best_of(lambda: pick_cards_html(select_adp_source(graded, 'Sleeper')))
+    record('render', ms=elapsed * 1000)
+    print(f"render {num_picks} pick cards: {elapsed * 1000:.1f} ms")
+
+
+# A full Streamlit rerun of test2.py's all-teams card grid (AppTest, fake Sleeper, scratch working directory)
+def bench_app(adp_data, num_teams=12, rounds=20):
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    import sleeper
+
+    league = synthetic_league(adp_data, '9100', num_teams, rounds)
+    app_path, cwd = os.path.abspath('test2.py'), os.getcwd()
+    with tempfile.TemporaryDirectory() as directory, FakeSleeperServer([league]) as server:
+        os.symlink(os.path.abspath('data.csv'), os.path.join(directory, 'data.csv'))
+        os.chdir(directory)
+        sleeper.SLEEPER_API_URL = server.url
+        try:
+            at = AppTest.from_file(app_path, default_timeout=60).run()
+            at.text_input[0].input('Bench League')
+            at.text_input[1].input('9100')
+            at.text_input[2].input(league['draft']['draft_id'])
+            at.button[0].click().run()
+            at.selectbox[0].select('Bench League').run()
+            next(button for button in at.button if button.label == 'Fetch Draft Results').click().run()
+            at.selectbox(key='team_select').select('All teams').run()
+            elapsed = best_of(at.run, repeat=5)
+        finally:
+            os.chdir(cwd)
+            st.cache_resource.clear()
+    record('app', rerun_ms=elapsed * 1000)
+    print(f"app rerun, all {num_teams * rounds} picks (48-card page): {elapsed * 1000:.0f} ms")
+
+
+def bench_keepers(adp_data, adp_index, num_teams=12, rounds=16, max_keepers=3):
+    graded = grade_picks(picks_to_frame(synthetic_picks(adp_data, num_teams * rounds, num_teams)), adp_index, num_teams)
+    for allow_bump in (False, True):
+        elapsed = best_of(lambda: optimize_keepers(graded, num_teams, max_keepers, allow_bump=allow_bump))
+        record('keepers', **{'bump_ms' if allow_bump else 'ms': elapsed * 1000})
+        print(f"optimize {max_keepers} keepers for {num_teams} teams x {rounds} players"
+              f"{' (bumping)' if allow_bump else ''}: {elapsed * 1000:.1f} ms")
+
+
+def bench_value_curve(adp_data, adp_index, num_teams=12, rounds=16, num_drafts=1_000):
+    curve = adp_index.value_curve
+    graded = grade_picks(picks_to_frame(synthetic_picks(adp_data, num_teams * rounds, num_teams)), adp_index, num_teams)
+    tables = best_of(lambda: [ValueCurve(adp_index.values).tables(teams, rounds) for teams in range(2, 33)], repeat=2)
+    picks = np.tile(graded['pick_no'].to_numpy(), num_drafts)
+    gather = best_of(lambda: curve.pick_values(picks))
+    grade = best_of(lambda: add_pick_values(graded.copy(), curve))
+    record('value_curve', tables_ms=tables * 1000, gather_ms=gather * 1000, grade_ms=grade * 1000)
+    print(f"value tables for 2..32 teams x {rounds} rounds: {tables * 1000:.1f} ms; "
+          f"pick values for {num_drafts} drafts: {gather * 1000:.2f} ms; value one draft: {grade * 1000:.2f} ms")
+
+
+def bench_scarcity(adp_data, adp_index, num_teams=12, rounds=16):
+    graded = grade_picks(picks_to_frame(synthetic_picks(adp_data, num_teams * rounds, num_teams)), adp_index, num_teams)
+    build = best_of(lambda: PositionIndex(adp_index, 'Sleeper'))
+    position_index = PositionIndex(adp_index, 'Sleeper')
+
+    # Feed the draft one pick at a time, as the live board does
+    def live():
+        scarcity = PositionScarcity(position_index, adp_index, num_teams)
+        for i in range(len(graded)):
+            scarcity.add_picks(graded.iloc[i:i + 1])
+        return scarcity
+
+    per_pick = best_of(live, repeat=1) / len(graded)
+    scarcity = live()
+    query = best_of(lambda: scarcity.remaining('RB', 1, 40))
+    summary = best_of(lambda: scarcity.summary())
+    record('scarcity', build_ms=build * 1000, pick_ms=per_pick * 1000, remaining_us=query * 1e6, summary_ms=summary * 1000)
+    print(f"position index build {build * 1000:.1f} ms; record a live pick {per_pick * 1000:.2f} ms; "
+          f"remaining query {query * 1e6:.0f} us; scarcity summary {summary * 1000:.2f} ms")
+
+
+def bench_simulation(adp_index, num_teams=12, rounds=16, num_sims=10_000):
+    simulator = DraftSimulator(adp_index, num_teams, rounds)
+    elapsed = best_of(lambda: simulator.availability(1, num_sims, seed=0), repeat=2)
+    record('simulation', s=elapsed)
+    print(f"simulate {num_sims} {num_teams}-team x {rounds}-round snake drafts: {elapsed:.2f} s")
+
+
+def bench_value_index(adp_data, adp_index, num_drafts=1_000, num_teams=12, rounds=16):
+    graded = [grade_picks(picks_to_frame(synthetic_picks(adp_data, num_teams * rounds, num_teams, seed)), adp_index, num_teams)
+              for seed in range(20)]
+    with tempfile.TemporaryDirectory() as directory:
+        index = PlayerValueIndex(os.path.join(directory, 'value_index.sqlite'))
+        start = time.perf_counter()
+        for i in range(num_drafts):
+            index.add_draft(graded[i % len(graded)], f'D{i}', f'L{i % 300}', 2021 + i % 4)
+        build = time.perf_counter() - start
+        name = graded[0]['full_name'].iloc[0]
+        top = best_of(lambda: index.top_values(season='2024', limit=25))
+        reaches = best_of(lambda: index.biggest_reaches(limit=25))
+        history = best_of(lambda: index.player_history(name))
+        regrade = best_of(lambda: index.add_draft(graded[1], 'D0', 'L0', 2021), repeat=1)
+    record('value_index', build_s=build, top_ms=top * 1000, reaches_ms=reaches * 1000, history_ms=history * 1000,
+           regrade_ms=regrade * 1000)
+    print(f"value index over {num_drafts} drafts: build {build:.1f} s ({build / num_drafts * 1000:.1f} ms/draft), "
+          f"top values {top * 1000:.1f} ms, reaches {reaches * 1000:.1f} ms, player history {history * 1000:.1f} ms, "
+          f"regrade one draft {regrade * 1000:.0f} ms")
+
+
+# Serial fetches with a user lookup per roster, the way test2.py fetched before SleeperClient
+def legacy_fetch(session, base_url, league_id, draft_id):
+    rosters = session.get(f"{base_url}/league/{league_id}/rosters").json()
+    names = {roster['roster_id']: (session.get(f"{base_url}/user/{roster['owner_id']}").json() or {}).get('display_name')
+             for roster in rosters}
+    return rosters, names, session.get(f"{base_url}/draft/{draft_id}/picks").json()
+
+
+def bench_fetch(adp_data, num_leagues=10, latency=0.02):
+    import requests
+
+    leagues = [synthetic_league(adp_data, str(5000 + i), seed=i) for i in range(num_leagues)]
+    ids = [(league['league']['league_id'], league['draft']['draft_id']) for league in leagues]
+    with FakeSleeperServer(leagues, latency=latency) as server, tempfile.TemporaryDirectory() as directory:
+        with requests.Session() as session:
+            legacy = best_of(lambda: [legacy_fetch(session, server.url, *i) for i in ids], repeat=1)
+        with SleeperClient(server.url) as client:
+            pooled = best_of(lambda: [client.fetch_draft(*i) for i in ids], repeat=1)
+        server.requests.clear()
+        with SleeperClient(server.url, cache=ResponseCache(os.path.join(directory, 'cache.sqlite'))) as client:
+            cold = best_of(lambda: [client.fetch_draft(*i) for i in ids], repeat=1)
+            warm = best_of(lambda: [client.fetch_draft(*i) for i in ids])
+            cached_requests = len(server.requests)
+    record('fetch', serial_ms=legacy * 1000, pooled_ms=pooled * 1000, cold_ms=cold * 1000, warm_ms=warm * 1000,
+           requests=cached_requests)
+    print(f"fetch {num_leagues} drafts at {latency * 1000:.0f} ms/request: serial {legacy * 1000:.0f} ms, "
+          f"pooled {pooled * 1000:.0f} ms, cached cold {cold * 1000:.0f} ms / warm {warm * 1000:.1f} ms "
+          f"({cached_requests} requests over 4 passes)")
+
+
+# Many viewers opening one draft at once: a fetch and a frame each, or one shared through GradedDraftCache
+def bench_shared_cache(adp_data, viewers=50, latency=0.02):
+    league = synthetic_league(adp_data, '7000')
+    ids = (league['league']['league_id'], league['draft']['draft_id'])
+    with tempfile.TemporaryDirectory() as directory:
+        # No ADP history, so every viewer grades against the current table
+        adp = AdpResolver('data.csv', history_path=os.path.join(directory, 'adp_history.sqlite'))
+    with FakeSleeperServer([league], latency=latency) as server, SleeperClient(server.url) as client:
+        def open_draft(load):
+            with ThreadPoolExecutor(max_workers=viewers) as executor:
+                return list(executor.map(lambda _: load(), range(viewers)))
+
+        start = time.perf_counter()
+        frames = [draft.frame for draft in open_draft(lambda: grade_draft(client, *ids, adp))]
+        separate, separate_requests = time.perf_counter() - start, len(server.requests)
+        separate_bytes = sum(estimate_size(frame) for frame in frames)
+
+        server.requests.clear()
+        cache = GradedDraftCache()
+        start = time.perf_counter()
+        open_draft(lambda: cache.get_or_compute(ids, lambda: grade_draft(client, *ids, adp)))
+        shared = time.perf_counter() - start
+    record('shared_cache', separate_ms=separate * 1000, shared_ms=shared * 1000, shared_requests=len(server.requests),
+           shared_mb=cache.bytes / 1e6)
+    print(f"{viewers} viewers open one draft: separate {separate * 1000:.0f} ms, {separate_requests} requests, "
+          f"{separate_bytes / 1e6:.1f} MB; shared {shared * 1000:.0f} ms, {len(server.requests)} requests, "
+          f"{cache.bytes / 1e6:.1f} MB")
+
+
+# Record synthetic leagues once, then replay them from a server process to many concurrent clients
+# in several load processes, with latency and injected errors
+def bench_replay(adp_data, num_leagues=10, concurrency=200, fetches=1000, latency=0.02, error_rate=0.02, processes=None):
+    leagues = [synthetic_league(adp_data, str(8000 + i), seed=i) for i in range(num_leagues)]
+    with tempfile.TemporaryDirectory() as directory:
+        archive = FixtureArchive(os.path.join(directory, 'fixtures.sqlite'))
+        with FakeSleeperServer(leagues) as server, SleeperClient(server.url) as client:
+            record_session(client.session, archive)
+            for league in leagues:
+                client.get(f"league/{league['league']['league_id']}")
+                client.fetch_draft(league['league']['league_id'], league['draft']['draft_id'])
+        with ReplayProcess(archive.path, latency=latency, error_rate=error_rate, seed=0) as server:
+            stats = load_test(server.url, recorded_drafts(archive), concurrency, fetches, processes)
+    record('replay', fetches_per_second=stats['fetches_per_second'], p50_ms=stats['p50_ms'] or 0,
+           p99_ms=stats['p99_ms'] or 0, failed=stats['failed'])
+    print(f"replay {fetches} draft fetches from {concurrency} clients in {stats['processes']} processes at {latency * 1000:.0f} ms/request, "
+          f"{error_rate:.0%} errors: {stats['fetches_per_second']} fetches/s, p50 {stats['p50_ms']} ms, "
+          f"p99 {stats['p99_ms']} ms, {stats['failed']} failed after retries")
+
+
+# Per-stage latency (from timing) of grading one draft, at a few league sizes
+def bench_stages(adp_data, adp_index, scales=((10, 15), (12, 16), (32, 25), (100, 100))):
+    for num_teams, rounds in scales:
+        draft_picks = synthetic_picks(adp_data, num_teams * rounds, num_teams)
+        team_id_to_name = {i: f"Team {i}" for i in range(1, num_teams + 1)}
+        timings = start_recording()
+        for _ in range(3):
+            graded = grade_picks(picks_to_frame(draft_picks), adp_index, num_teams, team_id_to_name)
+            pick_cards_html(select_adp_source(graded, 'Sleeper').head(48))
+        stop_recording()
+        summary = timings.summary()
+        stages = ', '.join(f"{stage} {row.total_ms / row.calls:.1f}" for stage, row in summary.iterrows())
+        record(f'stages.{num_teams}x{rounds}', **{f'{stage}_ms': row.total_ms / row.calls for stage, row in summary.iterrows()})
+        print(f"stages for {num_teams} teams x {rounds} rounds ({num_teams * rounds} picks), ms per call: {stages}")
+
+
+# Index build and cold match cost as the ADP pool grows
+def bench_adp_scale(sizes=(500, 5_000, 50_000)):
+    for size in sizes:
+        data = synthetic_adp(size)
+        build = best_of(lambda: build_adp_index(data), repeat=1)
+        index = build_adp_index(data)
+        names = data['Name'].sample(200, random_state=0).str.upper()
+        match = best_of(lambda: index.positions(names), repeat=1)
+        record(f'adp_scale.{size}', build_ms=build * 1000, lookup_ms=match * 1000)
+        print(f"ADP pool of {size}: index build {build * 1000:.0f} ms, 200 cold lookups {match * 1000:.1f} ms")
+
+
+# Metrics worse than the baseline by more than tolerance (relative), as (metric, baseline, value)
+def regressions(results, baseline, tolerance=0.25):
+    worse = []
+    for metric, value in results.items():
+        base = baseline.get(metric)
+        if base is None:
+            continue
+        if metric.endswith(HIGHER_IS_BETTER):
+            regressed = value < base * (1 - tolerance)
+        else:
+            regressed = value > base * (1 + tolerance) if base else value > 0
+        if regressed:
+            worse.append((metric, base, value))
+    return worse
+
+
+BENCHMARKS = ['grading', 'matching', 'render', 'app', 'keepers', 'value_curve', 'scarcity', 'simulation', 'value_index', 'fetch', 'shared_cache', 'replay', 'stages', 'adp_scale']
+
+
+if __name__ == '__main__':
+    import argparse
+    import json
+    import sys
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('benchmarks', nargs='*', metavar='benchmark', help=f"any of {', '.join(BENCHMARKS)} (default: all)")
+    parser.add_argument('--json', help="write the recorded metrics to this file")
+    parser.add_argument('--baseline', help="metrics JSON from an earlier run; exit 1 if any got worse than --tolerance")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed relative slowdown (default 0.25)")
+    args = parser.parse_args()
+
+    unknown = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+    selected = args.benchmarks or BENCHMARKS
+    adp_data = read_adp_data('data.csv')
+    adp_index = build_adp_index(adp_data)
+    runs = {
+        'grading': lambda: bench_grading(adp_data, adp_index),
+        'matching': lambda: bench_matching(adp_data),
+        'render': lambda: bench_render(adp_data, adp_index),
+        'app': lambda: bench_app(adp_data),
+        'keepers': lambda: bench_keepers(adp_data, adp_index),
+        'value_curve': lambda: bench_value_curve(adp_data, adp_index),
+        'scarcity': lambda: bench_scarcity(adp_data, adp_index),
+        'simulation': lambda: bench_simulation(adp_index),
+        'value_index': lambda: bench_value_index(adp_data, adp_index),
+        'fetch': lambda: bench_fetch(adp_data),
+        'shared_cache': lambda: bench_shared_cache(adp_data),
+        'replay': lambda: bench_replay(adp_data),
+        'stages': lambda: bench_stages(adp_data, adp_index),
+        'adp_scale': lambda: bench_adp_scale(),
+    }
+    for name in selected:
+        runs[name]()
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(RESULTS, f, indent=1, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline) as f:
+            worse = regressions(RESULTS, json.load(f), args.tolerance)
+        for metric, base, value in worse:
+            print(f"REGRESSION {metric}: {base:g} -> {value:g}")
+        print(f"{len(worse)} of {len(RESULTS)} metrics worse than the baseline by more than {args.tolerance:.0%}")
+        sys.exit(1 if worse else 0)
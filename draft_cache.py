@@ -0,0 +1,144 @@
+"""Process-wide cache of graded drafts, shared by every app session.
+
+Streamlit session state is per viewer, so ten league-mates opening the same
+draft used to fetch and grade it ten times and hold ten copies. The app now
+keeps graded drafts (and the per-ADP-source views of them) here, keyed by
+draft ID and ADP snapshot version, and session state holds only a reference.
+Entries are evicted least-recently-used once their estimated memory passes a
+budget. Concurrent requests for a key that is still being computed wait for
+that one computation instead of starting their own (single flight).
+``invalidate`` drops a draft's entries, or everything, e.g. after a refetch.
+"""
+import sys
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import Future
+
+import pandas as pd
+
+# Default memory budget for cached frames
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+CacheEntry = namedtuple('CacheEntry', ['value', 'size', 'created_at'])
+
+
+# Rough deep size of a cached value: exact for DataFrames, estimated for the picks JSON and metadata
+def estimate_size(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class GradedDraftCache:
+    """Thread-safe LRU of graded draft values with a memory budget and single-flight loads."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.stats = {'hits': 0, 'misses': 0, 'waits': 0, 'evictions': 0}
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    # Cached value for key, or default; counts as a use for LRU
+    def get(self, key, default=None, max_age=None):
+        with self._lock:
+            entry = self._fresh(key, max_age)
+            if entry is None:
+                return default
+            self.stats['hits'] += 1
+            return entry.value
+
+    # Cached value for key, computing it once even if many threads ask at the same time.
+    # None results and exceptions are handed to every waiter but not cached.
+    def get_or_compute(self, key, compute, max_age=None):
+        with self._lock:
+            entry = self._fresh(key, max_age)
+            if entry is not None:
+                self.stats['hits'] += 1
+                return entry.value
+            future = self._inflight.get(key)
+            if future is not None:
+                self.stats['waits'] += 1
+                owner = False
+            else:
+                self.stats['misses'] += 1
+                future = self._inflight[key] = Future()
+                owner = True
+
+        if not owner:
+            return future.result()
+        try:
+            value = compute()
+            if value is not None:
+                self.put(key, value)
+        except BaseException as e:
+            self._finish(key)
+            future.set_exception(e)
+            raise
+        # Cached before the flight ends, so a late caller never misses both
+        self._finish(key)
+        future.set_result(value)
+        return value
+
+    # Store a value, evicting least-recently-used entries to stay within the budget
+    def put(self, key, value):
+        size = estimate_size(value)
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = CacheEntry(value, size, time.time())
+            self.bytes += size
+            # The newest entry stays even if it alone is over budget
+            while self.bytes > self.max_bytes and len(self._entries) > 1:
+                self._discard(next(iter(self._entries)))
+                self.stats['evictions'] += 1
+
+    # Drop every entry whose key starts with draft_id (tuple keys) or equals it; everything if None
+    def invalidate(self, draft_id=None):
+        with self._lock:
+            if draft_id is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+                self.bytes = 0
+                return dropped
+            keys = [key for key in self._entries if key == draft_id or (isinstance(key, tuple) and key[0] == draft_id)]
+            for key in keys:
+                self._discard(key)
+            return len(keys)
+
+    # Entries, memory and hit counters, for monitoring a shared deployment
+    def info(self):
+        with self._lock:
+            return dict(self.stats, entries=len(self._entries), bytes=self.bytes, max_bytes=self.max_bytes,
+                        inflight=len(self._inflight))
+
+    # Entry for key if present and young enough, marked most recently used; caller holds the lock
+    def _fresh(self, key, max_age):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if max_age is not None and time.time() - entry.created_at > max_age:
+            self._discard(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _finish(self, key):
+        with self._lock:
+            self._inflight.pop(key, None)
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry.size
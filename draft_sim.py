@@ -0,0 +1,100 @@
+"""Monte Carlo snake-draft simulator built on the ADP sources.
+
+Each player's draft slot is modelled as a normal around the median of their
+Underdog/Sleeper/ESPN ADPs, with a spread taken from how much the sources
+disagree (bounded so one stale source can't make a first-rounder look like a
+flyer). One simulated draft is a sample for every player followed by an
+argsort: the pool goes off the board in sampled order, skipping pick slots
+already locked by keepers. Simulations run as whole (sims x players) arrays,
+in chunks to bound memory, so 10,000 drafts are a handful of NumPy calls.
+"""
+import numpy as np
+import pandas as pd
+
+
+# Overall pick numbers (1-based) for a draft slot in a snake draft
+def snake_pick_numbers(slot, num_teams, rounds):
+    rounds_array = np.arange(rounds)
+    offset = np.where(rounds_array % 2 == 0, slot, num_teams - slot + 1)
+    return rounds_array * num_teams + offset
+
+
+# Per-player draft-position mean and spread from the ADP sources
+def adp_distribution(values, min_sd=1.5, relative_sd=0.08, max_relative_sd=0.35):
+    listed = ~np.isnan(values).all(axis=1)
+    mean = np.full(len(values), np.nan)
+    spread = np.zeros(len(values))
+    mean[listed] = np.nanmedian(values[listed], axis=1)
+    spread[listed] = np.nanstd(values[listed], axis=1)
+    sd = np.clip(spread, min_sd + relative_sd * mean, min_sd + max_relative_sd * mean)
+    return mean, sd
+
+
+class DraftSimulator:
+    """Snake drafts for one league size, sampled from an ``adp.AdpIndex``."""
+
+    def __init__(self, adp_index, num_teams, rounds, min_sd=1.5, relative_sd=0.08, max_relative_sd=0.35, pool_margin=1.5):
+        self.adp_index = adp_index
+        self.num_teams = num_teams
+        self.rounds = rounds
+        mean, sd = adp_distribution(adp_index.values, min_sd, relative_sd, max_relative_sd)
+
+        # Players far past the last pick essentially never go, so they stay out of the arrays
+        listed = np.flatnonzero(~np.isnan(mean))
+        pool_size = int(num_teams * rounds * pool_margin) + 24
+        self.pool = listed[np.argsort(mean[listed], kind='stable')][:pool_size]
+        self.mean = mean[self.pool]
+        self.sd = sd[self.pool]
+
+    # Pool indices and pick numbers of players already taken (keepers or live picks)
+    def _locked(self, locked_picks):
+        if locked_picks is None or not len(locked_picks):
+            return np.zeros(len(self.pool), dtype=bool), np.array([], dtype=int)
+        player_ids = locked_picks['player_id'] if 'player_id' in locked_picks and self.adp_index.has_player_ids else None
+        positions = self.adp_index.positions(locked_picks['full_name'], player_ids, locked_picks.get('position'))
+        taken = np.isin(self.pool, positions[positions >= 0])
+        return taken, locked_picks['pick_no'].to_numpy(dtype=int)
+
+    # Sampled draft order for a chunk of simulations: (sims, open picks) pool indices
+    def _simulate_chunk(self, rng, num_sims, available, open_picks):
+        samples = rng.normal(self.mean[available], self.sd[available], size=(num_sims, len(available)))
+        order = np.argsort(samples, axis=1)[:, :open_picks]
+        return available[order]
+
+    # Simulate full drafts; returns (sims, total picks) pool indices, -1 for locked slots
+    def simulate(self, num_sims=10_000, locked_picks=None, seed=None, chunk_size=2_000):
+        rng = np.random.default_rng(seed)
+        total_picks = self.num_teams * self.rounds
+        taken, locked_slots = self._locked(locked_picks)
+        open_slots = np.setdiff1d(np.arange(1, total_picks + 1), locked_slots) - 1
+        available = np.flatnonzero(~taken)
+        open_picks = min(len(open_slots), len(available))
+
+        drafts = np.full((num_sims, total_picks), -1, dtype=np.int32)
+        for start in range(0, num_sims, chunk_size):
+            stop = min(start + chunk_size, num_sims)
+            drafts[start:stop, open_slots[:open_picks]] = self._simulate_chunk(rng, stop - start, available, open_picks)
+        return drafts
+
+    # Probability each player is still on the board at each of a draft slot's picks
+    def availability(self, slot, num_sims=10_000, locked_picks=None, seed=None, min_probability=0.01):
+        drafts = self.simulate(num_sims, locked_picks, seed)
+        my_picks = [p for p in snake_pick_numbers(slot, self.num_teams, self.rounds) if (drafts[:, p - 1] >= 0).any()]
+
+        # First simulated pick of each player (total_picks + 1 when undrafted), one scatter per draft
+        first_pick = np.full((num_sims, len(self.pool)), drafts.shape[1] + 1, dtype=np.int32)
+        sims, picks = np.nonzero(drafts >= 0)
+        first_pick[sims, drafts[sims, picks]] = picks + 1
+
+        probabilities = {f'pick_{p}': (first_pick >= p).mean(axis=0) for p in my_picks}
+        names = self.adp_index.data['Name'].to_numpy()[self.pool]
+        frame = pd.DataFrame({'full_name': names, 'adp': self.mean, **probabilities})
+        drafted = first_pick <= drafts.shape[1]
+        frame['drafted'] = drafted.mean(axis=0)
+        frame['expected_pick'] = np.where(drafted, first_pick, 0).sum(axis=0) / np.maximum(drafted.sum(axis=0), 1)
+        frame.loc[frame['drafted'] == 0, 'expected_pick'] = np.nan
+        taken, _ = self._locked(locked_picks)
+        frame = frame[~taken]
+        if my_picks:
+            frame = frame[frame[f'pick_{my_picks[0]}'] >= min_probability]
+        return frame.reset_index(drop=True)
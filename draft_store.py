@@ -0,0 +1,239 @@
+"""Embedded store for saved drafts, their picks and graded frames, and
+crawled league history (see ``league_history``).
+
+Replaces the read-concat-rewrite of ``saved_drafts.csv``: rows are appended in
+a single transaction, lookups by name, league or draft hit an index, and WAL
+mode lets any number of app workers read while one writes. The CSV is
+migrated once on first open.
+"""
+import io
+import json
+import os
+import sqlite3
+import time
+
+import pandas as pd
+
+from storage import SQLiteStore
+
+DRAFTS_DB = 'keepers.sqlite'
+DRAFTS_CSV = 'saved_drafts.csv'
+
+
+class DraftStore(SQLiteStore):
+    def __init__(self, path=DRAFTS_DB, csv_path=DRAFTS_CSV):
+        super().__init__(path)
+        conn = self._connect()
+        with conn:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS drafts (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL UNIQUE,
+                    league_id TEXT NOT NULL,
+                    draft_id TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS drafts_league ON drafts (league_id);
+                CREATE INDEX IF NOT EXISTS drafts_draft ON drafts (draft_id);
+                CREATE TABLE IF NOT EXISTS picks (
+                    draft_id TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    fetched_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS grades (
+                    draft_id TEXT NOT NULL,
+                    adp_version TEXT NOT NULL,
+                    frame TEXT NOT NULL,
+                    graded_at REAL NOT NULL,
+                    num_teams INTEGER,
+                    PRIMARY KEY (draft_id, adp_version)
+                );
+                CREATE TABLE IF NOT EXISTS leagues (
+                    league_id TEXT PRIMARY KEY,
+                    season TEXT,
+                    name TEXT,
+                    status TEXT,
+                    previous_league_id TEXT,
+                    crawled_at REAL
+                );
+                CREATE TABLE IF NOT EXISTS league_drafts (
+                    draft_id TEXT PRIMARY KEY,
+                    league_id TEXT NOT NULL,
+                    season TEXT,
+                    status TEXT,
+                    type TEXT,
+                    start_time INTEGER
+                );
+                CREATE INDEX IF NOT EXISTS league_drafts_league ON league_drafts (league_id);
+                CREATE TABLE IF NOT EXISTS rosters (
+                    league_id TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    team_names TEXT NOT NULL,
+                    fetched_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS migrations (
+                    name TEXT PRIMARY KEY,
+                    applied_at REAL NOT NULL
+                );
+                """
+            )
+            # Stores created before grades recorded the league size
+            if 'num_teams' not in [column for _, column, *_ in conn.execute('PRAGMA table_info(grades)')]:
+                conn.execute('ALTER TABLE grades ADD COLUMN num_teams INTEGER')
+        if csv_path:
+            self.migrate_csv(csv_path)
+
+    # Import saved_drafts.csv once; later opens skip it
+    def migrate_csv(self, csv_path=DRAFTS_CSV):
+        conn = self._connect()
+        with conn:
+            if conn.execute("SELECT 1 FROM migrations WHERE name = 'saved_drafts_csv'").fetchone():
+                return 0
+            rows = []
+            if os.path.exists(csv_path):
+                saved = pd.read_csv(csv_path, dtype=str).dropna(subset=['name', 'league_id', 'draft_id'])
+                rows = list(saved[['name', 'league_id', 'draft_id']].itertuples(index=False, name=None))
+            now = time.time()
+            conn.executemany(
+                'INSERT OR IGNORE INTO drafts (name, league_id, draft_id, created_at) VALUES (?, ?, ?, ?)',
+                [(name, league_id, draft_id, now) for name, league_id, draft_id in rows],
+            )
+            conn.execute("INSERT INTO migrations VALUES ('saved_drafts_csv', ?)", (now,))
+        return len(rows)
+
+    # Saved draft names in the order they were added
+    def names(self):
+        return [name for (name,) in self._connect().execute('SELECT name FROM drafts ORDER BY id')]
+
+    # All saved drafts as a DataFrame, optionally for one league
+    def drafts(self, league_id=None):
+        query, args = 'SELECT name, league_id, draft_id FROM drafts', ()
+        if league_id is not None:
+            query, args = query + ' WHERE league_id = ?', (str(league_id),)
+        return pd.read_sql_query(query + ' ORDER BY id', self._connect(), params=args)
+
+    # One saved draft by name as a dict, or None
+    def get(self, name):
+        row = self._connect().execute('SELECT name, league_id, draft_id FROM drafts WHERE name = ?', (name,)).fetchone()
+        return dict(zip(['name', 'league_id', 'draft_id'], row)) if row else None
+
+    # Saved drafts pointing at a draft ID
+    def find_draft(self, draft_id):
+        rows = self._connect().execute('SELECT name FROM drafts WHERE draft_id = ?', (str(draft_id),))
+        return [name for (name,) in rows]
+
+    # Save a new draft atomically; raises ValueError if the name is taken
+    def add(self, name, league_id, draft_id):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    'INSERT INTO drafts (name, league_id, draft_id, created_at) VALUES (?, ?, ?, ?)',
+                    (name, str(league_id), str(draft_id), time.time()),
+                )
+        except sqlite3.IntegrityError:
+            raise ValueError(f"A draft named '{name}' is already saved.")
+
+    def remove(self, name):
+        conn = self._connect()
+        with conn:
+            conn.execute('DELETE FROM drafts WHERE name = ?', (name,))
+
+    # Raw Sleeper picks for a draft
+    def save_picks(self, draft_id, picks):
+        conn = self._connect()
+        with conn:
+            conn.execute('INSERT OR REPLACE INTO picks VALUES (?, ?, ?)', (str(draft_id), json.dumps(picks), time.time()))
+
+    def load_picks(self, draft_id):
+        row = self._connect().execute('SELECT payload FROM picks WHERE draft_id = ?', (str(draft_id),)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    # Graded pick frame for a draft under one ADP version (e.g. data.csv's mtime or a history date),
+    # with the number of teams in the league
+    def save_grades(self, draft_id, adp_version, graded, num_teams=None):
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO grades (draft_id, adp_version, frame, graded_at, num_teams) VALUES (?, ?, ?, ?, ?)',
+                (str(draft_id), adp_version, graded.to_json(orient='split', index=False), time.time(), num_teams),
+            )
+
+    def load_grades(self, draft_id, adp_version):
+        row = self._connect().execute(
+            'SELECT frame FROM grades WHERE draft_id = ? AND adp_version = ?', (str(draft_id), adp_version)
+        ).fetchone()
+        return pd.read_json(io.StringIO(row[0]), orient='split', dtype=False) if row else None
+
+    # Number of teams saved with a draft's grades; None if not saved or saved before it was recorded
+    def grades_num_teams(self, draft_id, adp_version):
+        row = self._connect().execute(
+            'SELECT num_teams FROM grades WHERE draft_id = ? AND adp_version = ?', (str(draft_id), adp_version)
+        ).fetchone()
+        return row[0] if row else None
+
+    # Most recently graded version for a draft, or None
+    def latest_grades_version(self, draft_id):
+        row = self._connect().execute(
+            'SELECT adp_version FROM grades WHERE draft_id = ? ORDER BY graded_at DESC LIMIT 1', (str(draft_id),)
+        ).fetchone()
+        return row[0] if row else None
+
+    # Crawled league seasons; crawled_at stays NULL until every draft in the season is stored
+    def save_league(self, league, crawled=False):
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO leagues VALUES (?, ?, ?, ?, ?, ?)',
+                (str(league['league_id']), league.get('season'), league.get('name'), league.get('status'),
+                 league.get('previous_league_id'), time.time() if crawled else None),
+            )
+
+    def league(self, league_id):
+        row = self._connect().execute(
+            'SELECT league_id, season, name, status, previous_league_id, crawled_at FROM leagues WHERE league_id = ?',
+            (str(league_id),),
+        ).fetchone()
+        return dict(zip(['league_id', 'season', 'name', 'status', 'previous_league_id', 'crawled_at'], row)) if row else None
+
+    # Drafts found for a league season
+    def save_league_drafts(self, league_id, drafts):
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO league_drafts VALUES (?, ?, ?, ?, ?, ?)',
+                [(str(d['draft_id']), str(league_id), d.get('season'), d.get('status'), d.get('type'), d.get('start_time'))
+                 for d in drafts],
+            )
+
+    # Crawled drafts (with league and season) as a DataFrame, optionally for one league
+    def league_drafts(self, league_id=None):
+        query = """
+            SELECT d.draft_id, d.league_id, d.season, d.status, d.type, d.start_time, l.name AS league_name
+            FROM league_drafts d LEFT JOIN leagues l USING (league_id)
+        """
+        args = ()
+        if league_id is not None:
+            query, args = query + ' WHERE d.league_id = ?', (str(league_id),)
+        return pd.read_sql_query(query + ' ORDER BY d.season, d.start_time', self._connect(), params=args)
+
+    def has_picks(self, draft_id):
+        return self._connect().execute('SELECT 1 FROM picks WHERE draft_id = ?', (str(draft_id),)).fetchone() is not None
+
+    # A league season's rosters and {roster_id: team name}
+    def save_rosters(self, league_id, rosters, team_id_to_name):
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO rosters VALUES (?, ?, ?, ?)',
+                (str(league_id), json.dumps(rosters), json.dumps(team_id_to_name), time.time()),
+            )
+
+    def load_rosters(self, league_id):
+        row = self._connect().execute(
+            'SELECT payload, team_names FROM rosters WHERE league_id = ?', (str(league_id),)
+        ).fetchone()
+        if row is None:
+            return None, None
+        return json.loads(row[0]), {int(team_id): name for team_id, name in json.loads(row[1]).items()}
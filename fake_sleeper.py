@@ -0,0 +1,159 @@
+"""Local fake Sleeper API backed by synthetic leagues.
+
+Serves the endpoints the apps use (league, rosters, users, user, drafts,
+draft, picks) for generated leagues of any size, with optional per-request
+latency, so fetch benchmarks and offline runs don't touch the real API.
+
+    python fake_sleeper.py [port] [num_leagues]
+    SLEEPER_API_URL=http://127.0.0.1:<port>/v1 streamlit run test2.py
+"""
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+
+# Synthetic Sleeper pick JSON drawn from a name pool (plus some unlisted names), in snake order
+def synthetic_picks(adp_data, num_picks, num_teams=12, seed=0, unlisted_rate=0.05):
+    rng = np.random.default_rng(seed)
+    names = adp_data['Name'].to_numpy()
+    picks = []
+    for pick_no in range(1, num_picks + 1):
+        if rng.random() < unlisted_rate:
+            first_name, last_name = 'Unlisted', f'Player{pick_no}'
+        else:
+            first_name, _, last_name = names[rng.integers(len(names))].partition(' ')
+        round_no = (pick_no - 1) // num_teams + 1
+        slot = (pick_no - 1) % num_teams + 1
+        picks.append({
+            'round': round_no,
+            'pick_no': pick_no,
+            'roster_id': slot if round_no % 2 else num_teams - slot + 1,
+            'player_id': str(pick_no),
+            'is_keeper': None,
+            'metadata': {'first_name': first_name, 'last_name': last_name, 'position': 'WR'},
+        })
+    return picks
+
+
+# Synthetic ADP table in data.csv's shape, for scaling tests past the real player pool
+def synthetic_adp(num_players, seed=0):
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    base = np.arange(1, num_players + 1, dtype=float)
+    data = pd.DataFrame({
+        'Rank': np.arange(1, num_players + 1),
+        'Name': [f'Player{i} Synthetic{i % 97}' for i in range(num_players)],
+        'Team': rng.choice(['DAL', 'SF', 'KC', 'BUF', 'MIA', 'PHI'], num_players),
+        'Pos': rng.choice(['QB', 'RB', 'WR', 'TE'], num_players, p=[0.15, 0.3, 0.4, 0.15]),
+    })
+    for source in ['Underdog', 'Sleeper', 'ESPN']:
+        adp = base + rng.normal(0, 2 + base * 0.08)
+        adp[rng.random(num_players) < 0.1] = np.nan
+        data[source] = np.round(np.maximum(adp, 1), 1)
+    return data
+
+
+# One league with rosters, users (some owners missing from the users list) and a complete draft
+def synthetic_league(adp_data, league_id, num_teams=12, rounds=16, seed=0, missing_owner_rate=0.25):
+    rng = np.random.default_rng(seed)
+    draft_id = f'{league_id}0'
+    users = [{'user_id': f'{league_id}u{i}', 'display_name': f'Owner {i}'} for i in range(1, num_teams + 1)]
+    rosters = [{'roster_id': i, 'owner_id': f'{league_id}u{i}', 'co_owners': None, 'players': []}
+               for i in range(1, num_teams + 1)]
+    picks = synthetic_picks(adp_data, num_teams * rounds, num_teams, seed)
+    for pick in picks:
+        rosters[pick['roster_id'] - 1]['players'].append(pick['player_id'])
+    draft = {'draft_id': draft_id, 'league_id': league_id, 'status': 'complete', 'type': 'snake', 'season': '2024',
+             'start_time': 1724000000000, 'last_picked': len(picks),
+             'settings': {'teams': num_teams, 'rounds': rounds, 'pick_timer': 60}}
+    return {
+        'league': {'league_id': league_id, 'name': f'League {league_id}', 'season': '2024', 'status': 'complete',
+                   'draft_id': draft_id, 'previous_league_id': None, 'total_rosters': num_teams},
+        'rosters': rosters,
+        # League member lists lag behind ownership changes; those owners need a /user lookup
+        'users': [user for user in users if rng.random() >= missing_owner_rate],
+        'all_users': users,
+        'draft': draft,
+        'picks': picks,
+    }
+
+
+class FakeSleeperServer(ThreadingHTTPServer):
+    """Threaded HTTP server answering Sleeper API paths from ``synthetic_league`` dicts."""
+
+    daemon_threads = True
+
+    def __init__(self, leagues, port=0, latency=0.0):
+        super().__init__(('127.0.0.1', port), _FakeSleeperHandler)
+        self.latency = latency
+        self.requests = []
+        self.leagues = {league['league']['league_id']: league for league in leagues}
+        self.drafts = {league['draft']['draft_id']: league for league in leagues}
+        self.users = {user['user_id']: user for league in leagues for user in league['all_users']}
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_port}/v1"
+
+    def route(self, parts):
+        if parts[0] == 'league' and len(parts) >= 2 and parts[1] in self.leagues:
+            league = self.leagues[parts[1]]
+            tail = parts[2] if len(parts) > 2 else None
+            return {None: league['league'], 'rosters': league['rosters'], 'users': league['users'],
+                    'drafts': [league['draft']]}.get(tail)
+        if parts[0] == 'draft' and len(parts) >= 2 and parts[1] in self.drafts:
+            league = self.drafts[parts[1]]
+            return league['picks'] if parts[-1] == 'picks' else league['draft']
+        if parts[0] == 'user' and len(parts) == 2:
+            return self.users.get(parts[1])
+        return None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True, name='fake-sleeper')
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+class _FakeSleeperHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        parts = self.path.split('?')[0].strip('/').split('/')[1:]
+        body = json.dumps(self.server.route(parts) if parts else None).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+if __name__ == '__main__':
+    from adp import read_adp_data
+
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    num_leagues = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    adp_data = read_adp_data('data.csv')
+    leagues = [synthetic_league(adp_data, str(1000 + i), seed=i) for i in range(num_leagues)]
+    server = FakeSleeperServer(leagues, port)
+    print(f"Serving {num_leagues} leagues (IDs {leagues[0]['league']['league_id']}..) at {server.url}")
+    server.serve_forever()
@@ -1,44 +1,56 @@
 import streamlit as st
 import pandas as pd
 
-# Load the data
-@st.cache_data
+from adp import build_adp_index
+from adp_store import load_adp_table
+
+# Load the data and its name index once per process
+@st.cache_resource
 def load_data():
-    df = pd.read_csv('data.csv')
+    df = load_adp_table('data.csv')
     df['ADP'] = df['Underdog']  # Using 'Underdog' as ADP
-    return df
+    return df, build_adp_index(df)
 
-df = load_data()
+df, adp_index = load_data()
 
 # Streamlit app
 st.title('Fantasy Football ADP Comparison')
 
 # User input
 player_name = st.text_input('Enter player name:')
+num_teams = st.number_input('Number of teams:', min_value=2, max_value=32, value=12)
+draft_slot = st.number_input('Your draft slot:', min_value=1, max_value=int(num_teams), value=1)
 round_number = st.number_input('Enter round number:', min_value=1, max_value=20, value=1)
 
-# Calculate pick number
-picks_per_round = 12  # Assuming a 12-team league
-pick_number = (round_number - 1) * picks_per_round + 1
+# Overall pick number for this slot in a snake draft, and what that pick is worth
+value_tables = adp_index.value_curve.tables(num_teams, 20)
+pick_number = value_tables.pick_number(round_number, draft_slot)
+pick_value = value_tables.value(round_number, draft_slot)
 
 if player_name:
     # Find the player in the dataframe
-    player = df[df['Name'].str.lower() == player_name.lower()]
+    player = adp_index.row(player_name)
     
-    if not player.empty:
-        adp = player['ADP'].values[0]
+    if player is not None:
+        adp = player['ADP']
         
-        st.write(f"Player: {player['Name'].values[0]}")
-        st.write(f"Position: {player['Pos'].values[0]}")
-        st.write(f"Team: {player['Team'].values[0]}")
+        st.write(f"Player: {player['Name']}")
+        st.write(f"Position: {player['Pos']}")
+        st.write(f"Team: {player['Team']}")
         st.write(f"ADP: {adp:.2f}")
-        st.write(f"Your pick: Round {round_number}, Pick {pick_number}")
+        st.write(f"Your pick: Round {round_number}, Pick {pick_number} (value {pick_value:.1f})")
         
-        if adp < pick_number:
-            st.success(f"Good value! {player['Name'].values[0]} is typically drafted {pick_number - adp:.0f} picks earlier.")
-        elif adp > pick_number:
-            st.warning(f"Reaching a bit. {player['Name'].values[0]} is typically drafted {adp - pick_number:.0f} picks later.")
+        # Compare on the value curve: being a few picks off matters more early in the draft
+        value_over_pick = adp_index.value_curve.value(adp) - pick_value
+        if pd.isna(adp):
+            st.info(f"{player['Name']} has no ADP.")
+        elif value_over_pick > 0.5:
+            st.success(f"Good value! {player['Name']} is typically drafted {pick_number - adp:.0f} picks earlier "
+                       f"(+{value_over_pick:.1f} value).")
+        elif value_over_pick < -0.5:
+            st.warning(f"Reaching a bit. {player['Name']} is typically drafted {adp - pick_number:.0f} picks later "
+                       f"({value_over_pick:.1f} value).")
         else:
-            st.info(f"Right on target! {player['Name'].values[0]} is typically drafted at this position.")
+            st.info(f"Right on target! {player['Name']} is typically drafted at this position.")
     else:
         st.error("Player not found. Please check the spelling and try again.")
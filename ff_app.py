@@ -1,37 +1,37 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
 
-# Load the CSV file containing ADPs from the local repository
-@st.cache_data
+from adp import build_adp_index
+from adp_store import load_adp_table
+from grading import evaluate_keepers, select_adp_source
+
+# Load the CSV file containing ADPs and its name index once per process
+@st.cache_resource
 def load_adp_data():
     try:
-        data = pd.read_csv('data.csv')
-        data.rename(columns={'Sleeper.1': 'ESPN'}, inplace=True)
-        data[['Underdog', 'Sleeper', 'ESPN']] = data[['Underdog', 'Sleeper', 'ESPN']].apply(pd.to_numeric, errors='coerce')
-        return data
+        data = load_adp_table('data.csv')
+        return data, build_adp_index(data)
     except Exception as e:
         st.write("Error loading data:", e)
-        return None
-
-# Function to convert ADP to draft round
-def adp_to_round(adp, players_per_round):
-    return int(np.ceil(adp / players_per_round))
+        return None, None
 
 # Function to provide insight based on ADP and keeper round
-def evaluate_keeper_value(player_name, keeper_round, adp_data, column_name, players_per_round):
-    player_data = adp_data[adp_data['Name'].str.lower() == player_name.lower()]
-    
-    if player_data.empty:
+def evaluate_keeper_value(player_name, keeper_round, adp_index, column_name, players_per_round):
+    if player_name not in adp_index:
         return f"Player '{player_name}' not found in the ADP list."
 
-    player_data = player_data.dropna(subset=[column_name])
+    keeper = select_adp_source(
+        evaluate_keepers(pd.DataFrame({'full_name': [player_name], 'round': [keeper_round]}), adp_index, players_per_round),
+        column_name,
+    ).iloc[0]
+    if pd.isna(keeper['adp']):
+        return f"ADP data for {player_name} is not available."
 
-    selected_adp = player_data.iloc[0][column_name]
-    adp_round = adp_to_round(selected_adp, players_per_round)
+    selected_adp = keeper['adp']
+    adp_round = int(keeper['adp_round'])
 
     # Calculate the difference in rounds between the ADP round and the keeper round
-    difference_rounds = keeper_round - adp_round
+    difference_rounds = -int(keeper['round_diff'])
 
     # Set delta color based on the rounds difference
     if abs(difference_rounds) >= 4:
@@ -50,7 +50,7 @@ def evaluate_keeper_value(player_name, keeper_round, adp_data, column_name, play
 st.write("App is running...")
 
 # Load the ADP data from the local file
-adp_data = load_adp_data()
+adp_data, adp_index = load_adp_data()
 
 if adp_data is not None:
     st.write("ADP Data Preview:")
@@ -63,7 +63,7 @@ if adp_data is not None:
 
     if st.button("Evaluate Keeper Value"):
         if player_name and keeper_round:
-            insight = evaluate_keeper_value(player_name, keeper_round, adp_data, column_name, players_per_round)
+            insight = evaluate_keeper_value(player_name, keeper_round, adp_index, column_name, players_per_round)
             st.write(insight)
         else:
             st.write("Please enter both the player's name and the keeper round.")
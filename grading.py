@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+
+from adp import ADP_SOURCES
+from timing import timed
+
+
+# Flatten Sleeper pick JSON into one row per pick
+@timed('normalize')
+def picks_to_frame(draft_picks):
+    picks = pd.json_normalize(draft_picks)
+    for column in ['metadata.first_name', 'metadata.last_name', 'metadata.position', 'is_keeper', 'player_id']:
+        if column not in picks:
+            picks[column] = None
+    return pd.DataFrame({
+        'roster_id': picks['roster_id'],
+        'player_id': picks['player_id'],
+        'full_name': picks['metadata.first_name'].fillna('') + ' ' + picks['metadata.last_name'].fillna(''),
+        'position': picks['metadata.position'].fillna('Unknown'),
+        'round': picks['round'].astype(int),
+        'pick_no': picks['pick_no'].astype(int),
+        'is_keeper_info': picks['is_keeper'],
+    })
+
+
+# Look up the ADP row position of every pick at once (-1 when not listed)
+@timed('join')
+def adp_positions(names, adp_index, player_ids=None, player_positions=None):
+    return adp_index.positions(names, player_ids, player_positions)
+
+
+# ADP for every source, as an (n, len(ADP_SOURCES)) array with NaN for unlisted players
+def adp_matrix(positions, adp_index):
+    values = adp_index.values[np.maximum(positions, 0)]
+    values[positions < 0] = np.nan
+    return values
+
+
+# Convert ADP to draft round; works on scalars and arrays, NaN stays NaN
+def adp_to_round(adp, players_per_round):
+    return np.ceil(np.asarray(adp, dtype=float) / np.asarray(players_per_round, dtype=float))
+
+
+# Grade a table of (player, keeper round) pairs against every ADP source.
+# players_per_round may be a scalar or a per-row array, so keepers from
+# leagues of different sizes can be graded in one call. Extra columns (team,
+# league, ...) are carried through untouched.
+def evaluate_keepers(keepers, adp_index, players_per_round, player_column='full_name', round_column='round'):
+    graded = keepers.copy()
+    player_ids = graded['player_id'] if 'player_id' in graded and adp_index.has_player_ids else None
+    player_positions = graded['position'] if 'position' in graded else None
+    adp = adp_matrix(adp_positions(graded[player_column], adp_index, player_ids, player_positions), adp_index)
+    players_per_round = np.asarray(players_per_round, dtype=float)
+    if players_per_round.ndim:
+        players_per_round = players_per_round[:, None]
+    adp_round = adp_to_round(adp, players_per_round)
+    round_diff = adp_round - graded[round_column].to_numpy(dtype=float)[:, None]
+
+    for i, source in enumerate(ADP_SOURCES):
+        graded[f'adp_{source}'] = adp[:, i]
+        graded[f'adp_round_{source}'] = adp_round[:, i]
+        graded[f'round_diff_{source}'] = round_diff[:, i]
+    return graded
+
+
+# Add each pick's value and, per source, the drafted player's value over it (see value_curve.py)
+def add_pick_values(graded, curve):
+    adp = graded[[f'adp_{source}' for source in ADP_SOURCES]].to_numpy(dtype=float)
+    pick_value = curve.pick_values(graded['pick_no'].to_numpy())
+    value_over_pick = curve.value(adp) - pick_value[:, None]
+    graded['pick_value'] = pick_value
+    for i, source in enumerate(ADP_SOURCES):
+        graded[f'value_over_pick_{source}'] = value_over_pick[:, i]
+    return graded
+
+
+# Grade a whole draft: ADP, ADP round, round differential and value over pick for every source
+@timed('grade')
+def grade_picks(picks, adp_index, players_per_round, team_id_to_name=None):
+    graded = add_pick_values(evaluate_keepers(picks, adp_index, players_per_round), adp_index.value_curve)
+    if team_id_to_name is not None:
+        graded.insert(0, 'team_name', graded['roster_id'].map(team_id_to_name).fillna("Unknown Team"))
+    return graded
+
+
+# Pick the precomputed columns for one ADP source without recomputing anything
+def select_adp_source(graded, column_name):
+    view = graded.drop(columns=[c for c in graded.columns if c.startswith(('adp_', 'round_diff_', 'value_over_pick_'))])
+    view['adp'] = graded[f'adp_{column_name}']
+    view['adp_round'] = graded[f'adp_round_{column_name}']
+    view['round_diff'] = graded[f'round_diff_{column_name}']
+    # Grades saved before pick values existed don't have the column
+    if f'value_over_pick_{column_name}' in graded:
+        view['value_over_pick'] = graded[f'value_over_pick_{column_name}']
+    return view
@@ -0,0 +1,250 @@
+"""Local player-headshot cache.
+
+``player_images/manifest.json`` maps player keys (``image_key``) to
+size-normalized thumbnails under ``player_images/thumbs/``. The apps load it
+once and look up images with a dict hit instead of stat-ing a file per pick.
+``HeadshotPrefetcher`` fills in missing players from NFL.com with a shared
+session, a few worker threads and a global rate limit; progress is saved to
+the manifest as it goes, so an interrupted run picks up where it stopped.
+
+    python headshots.py            # prefetch every player in data.csv
+"""
+import io
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from matching import canonical_key
+from replay import install_from_env
+from timing import timed
+
+IMAGE_DIR = 'player_images'
+# Version 1 manifests were keyed with nicknames folded (see image_key)
+MANIFEST_VERSION = 2
+NFL_URL = 'https://www.nfl.com'
+THUMBNAIL_SIZE = 96
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+
+# Shrink an image to a square-bounded PNG thumbnail; without Pillow the bytes are kept as-is
+def make_thumbnail(image_bytes, size=THUMBNAIL_SIZE):
+    try:
+        from PIL import Image
+    except ImportError:
+        return image_bytes
+    image = Image.open(io.BytesIO(image_bytes))
+    image.thumbnail((size, size))
+    output = io.BytesIO()
+    image.save(output, format='PNG', optimize=True)
+    return output.getvalue()
+
+
+# Manifest key for a player: normalized, but nicknames are kept so Mike Thomas never gets Michael Thomas's photo
+def image_key(player_name):
+    return canonical_key(player_name, nicknames=False)
+
+
+def _file_slug(player_name):
+    return re.sub(r'[^A-Za-z0-9_.-]', '', player_name.replace(' ', '_'))
+
+
+class HeadshotManifest:
+    """Index of cached headshots, keyed by ``image_key``."""
+
+    def __init__(self, directory=IMAGE_DIR):
+        self.directory = directory
+        self.path = os.path.join(directory, 'manifest.json')
+        self.images = {}
+        self.failed = {}
+        self._mtime = None
+        self._lock = threading.Lock()
+        self.refresh()
+
+    # Reload if another process rewrote the manifest; build it from the directory the first time
+    def refresh(self):
+        if not os.path.exists(self.path):
+            if os.path.isdir(self.directory):
+                self.rebuild()
+            return
+        mtime = os.path.getmtime(self.path)
+        if mtime != self._mtime:
+            with open(self.path) as f:
+                manifest = json.load(f)
+            self.images = manifest.get('images', {})
+            self.failed = manifest.get('failed', {})
+            if manifest.get('version', 1) < MANIFEST_VERSION:
+                # Re-key images by the player name in their filename; old failures can't be, so they're retried
+                self.images = {image_key(os.path.splitext(os.path.basename(filename))[0].replace('_', ' ')): filename
+                               for filename in self.images.values()}
+                self.failed = {}
+            self._mtime = mtime
+
+    # Index (and thumbnail) the full-size First_Last.png images already in the directory
+    def rebuild(self):
+        for filename in sorted(os.listdir(self.directory)):
+            if filename.lower().endswith('.png'):
+                player_name = os.path.splitext(filename)[0].replace('_', ' ')
+                with open(os.path.join(self.directory, filename), 'rb') as f:
+                    self.add(player_name, f.read(), save=False)
+        self.save()
+
+    # Thumbnail path for a player, or None
+    def path_for(self, player_name):
+        filename = self.images.get(image_key(player_name))
+        return os.path.join(self.directory, filename) if filename else None
+
+    # Thumbnail paths for a column of names, resolving each distinct name once
+    @timed('images')
+    def paths_for(self, names):
+        resolved = {}
+        return [resolved[name] if name in resolved else resolved.setdefault(name, self.path_for(name)) for name in names]
+
+    def __contains__(self, player_name):
+        return image_key(player_name) in self.images
+
+    # Store a downloaded image as a thumbnail and index it
+    def add(self, player_name, image_bytes, save=True):
+        filename = os.path.join('thumbs', _file_slug(player_name) + '.png')
+        # Decoded before the file is opened, so an unreadable image leaves nothing behind
+        thumbnail = make_thumbnail(image_bytes)
+        os.makedirs(os.path.join(self.directory, 'thumbs'), exist_ok=True)
+        with open(os.path.join(self.directory, filename), 'wb') as f:
+            f.write(thumbnail)
+        with self._lock:
+            self.images[image_key(player_name)] = filename
+            self.failed.pop(image_key(player_name), None)
+        if save:
+            self.save()
+
+    # Remember a lookup that found nothing, so resumed runs skip it
+    def mark_failed(self, player_name, reason):
+        with self._lock:
+            self.failed[image_key(player_name)] = {'reason': reason, 'at': int(time.time())}
+
+    # Write the manifest atomically
+    def save(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with self._lock:
+            manifest = {'version': MANIFEST_VERSION, 'images': dict(self.images), 'failed': dict(self.failed)}
+        fd, staging = tempfile.mkstemp(prefix='.manifest-', dir=self.directory)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        os.replace(staging, self.path)
+        self._mtime = os.path.getmtime(self.path)
+
+
+class RateLimiter:
+    """Spaces calls at least 1/rate seconds apart across all threads."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+class HeadshotPrefetcher:
+    """Concurrent, rate-limited, resumable fill-in of missing headshots."""
+
+    def __init__(self, manifest, base_url=NFL_URL, max_workers=4, requests_per_second=2.0, timeout=10, save_every=10):
+        self.manifest = manifest
+        self.base_url = base_url.rstrip('/')
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.save_every = save_every
+        self.limiter = RateLimiter(requests_per_second)
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+        install_from_env(self.session)
+        self.progress = {'done': 0, 'found': 0, 'failed': 0, 'total': 0}
+
+    def _get(self, url):
+        self.limiter.wait()
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response
+
+    # Find the headshot image URL for a player from the NFL.com search and player pages
+    def find_headshot_url(self, player_name):
+        from bs4 import BeautifulSoup
+
+        search = self._get(f"{self.base_url}/players/search?name={urllib.parse.quote(player_name)}")
+        player_link = BeautifulSoup(search.content, 'html.parser').find('a', class_='d3-o-player-fullname')
+        if not player_link:
+            return None
+        player_page = self._get(urllib.parse.urljoin(self.base_url + '/', player_link['href']))
+        headshot = BeautifulSoup(player_page.content, 'html.parser').find('img', class_='d3-o-player-headshot')
+        if not headshot or 'src' not in headshot.attrs:
+            return None
+        return urllib.parse.urljoin(self.base_url + '/', headshot['src'].replace('{formatInstructions}', 't_headshot_desktop'))
+
+    # Players that still need an image (previous failures are skipped unless retry_failed)
+    def missing(self, names, retry_failed=False):
+        seen, missing = set(), []
+        for name in names:
+            key = image_key(name)
+            if key in seen or key in self.manifest.images or (key in self.manifest.failed and not retry_failed):
+                continue
+            seen.add(key)
+            missing.append(name)
+        return missing
+
+    def _fetch_one(self, player_name):
+        try:
+            url = self.find_headshot_url(player_name)
+            if url is None:
+                self.manifest.mark_failed(player_name, 'not found')
+                return False
+            self.manifest.add(player_name, self._get(url).content, save=False)
+            return True
+        except requests.RequestException as e:
+            self.manifest.mark_failed(player_name, str(e))
+            return False
+        # Not an image Pillow can read (PIL.UnidentifiedImageError is an OSError), or the thumbnail couldn't be written
+        except OSError as e:
+            self.manifest.mark_failed(player_name, f"bad image: {e}")
+            return False
+
+    # Fetch every missing player; returns the progress counters
+    def run(self, names, retry_failed=False):
+        todo = self.missing(names, retry_failed)
+        self.progress = {'done': 0, 'found': 0, 'failed': 0, 'total': len(todo)}
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='headshots') as executor:
+            for found in executor.map(self._fetch_one, todo):
+                self.progress['done'] += 1
+                self.progress['found' if found else 'failed'] += 1
+                if self.progress['done'] % self.save_every == 0:
+                    self.manifest.save()
+        self.manifest.save()
+        return self.progress
+
+    # Run in a background daemon thread
+    def start(self, names, retry_failed=False):
+        thread = threading.Thread(target=self.run, args=(names, retry_failed), daemon=True, name='headshot-prefetch')
+        thread.start()
+        return thread
+
+
+if __name__ == '__main__':
+    from adp_store import load_adp_table
+
+    prefetcher = HeadshotPrefetcher(HeadshotManifest())
+    progress = prefetcher.run(load_adp_table()['Name'])
+    print(f"Fetched {progress['found']} of {progress['total']} missing headshots ({progress['failed']} not found)")
@@ -0,0 +1,94 @@
+import json
+import time
+from collections import namedtuple
+
+from storage import SQLiteStore
+
+# Default location of the on-disk response cache, shared by every app worker
+CACHE_PATH = 'sleeper_cache.sqlite'
+
+CachedResponse = namedtuple('CachedResponse', ['data', 'etag', 'last_modified', 'expires_at'])
+
+
+class ResponseCache(SQLiteStore):
+    """SQLite-backed cache of decoded JSON responses keyed by URL.
+
+    Entries with ``expires_at`` of NULL never expire (immutable resources such
+    as completed-draft picks); the rest are served until their TTL runs out
+    and then revalidated with their ETag / Last-Modified validators. The
+    database runs in WAL mode so several processes can read while one writes.
+    """
+
+    def __init__(self, path=CACHE_PATH):
+        super().__init__(path)
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    body TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at REAL NOT NULL,
+                    expires_at REAL
+                )
+                """
+            )
+
+    # Return the cached entry for key, fresh or stale, or None
+    def get(self, key):
+        row = self._connect().execute(
+            'SELECT body, etag, last_modified, expires_at FROM responses WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        body, etag, last_modified, expires_at = row
+        return CachedResponse(json.loads(body), etag, last_modified, expires_at)
+
+    # Store a response body; ttl=None keeps it forever
+    def set(self, key, body, etag=None, last_modified=None, ttl=None):
+        now = time.time()
+        expires_at = None if ttl is None else now + ttl
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)',
+                (key, body, etag, last_modified, now, expires_at),
+            )
+
+    # Extend a revalidated entry without rewriting its body
+    def touch(self, key, ttl=None):
+        now = time.time()
+        expires_at = None if ttl is None else now + ttl
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                'UPDATE responses SET fetched_at = ?, expires_at = ? WHERE key = ?', (now, expires_at, key)
+            )
+
+    # Mark an entry as immutable, e.g. once its draft is complete
+    def pin(self, key):
+        conn = self._connect()
+        with conn:
+            conn.execute('UPDATE responses SET expires_at = NULL WHERE key = ?', (key,))
+
+    # Drop one entry, every entry under a key prefix, or the whole cache
+    def invalidate(self, key=None, prefix=None):
+        conn = self._connect()
+        with conn:
+            if key is not None:
+                conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+            elif prefix is not None:
+                conn.execute("DELETE FROM responses WHERE key LIKE ? ESCAPE '\\'", (_escape_like(prefix) + '%',))
+            else:
+                conn.execute('DELETE FROM responses')
+
+
+# Whether a cached entry can be served without revalidation
+def is_fresh(entry, now=None):
+    return entry.expires_at is None or entry.expires_at > (time.time() if now is None else now)
+
+
+def _escape_like(text):
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
@@ -0,0 +1,104 @@
+"""Best keeper set for every team in a league.
+
+A keeper costs the pick in the round the player was drafted (optionally moved
+``round_inflation`` rounds earlier) and is worth the rounds saved against ADP:
+``keeper_round - adp_round``, i.e. ``-round_diff`` from ``grading``. Each team
+keeps at most ``max_keepers`` players, no two in the same round. With
+``allow_bump`` a keeper whose round is already taken moves to the next free
+earlier round (and is worth that much less) instead of being ruled out.
+
+The per-team solver is a small DP over rounds, latest first, with state (keepers
+chosen, keepers waiting for a round after being bumped), rather than a walk over
+every subset. Each round goes to the waiting keeper with the latest ADP round,
+which is what keeps bumps within ``min_value`` whenever any order could.
+"""
+import numpy as np
+
+from grading import adp_to_round
+
+
+# Drafted players still on each roster; rosters are Sleeper roster dicts with a 'players' list
+def keeper_candidates(picks, rosters=None):
+    if rosters is None:
+        return picks.copy()
+    on_roster = {
+        (roster['roster_id'], str(player_id))
+        for roster in rosters
+        for player_id in roster.get('players') or ()
+    }
+    keep = [(roster_id, str(player_id)) in on_roster for roster_id, player_id in zip(picks['roster_id'], picks['player_id'])]
+    return picks[keep].copy()
+
+
+# Best keepers for one team. keeper_rounds and adp_rounds are per-candidate arrays
+# (NaN ADP = not keepable); returns [(candidate index, assigned round), ...].
+def solve_team_keepers(keeper_rounds, adp_rounds, max_keepers, allow_bump=False, min_value=0):
+    keeper_rounds = np.asarray(keeper_rounds, dtype=int)
+    adp_rounds = np.asarray(adp_rounds, dtype=float)
+    eligible = ~np.isnan(adp_rounds)
+    if not allow_bump:
+        # Without bumping a keeper can only sit in its own round, so it must clear min_value there
+        eligible &= keeper_rounds - adp_rounds >= min_value
+    by_round = {}
+    for i in np.flatnonzero(eligible):
+        by_round.setdefault(int(keeper_rounds[i]), []).append(int(i))
+
+    # states[(chosen, queued ADP rounds)] = (value, picks, queue). Rounds are filled latest first; a keeper
+    # joins the queue in its own round and every round with a queue goes to the queued keeper with the
+    # latest ADP round, who has the least value to spare for a further bump (a queue left over is a bump)
+    def add(states, chosen, value, picks, queue):
+        key = (chosen, tuple(adp_rounds[i] for i in queue))
+        if key not in states or value > states[key][0]:
+            states[key] = (value, picks, queue)
+
+    states = {(0, ()): (0.0, (), ())}
+    for round_no in range(int(keeper_rounds.max(initial=0)), 0, -1):
+        for i in by_round.get(round_no, ()):
+            for (chosen, _), (value, picks, queue) in list(states.items()):
+                if chosen < max_keepers:
+                    add(states, chosen + 1, value, picks, tuple(sorted(queue + (i,), key=lambda j: -adp_rounds[j])))
+
+        filled = {}
+        for (chosen, _), (value, picks, queue) in states.items():
+            if queue:
+                i, queue = queue[0], queue[1:]
+                gain = round_no - adp_rounds[i]
+                if gain < min_value or (queue and not allow_bump):
+                    continue
+                value, picks = value + gain, picks + ((i, round_no),)
+            add(filled, chosen, value, picks, queue)
+        states = filled
+
+    # Keepers still queued after round 1 had nowhere to go
+    _, best, _ = max((state for state in states.values() if not state[2]), key=lambda state: (state[0], -len(state[1])))
+    return list(best)
+
+
+# Value-maximizing keeper set for every team in a graded pick frame (from grading.grade_picks)
+def optimize_keepers(graded, players_per_round, max_keepers=3, source='Sleeper', round_inflation=0,
+                     allow_bump=False, min_value=0, team_column='roster_id'):
+    candidates = graded.reset_index(drop=True)
+    keeper_rounds = np.maximum(candidates['round'].to_numpy(dtype=int) - round_inflation, 1)
+    adp_rounds = adp_to_round(candidates[f'adp_{source}'], players_per_round)
+
+    chosen_rows, assigned_rounds = [], []
+    for rows in candidates.groupby(team_column, sort=True).indices.values():
+        for i, assigned in solve_team_keepers(keeper_rounds[rows], adp_rounds[rows], max_keepers, allow_bump, min_value):
+            chosen_rows.append(rows[i])
+            assigned_rounds.append(assigned)
+
+    keepers = candidates.iloc[chosen_rows].drop(
+        columns=[c for c in candidates.columns if c.startswith(('adp_', 'round_diff_'))]
+    )
+    keepers['keeper_round'] = assigned_rounds
+    keepers['adp'] = candidates[f'adp_{source}'].to_numpy()[chosen_rows]
+    keepers['adp_round'] = adp_rounds[chosen_rows]
+    keepers['value'] = keepers['keeper_round'] - keepers['adp_round']
+    return keepers.sort_values([team_column, 'keeper_round'], ignore_index=True)
+
+
+# Total keeper value per team, best first
+def team_keeper_values(keepers, team_column='roster_id'):
+    return keepers.groupby(team_column)['value'].agg(['sum', 'count']).rename(
+        columns={'sum': 'value', 'count': 'keepers'}
+    ).sort_values('value', ascending=False)
@@ -0,0 +1,100 @@
+"""Crawl a league's history back through previous seasons into the draft store.
+
+Sleeper links each season's league to the one before it with
+``previous_league_id``. Starting from a league ID the crawler walks that
+chain, finds every draft of every season and stores its picks, rosters and
+team names in the draft store (``draft_store.DraftStore``), where
+``pipeline.grade_stored_draft`` grades them without the network. A season's
+requests go out together on the client's pool, and each season is
+checkpointed once it is stored, so an interrupted crawl resumes where it
+stopped and a rerun only fetches seasons still in progress.
+
+    python league_history.py 1124850630842675200 [more league IDs]
+"""
+import sys
+
+
+class LeagueCrawler:
+    """Walks ``previous_league_id`` chains and stores each season's drafts."""
+
+    def __init__(self, client, store, max_seasons=25):
+        self.client = client
+        self.store = store
+        self.max_seasons = max_seasons
+        self.seen_leagues = set()
+        self.progress = {'seasons': 0, 'skipped': 0, 'drafts': 0}
+
+    # League seasons from league_id back to the first, newest first; finished seasons come from the store
+    def season_chain(self, league_id):
+        chain = []
+        while league_id and league_id != '0' and len(chain) < self.max_seasons:
+            league_id = str(league_id)
+            stored = self.store.league(league_id)
+            if stored and stored['crawled_at'] and stored['status'] == 'complete':
+                league = stored
+            else:
+                league = self.client.get(f"league/{league_id}", ttl=self.client.roster_ttl)
+                if not league:
+                    break
+            chain.append(league)
+            league_id = league.get('previous_league_id')
+        return chain
+
+    # Whether a season is already stored and can't change any more
+    def is_done(self, league):
+        stored = self.store.league(league['league_id'])
+        return bool(stored and stored['crawled_at'] and stored['status'] == 'complete')
+
+    # Fetch and store one season: its drafts' picks, the rosters and the team names
+    def crawl_season(self, league):
+        league_id = str(league['league_id'])
+        drafts = self.client.get(f"league/{league_id}/drafts", ttl=self.client.roster_ttl) or []
+
+        # Completed drafts already stored by an earlier crawl are skipped
+        stored = self.store.league_drafts(league_id)
+        done = set(stored.loc[stored['status'] == 'complete', 'draft_id'])
+        todo = [d for d in drafts if not (d.get('status') == 'complete' and str(d['draft_id']) in done
+                                          and self.store.has_picks(d['draft_id']))]
+
+        requests = [(f"league/{league_id}/rosters", self.client.roster_ttl),
+                    (f"league/{league_id}/users", self.client.user_ttl)]
+        requests += [(f"draft/{d['draft_id']}/picks", None if d.get('status') == 'complete' else self.client.live_ttl)
+                     for d in todo]
+        rosters, users, *picks = self.client.map(lambda request: self.client.get(*request), requests)
+        team_id_to_name = self.client.map_team_id_to_name(rosters or [], users)
+
+        # Picks before the draft rows, and the season last, so a crash never marks unfetched data as done
+        for draft, draft_picks in zip(todo, picks):
+            self.store.save_picks(draft['draft_id'], draft_picks or [])
+        self.store.save_league_drafts(league_id, drafts)
+        self.store.save_rosters(league_id, rosters or [], team_id_to_name)
+        self.store.save_league(league, crawled=True)
+        self.progress['drafts'] += len(todo)
+        return len(todo)
+
+    # Crawl every season reachable from league_id; returns the chain, newest first
+    def crawl(self, league_id):
+        chain = self.season_chain(league_id)
+        for league in chain:
+            key = str(league['league_id'])
+            if key in self.seen_leagues or self.is_done(league):
+                self.progress['skipped'] += 1
+            else:
+                self.crawl_season(league)
+                self.progress['seasons'] += 1
+            self.seen_leagues.add(key)
+        return chain
+
+
+if __name__ == '__main__':
+    from draft_store import DraftStore
+    from http_cache import ResponseCache
+    from sleeper import SleeperClient
+
+    with SleeperClient(cache=ResponseCache()) as client:
+        crawler = LeagueCrawler(client, DraftStore())
+        for league_id in sys.argv[1:]:
+            chain = crawler.crawl(league_id)
+            print(f"{league_id}: {len(chain)} seasons ({', '.join(str(league.get('season')) for league in chain)})")
+    print(f"Fetched {crawler.progress['seasons']} seasons and {crawler.progress['drafts']} drafts, "
+          f"{crawler.progress['skipped']} seasons already stored")
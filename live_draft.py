@@ -0,0 +1,125 @@
+import time
+
+import pandas as pd
+
+from grading import grade_picks, picks_to_frame
+from timing import timed
+
+
+class LiveDraft:
+    """Incrementally graded board for a draft that is still in progress.
+
+    Sleeper has no "picks since" endpoint, so each poll first checks the
+    cheap draft object (``last_picked``) and only downloads the pick list
+    when it moved. Only picks past the last seen ``pick_no`` are graded, and
+    ``poll`` hands back just that chunk so callers (scarcity, the latest
+    round, the boards of the teams that picked) update in time proportional
+    to the new picks. ``frame`` is only built when read, and reading it after
+    an update copies the whole board, so the poll path doesn't.
+    Polling backs off while nothing happens and tightens to the pick clock
+    when picks are flowing.
+    """
+
+    def __init__(self, client, draft_id, adp_index, players_per_round, team_id_to_name,
+                 min_interval=2, max_interval=30, enrich=None):
+        self.client = client
+        self.draft_id = draft_id
+        self.adp_index = adp_index
+        self.players_per_round = players_per_round
+        self.team_id_to_name = team_id_to_name
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        # Optional per-chunk hook, e.g. to attach image paths to new picks
+        self.enrich = enrich
+
+        self.status = None
+        self.last_pick_no = 0
+        self.last_picked = None
+        self.interval = min_interval
+        self.next_poll_at = 0.0
+        self._frame = None
+        self._pending = []
+        self._team_chunks = {}
+        # The picks graded by the last poll that found any
+        self.last_update = None
+
+    # All graded picks so far; chunks graded since the last read are concatenated onto the board,
+    # which copies it, so read this for a full-page render and not per poll
+    @property
+    def frame(self):
+        if self._pending:
+            chunks = ([self._frame] if self._frame is not None else []) + self._pending
+            self._frame = pd.concat(chunks, ignore_index=True)
+            self._pending = []
+        return self._frame
+
+    # The last n graded picks, without building the whole board
+    def recent(self, n):
+        chunks, count = [], 0
+        for chunk in reversed(([self._frame] if self._frame is not None else []) + self._pending):
+            chunks.append(chunk.tail(n - count))
+            count += len(chunks[-1])
+            if count >= n:
+                break
+        return pd.concat(chunks[::-1], ignore_index=True) if chunks else None
+
+    # One team's graded picks so far, from that team's own chunks
+    def team_picks(self, team):
+        chunks = self._team_chunks.get(team)
+        return pd.concat(chunks, ignore_index=True) if chunks else None
+
+    @property
+    def complete(self):
+        return self.status == 'complete'
+
+    # Poll Sleeper if it's time; returns the newly graded picks (possibly empty) or None if skipped
+    @timed('live.poll')
+    def poll(self, now=None):
+        now = time.time() if now is None else now
+        if self.complete or now < self.next_poll_at:
+            return None
+
+        draft = self.client.get(f"draft/{self.draft_id}", ttl=self.client.live_ttl, revalidate=True) or {}
+        self.status = draft.get('status')
+        last_picked = draft.get('last_picked')
+        new_picks = []
+        if last_picked is None or last_picked != self.last_picked:
+            picks = self.client.get(f"draft/{self.draft_id}/picks", ttl=self.client.live_ttl, revalidate=True) or []
+            new_picks = [pick for pick in picks if pick['pick_no'] > self.last_pick_no]
+            self.last_picked = last_picked
+
+        graded = self.add_picks(new_picks)
+        self._schedule(draft, bool(new_picks), now)
+        return graded
+
+    # Grade and append picks, ignoring any already seen
+    def add_picks(self, picks):
+        picks = sorted((pick for pick in picks if pick['pick_no'] > self.last_pick_no), key=lambda pick: pick['pick_no'])
+        if not picks:
+            return pd.DataFrame()
+        graded = grade_picks(picks_to_frame(picks), self.adp_index, self.players_per_round, self.team_id_to_name)
+        if self.enrich is not None:
+            graded = self.enrich(graded)
+        self._pending.append(graded)
+        for team, rows in graded.groupby('team_name', sort=False):
+            self._team_chunks.setdefault(team, []).append(rows)
+        self.last_update = graded
+        self.last_pick_no = picks[-1]['pick_no']
+        return graded
+
+    # Teams whose boards changed in an update
+    @staticmethod
+    def affected_teams(graded):
+        return set(graded['team_name']) if len(graded) else set()
+
+    # Adapt the poll interval to the draft clock and recent activity
+    def _schedule(self, draft, got_picks, now):
+        if self.status == 'drafting':
+            pick_timer = (draft.get('settings') or {}).get('pick_timer')
+            floor = max(self.min_interval, min(pick_timer / 4, self.max_interval)) if pick_timer else self.min_interval
+            self.interval = floor if got_picks else min(self.interval * 1.5, self.max_interval)
+            self.interval = max(self.interval, floor)
+        else:
+            # Paused or not started yet
+            self.interval = self.max_interval
+        self.next_poll_at = now + self.interval
@@ -0,0 +1,203 @@
+import re
+import unicodedata
+from collections import defaultdict
+
+# Name suffixes Sleeper and the ADP sources disagree on
+SUFFIXES = {'jr', 'sr', 'ii', 'iii', 'iv', 'v'}
+
+# Common first-name nicknames mapped to the form used in the ADP sheet
+NICKNAMES = {
+    'gabe': 'gabriel',
+    'mike': 'michael',
+    'mitch': 'mitchell',
+    'chris': 'christopher',
+    'matt': 'matthew',
+    'josh': 'joshua',
+    'jon': 'jonathan',
+    'nate': 'nathaniel',
+    'rob': 'robert',
+    'bob': 'robert',
+    'will': 'william',
+    'ken': 'kenneth',
+    'dan': 'daniel',
+    'tony': 'anthony',
+    'zach': 'zachary',
+    'alex': 'alexander',
+    'nick': 'nicholas',
+    'ben': 'benjamin',
+    'sam': 'samuel',
+    'tim': 'timothy',
+    'tom': 'thomas',
+    'joe': 'joseph',
+    'jeff': 'jeffery',
+    'cam': 'cameron',
+    'dave': 'david',
+    'drew': 'andrew',
+    'hollywood': 'marquise',
+}
+
+_NON_ALNUM = re.compile(r'[^a-z0-9 ]+')
+
+
+# Canonical matching key: no accents, punctuation, suffixes or (unless nicknames=False) nicknames.
+# "D.J. Moore" -> "dj moore", "Kenneth Walker III" -> "kenneth walker"
+def canonical_key(player_name, nicknames=True):
+    text = unicodedata.normalize('NFKD', str(player_name)).encode('ascii', 'ignore').decode()
+    text = _NON_ALNUM.sub('', text.lower().replace('-', ' '))
+    tokens = [token for token in text.split() if token not in SUFFIXES] or text.split()
+    if tokens and nicknames:
+        tokens[0] = NICKNAMES.get(tokens[0], tokens[0])
+    return ' '.join(tokens)
+
+
+# Positions as Sleeper and the ADP sheet write them; None when unknown
+def _position_code(position):
+    if position is None or (isinstance(position, float) and position != position):
+        return None
+    position = str(position).upper()
+    return None if position in ('', 'UNKNOWN', 'NAN') else position
+
+
+def _trigrams(key):
+    padded = f'  {key} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+# Levenshtein distance, giving up early once it exceeds max_distance
+def edit_distance(a, b, max_distance=None):
+    if abs(len(a) - len(b)) > (max_distance if max_distance is not None else len(a) + len(b)):
+        return max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if max_distance is not None and min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+class PlayerMatcher:
+    """Resolve Sleeper player names (or IDs) to rows of the ADP table.
+
+    Lookups try, in order: a Sleeper ``player_id`` mapping, the canonical key
+    (case, punctuation and suffixes removed), the same key with nicknames
+    expanded, then a fuzzy match. Nickname forms are only aliases, so "Mike
+    Thomas" and "Michael Thomas" stay two players when the sheet lists both.
+    The fuzzy step only compares against candidates that share the most
+    character trigrams with the query, so it never scans the whole pool, and
+    it only accepts a candidate whose every name part is a near match and
+    whose position agrees with the pick's (or, without a position, whose last
+    name is identical). A player missing from the sheet is then unmatched
+    instead of borrowing a similar name's ADP. Results are memoized per name
+    and position.
+    """
+
+    def __init__(self, names, aliases=None, player_ids=None, min_similarity=0.8, max_candidates=8, positions=None):
+        self.min_similarity = min_similarity
+        self.max_candidates = max_candidates
+        self.keys = []
+        self.rows = {}
+        self.trigrams = defaultdict(list)
+        self.positions = None if positions is None else [_position_code(position) for position in positions]
+        nickname_rows = defaultdict(set)
+        for position, name in enumerate(names):
+            key = canonical_key(name, nicknames=False)
+            self.keys.append(key)
+            nickname_rows[canonical_key(name)].add(key)
+            if key in self.rows:
+                continue
+            # Keep the first (highest ranked) row for duplicate keys
+            self.rows[key] = position
+            for gram in _trigrams(key):
+                self.trigrams[gram].append(position)
+
+        # Nickname-expanded keys resolve only when exactly one listed name expands to them
+        self.nickname_rows = {
+            nickname_key: self.rows[next(iter(keys))] for nickname_key, keys in nickname_rows.items() if len(keys) == 1
+        }
+
+        # Explicit aliases, e.g. {'Hollywood Brown': 'Marquise Brown'}
+        for alias, name in (aliases or {}).items():
+            position = self.row_for_name(name)
+            if position is not None:
+                self.rows.setdefault(canonical_key(alias, nicknames=False), position)
+        self.player_ids = {}
+        self._memo = {}
+        self.add_player_ids(player_ids or {})
+
+    # Row of a name exactly as the ADP sheet spells it (no fuzzy matching), or None
+    def row_for_name(self, name):
+        return self.rows.get(canonical_key(name, nicknames=False))
+
+    # Register Sleeper player_id -> ADP name mappings
+    def add_player_ids(self, player_ids):
+        for player_id, name in player_ids.items():
+            position = self.row_for_name(name)
+            if position is not None:
+                self.player_ids[str(player_id)] = position
+
+    # Row position for a player, or None if nothing is close enough.
+    # player_position (e.g. Sleeper's metadata position) guards the fuzzy step.
+    def match(self, player_name, player_id=None, player_position=None):
+        if player_id is not None:
+            position = self.player_ids.get(str(player_id))
+            if position is not None:
+                return position
+        memo_key = (player_name, _position_code(player_position))
+        if memo_key in self._memo:
+            return self._memo[memo_key]
+
+        key = canonical_key(player_name, nicknames=False)
+        position = self.rows.get(key)
+        if position is None:
+            position = self.nickname_rows.get(canonical_key(player_name))
+            if position is not None and not self._same_position(position, memo_key[1]):
+                position = None
+        if position is None and key:
+            position = self._fuzzy(key, memo_key[1])
+        self._memo[memo_key] = position
+        return position
+
+    # Whether a fuzzy candidate is plausibly the same player and not a similar name
+    def _plausible(self, key, row, player_position):
+        tokens, candidate = key.split(), self.keys[row].split()
+        if len(tokens) != len(candidate):
+            return False
+        # Every name part must be a near match on its own ("Bijan" is not a typo of "Brian")
+        for token, other in zip(tokens, candidate):
+            limit = int(max(len(token), len(other)) * (1 - self.min_similarity))
+            if token != other and edit_distance(token, other, limit) > limit:
+                return False
+        if player_position is not None and self._row_position(row) is not None:
+            return self._same_position(row, player_position)
+        return tokens[-1] == candidate[-1]
+
+    def _row_position(self, row):
+        return self.positions[row] if self.positions is not None else None
+
+    # Whether a row can be the pick's position; unknown on either side counts as a match
+    def _same_position(self, row, player_position):
+        row_position = self._row_position(row)
+        if player_position is None or row_position is None:
+            return True
+        return player_position == row_position or {player_position, row_position} == {'RB', 'FB'}
+
+    def _fuzzy(self, key, player_position=None):
+        grams = _trigrams(key)
+        counts = defaultdict(int)
+        for gram in grams:
+            for position in self.trigrams.get(gram, ()):
+                counts[position] += 1
+        if not counts:
+            return None
+
+        candidates = sorted(counts, key=counts.get, reverse=True)[:self.max_candidates]
+        max_distance = int(len(key) * (1 - self.min_similarity))
+        best, best_distance = None, max_distance + 1
+        for position in candidates:
+            distance = edit_distance(key, self.keys[position], max_distance)
+            if distance < best_distance and self._plausible(key, position, player_position):
+                best, best_distance = position, distance
+        return best
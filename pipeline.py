@@ -0,0 +1,195 @@
+"""Headless draft grading: fetch, normalize and grade without Streamlit.
+
+The apps and batch jobs share these functions, and nothing here imports
+Streamlit, so a script can grade hundreds of leagues in a few seconds of
+startup. Drafts are graded on a thread pool of their own (the client's pool
+only overlaps the requests inside one draft) and written out one file per
+draft.
+
+    python pipeline.py                                  # every saved draft
+    python pipeline.py --league 1124850630842675200     # a league's current draft
+    python pipeline.py --out graded --format parquet --workers 8 --save
+    python pipeline.py --crawled                        # seasons stored by league_history.py
+"""
+import argparse
+import collections
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from adp import build_adp_index
+from adp_history import HISTORY_PATH, AdpHistory
+from adp_store import load_adp_table
+from grading import grade_picks, picks_to_frame
+from player_table import load_player_table
+
+GradedDraft = collections.namedtuple(
+    'GradedDraft', ['frame', 'picks', 'players_per_round', 'team_id_to_name', 'adp_version', 'adp_date', 'season']
+)
+
+
+# Identifies an ADP table on disk, so saved grades can tell when they're out of date
+def adp_csv_version(path='data.csv'):
+    return f"csv:{int(os.path.getmtime(path))}" if os.path.exists(path) else 'csv:none'
+
+
+class AdpResolver:
+    """Current ADP index plus, when the history store has it, the ADP in force on a draft's date."""
+
+    def __init__(self, path='data.csv', history_path=HISTORY_PATH):
+        self.player_table = load_player_table()
+        self.data = load_adp_table(path)
+        self.index = build_adp_index(self.data, player_table=self.player_table)
+        self.version = adp_csv_version(path)
+        self.history_path = history_path
+        self._as_of = {}
+        self._lock = threading.Lock()
+
+    # (data, index) for a date, or (None, None) when the history doesn't cover it; built once per date
+    def as_of(self, draft_date):
+        with self._lock:
+            if draft_date not in self._as_of:
+                self._as_of[draft_date] = (None, None)
+                if os.path.exists(self.history_path):
+                    history = AdpHistory(self.history_path)
+                    if history.has_data(draft_date):
+                        data = history.adp_as_of(draft_date)
+                        self._as_of[draft_date] = (data, build_adp_index(data, player_table=self.player_table))
+            return self._as_of[draft_date]
+
+    # (index, version, date) to grade a draft with: its draft-day ADP if known, else the current table
+    def for_draft(self, draft_info):
+        start_time = (draft_info or {}).get('start_time')
+        if start_time:
+            draft_date = pd.Timestamp(start_time, unit='ms').date().isoformat()
+            _, index = self.as_of(draft_date)
+            if index is not None:
+                return index, f"history:{draft_date}", draft_date
+        return self.index, self.version, None
+
+
+# Fetch and grade one draft; None when it has no picks yet
+def grade_draft(client, league_id, draft_id, adp):
+    rosters, team_id_to_name, draft_picks = client.fetch_draft(league_id, draft_id)
+    if not draft_picks:
+        return None
+    draft_info = client.fetch_draft_info(draft_id) or {}
+    adp_index, adp_version, adp_date = adp.for_draft(draft_info)
+    players_per_round = len(rosters)
+    graded = grade_picks(picks_to_frame(draft_picks), adp_index, players_per_round, team_id_to_name)
+    return GradedDraft(graded, draft_picks, players_per_round, team_id_to_name, adp_version, adp_date, draft_info.get('season'))
+
+
+# Grade a draft stored by the league history crawler, without the network; None if it isn't stored
+def grade_stored_draft(store, league_id, draft_id, adp, start_time=None, season=None):
+    draft_picks = store.load_picks(draft_id)
+    rosters, team_id_to_name = store.load_rosters(league_id)
+    if not draft_picks or rosters is None:
+        return None
+    adp_index, adp_version, adp_date = adp.for_draft({'start_time': start_time})
+    players_per_round = len(rosters)
+    graded = grade_picks(picks_to_frame(draft_picks), adp_index, players_per_round, team_id_to_name)
+    return GradedDraft(graded, draft_picks, players_per_round, team_id_to_name, adp_version, adp_date, season)
+
+
+# Saved drafts and/or league IDs as (name, league_id, draft_id) targets
+def draft_targets(client, store=None, league_ids=()):
+    targets = []
+    if store is not None:
+        targets += [tuple(row) for row in store.drafts().itertuples(index=False, name=None)]
+    leagues = client.map(lambda league_id: client.get(f"league/{league_id}", ttl=client.roster_ttl), list(league_ids))
+    for league_id, league in zip(league_ids, leagues):
+        if league and league.get('draft_id'):
+            targets.append((f"{league.get('name') or league_id} {league.get('season', '')}".strip(), str(league_id), str(league['draft_id'])))
+
+    # Grade each draft once even if it is saved under several names
+    seen, unique = set(), []
+    for target in targets:
+        if target[2] not in seen:
+            seen.add(target[2])
+            unique.append(target)
+    return unique
+
+
+# Grade many drafts on a separate pool; yields (target, GradedDraft or None, error or None) in order
+def grade_drafts(client, targets, adp, max_workers=4):
+    def run(target):
+        _, league_id, draft_id = target
+        try:
+            return target, grade_draft(client, league_id, draft_id, adp), None
+        except Exception as e:
+            return target, None, e
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='grade') as executor:
+        yield from executor.map(run, targets)
+
+
+# Write one graded draft as CSV or Parquet; returns the path
+def write_graded(frame, out_dir, draft_id, fmt='csv'):
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, f"{draft_id}.{fmt}")
+    if fmt == 'parquet':
+        frame.to_parquet(path, index=False)
+    else:
+        frame.to_csv(path, index=False)
+    return path
+
+
+def main(argv=None):
+    from draft_store import DraftStore
+    from http_cache import ResponseCache
+    from sleeper import SleeperClient
+    from value_index import PlayerValueIndex
+
+    parser = argparse.ArgumentParser(description="Grade Sleeper drafts against ADP without the app.")
+    parser.add_argument('--league', action='append', default=[], help="league ID to grade (repeatable)")
+    parser.add_argument('--no-saved', action='store_true', help="skip the saved drafts")
+    parser.add_argument('--crawled', action='store_true', help="grade drafts stored by league_history.py (offline)")
+    parser.add_argument('--adp', default='data.csv', help="ADP CSV")
+    parser.add_argument('--out', default='graded', help="output directory")
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv')
+    parser.add_argument('--workers', type=int, default=4, help="drafts graded at once")
+    parser.add_argument('--save', action='store_true', help="also store grades in the saved-drafts database")
+    parser.add_argument('--index', action='store_true', help="also add the grades to the cross-league value index")
+    args = parser.parse_args(argv)
+
+    store = DraftStore()
+    adp = AdpResolver(args.adp)
+    value_index = PlayerValueIndex() if args.index else None
+    failures = 0
+    if args.crawled:
+        for draft_id, league_id, season, start_time in store.league_drafts()[['draft_id', 'league_id', 'season', 'start_time']].itertuples(index=False):
+            draft = grade_stored_draft(store, league_id, draft_id, adp, None if pd.isna(start_time) else int(start_time), season)
+            if draft is not None:
+                frame = draft.frame.assign(league_id=league_id, draft_id=draft_id, season=season)
+                if value_index is not None:
+                    value_index.add_draft(draft.frame, draft_id, league_id, draft.season, draft.adp_version)
+                print(f"{league_id} {season}: {len(frame)} picks graded -> {write_graded(frame, args.out, draft_id, args.format)}")
+        return 0
+
+    with SleeperClient(cache=ResponseCache()) as client:
+        targets = draft_targets(client, None if args.no_saved else store, args.league)
+        for (name, league_id, draft_id), draft, error in grade_drafts(client, targets, adp, args.workers):
+            if error is not None:
+                failures += 1
+                print(f"{name}: failed: {error}", file=sys.stderr)
+                continue
+            if draft is None:
+                print(f"{name}: no picks yet")
+                continue
+            frame = draft.frame.assign(league_id=league_id, draft_id=draft_id)
+            path = write_graded(frame, args.out, draft_id, args.format)
+            if value_index is not None:
+                value_index.add_draft(draft.frame, draft_id, league_id, draft.season, draft.adp_version)
+            if args.save:
+                store.save_picks(draft_id, draft.picks)
+                store.save_grades(draft_id, draft.adp_version, draft.frame, draft.players_per_round)
+            print(f"{name}: {len(frame)} picks graded with {draft.adp_version} -> {path}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
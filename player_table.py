@@ -0,0 +1,170 @@
+"""Master player table keyed by Sleeper ``player_id``.
+
+Built offline from a local copy of the Sleeper players dump
+(``GET /players/nfl``, several MB of JSON) and written as one ``.npy`` file per
+column, plus a dense ``player_id -> row`` array. Apps and batch jobs load it
+with ``mmap_mode='r'`` so every process shares the same pages instead of
+parsing the JSON or rebuilding dicts, and a pick's ``player_id`` resolves to
+its row (and ADP row) by plain integer indexing.
+
+    python player_table.py players_nfl.json            # build from a local dump
+    python player_table.py --download players_nfl.json # fetch the dump first
+"""
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from adp import ADP_SOURCES
+from matching import PlayerMatcher
+from storage import atomic_directory
+
+PLAYER_TABLE_PATH = 'player_table'
+
+
+# Parse the Sleeper dump into a frame of numeric-ID players (team defenses use team codes as IDs)
+def read_players_dump(path):
+    with open(path) as f:
+        players = json.load(f)
+    rows = []
+    for player_id, player in players.items():
+        if not str(player_id).isdigit():
+            continue
+        full_name = player.get('full_name') or f"{player.get('first_name', '')} {player.get('last_name', '')}".strip()
+        rows.append({
+            'player_id': int(player_id),
+            'name': full_name,
+            'position': player.get('position') or '',
+            'team': player.get('team') or 'FA',
+            'active': bool(player.get('active')),
+            'search_rank': player.get('search_rank') or 9999999,
+        })
+    return pd.DataFrame(rows).sort_values('player_id', ignore_index=True)
+
+
+# Resolve each Sleeper player to an ADP row: same position required, then best team/activity/rank
+def match_adp_rows(players, adp_data):
+    matcher = PlayerMatcher(adp_data['Name'], positions=adp_data['Pos'])
+    adp_pos = adp_data['Pos'].astype(str).to_numpy()
+    adp_team = adp_data['Team'].astype(str).to_numpy()
+
+    best = {}
+    for row in players.itertuples():
+        adp_row = matcher.match(row.name, player_position=row.position)
+        if adp_row is None or adp_pos[adp_row] not in (row.position, 'FB' if row.position == 'RB' else row.position):
+            continue
+        score = (adp_team[adp_row] == row.team, row.active, -row.search_rank)
+        if adp_row not in best or score > best[adp_row][0]:
+            best[adp_row] = (score, row.Index)
+
+    adp_rows = np.full(len(players), -1, dtype=np.int32)
+    for adp_row, (_, player_row) in best.items():
+        adp_rows[player_row] = adp_row
+    return adp_rows
+
+
+# Build the table from a players dump, the ADP table and (optionally) the headshot manifest
+def build_player_table(dump_path, adp_data, headshots=None, output_path=PLAYER_TABLE_PATH):
+    players = read_players_dump(dump_path)
+    adp_rows = match_adp_rows(players, adp_data)
+    has_adp = adp_rows >= 0
+
+    columns = {
+        'player_id': players['player_id'].to_numpy(dtype=np.int64),
+        'name': players['name'].to_numpy(dtype=str),
+        'adp_row': adp_rows,
+        'adp_name': np.where(has_adp, adp_data['Name'].to_numpy(dtype=str)[np.maximum(adp_rows, 0)], ''),
+        'image_path': np.array([(headshots.path_for(name) if headshots else None) or '' for name in players['name']], dtype=str),
+    }
+    for source in ADP_SOURCES:
+        adp = adp_data[source].to_numpy(dtype=np.float32)[np.maximum(adp_rows, 0)]
+        columns[f'adp_{source}'] = np.where(has_adp, adp, np.float32(np.nan)).astype(np.float32)
+    categories = {}
+    for column in ['position', 'team']:
+        categorical = pd.Categorical(players[column])
+        columns[column] = categorical.codes.astype(np.uint8 if len(categorical.categories) < 256 else np.int16)
+        categories[column] = categorical.categories.to_numpy(dtype=str)
+
+    # Dense player_id -> row array so lookups are a single gather
+    id_rows = np.full(int(columns['player_id'].max()) + 1 if len(players) else 1, -1, dtype=np.int32)
+    id_rows[columns['player_id']] = np.arange(len(players), dtype=np.int32)
+    columns['id_rows'] = id_rows
+
+    with atomic_directory(output_path) as staging:
+        for name, values in columns.items():
+            np.save(os.path.join(staging, f'{name}.npy'), values)
+        for name, values in categories.items():
+            np.save(os.path.join(staging, f'{name}_categories.npy'), values)
+    return PlayerTable(output_path)
+
+
+class PlayerTable:
+    """Read-only, memory-mapped view of a built player table."""
+
+    def __init__(self, path=PLAYER_TABLE_PATH):
+        self.path = path
+
+        def column(name, mmap_mode='r'):
+            return np.load(os.path.join(path, f'{name}.npy'), mmap_mode=mmap_mode)
+
+        self.player_id = column('player_id')
+        self.name = column('name')
+        self.adp_row = column('adp_row')
+        self.adp_name = column('adp_name')
+        self.image_path = column('image_path')
+        self.adp = {source: column(f'adp_{source}') for source in ADP_SOURCES}
+        self.position = pd.Categorical.from_codes(column('position'), categories=column('position_categories', None))
+        self.team = pd.Categorical.from_codes(column('team'), categories=column('team_categories', None))
+        self.id_rows = column('id_rows')
+
+    def __len__(self):
+        return len(self.player_id)
+
+    # Table rows for an array of Sleeper player IDs (strings or ints); -1 for unknown IDs
+    def rows_for(self, player_ids):
+        ids = pd.to_numeric(pd.Series(player_ids, dtype=object), errors='coerce').fillna(-1).to_numpy(dtype=np.int64)
+        valid = (ids >= 0) & (ids < len(self.id_rows))
+        rows = np.full(len(ids), -1, dtype=np.int32)
+        rows[valid] = self.id_rows[ids[valid]]
+        return rows
+
+    # One player's record as a dict, or None
+    def lookup(self, player_id):
+        row = self.rows_for([player_id])[0]
+        if row < 0:
+            return None
+        return {
+            'player_id': int(self.player_id[row]),
+            'name': str(self.name[row]),
+            'position': self.position[row],
+            'team': self.team[row],
+            'adp_name': str(self.adp_name[row]) or None,
+            'image_path': str(self.image_path[row]) or None,
+            **{f'adp_{source}': float(values[row]) for source, values in self.adp.items()},
+        }
+
+
+# Load the table if it has been built, else None
+def load_player_table(path=PLAYER_TABLE_PATH):
+    if not os.path.exists(os.path.join(path, 'id_rows.npy')):
+        return None
+    return PlayerTable(path)
+
+
+if __name__ == '__main__':
+    from adp_store import load_adp_table
+    from headshots import HeadshotManifest
+
+    args = sys.argv[1:]
+    if args and args[0] == '--download':
+        from sleeper import SleeperClient
+
+        dump_path = args[1] if len(args) > 1 else 'players_nfl.json'
+        with SleeperClient(timeout=60) as client, open(dump_path, 'w') as f:
+            json.dump(client.get('players/nfl'), f)
+    else:
+        dump_path = args[0] if args else 'players_nfl.json'
+    table = build_player_table(dump_path, load_adp_table(), HeadshotManifest())
+    print(f"Wrote {len(table)} players ({int((table.adp_row >= 0).sum())} with ADP) to {table.path}/")
@@ -0,0 +1,70 @@
+import base64
+import html
+from functools import lru_cache
+
+import pandas as pd
+
+from timing import timed
+
+CARD_GRID_STYLE = """
+<style>
+.pick-grid { display: grid; grid-template-columns: repeat(auto-fill, minmax(340px, 1fr)); gap: 10px; }
+.pick-card { display: flex; align-items: center; gap: 12px; border: 2px solid #ddd; padding: 12px;
+             border-radius: 10px; background-color: #f9f9f9; }
+.pick-card img { width: 72px; height: 72px; object-fit: cover; border-radius: 8px; }
+.pick-card .info { flex: 1; }
+.pick-card .name { font-size: 1.15em; font-weight: bold; }
+.pick-card .value { font-weight: bold; white-space: nowrap; }
+.pick-card .good { color: #09ab3b; }
+.pick-card .bad { color: #ff2b2b; }
+.pick-card .none { color: #888; font-weight: normal; }
+</style>
+"""
+
+
+# Inline a local image as a data URI; cached so each file is read once per process
+@lru_cache(maxsize=4096)
+def image_data_uri(image_path):
+    try:
+        with open(image_path, 'rb') as f:
+            return 'data:image/png;base64,' + base64.b64encode(f.read()).decode()
+    except OSError:
+        return None
+
+
+def _value_html(row):
+    round_diff = getattr(row, 'round_diff', None)
+    if round_diff is None:
+        return ''
+    if pd.isna(round_diff):
+        return '<div class="value none">ADP not available</div>'
+    # round_diff = adp_round - round: negative means the player went later than ADP (a value)
+    css = 'good' if round_diff < 0 else 'bad' if round_diff > 0 else ''
+    value_over_pick = getattr(row, 'value_over_pick', None)
+    value = '' if value_over_pick is None or pd.isna(value_over_pick) else f'<br><small>value {value_over_pick:+.1f}</small>'
+    return (f'<div class="value {css}">{int(round_diff):+d} rounds'
+            f'<br><small>ADP {row.adp:.1f} (round {int(row.adp_round)})</small>{value}</div>')
+
+
+# One HTML string for a whole page of pick cards, built from a graded frame
+@timed('render')
+def pick_cards_html(picks):
+    cards = []
+    for row in picks.itertuples(index=False):
+        image_path = getattr(row, 'image_path', None)
+        uri = image_data_uri(image_path) if isinstance(image_path, str) else None
+        image = f'<img src="{uri}">' if uri else ''
+        team = f'{html.escape(str(row.team_name))} &middot; ' if hasattr(row, 'team_name') else ''
+        cards.append(
+            f'<div class="pick-card">{image}<div class="info">'
+            f'<div class="name">{html.escape(str(row.full_name))}</div>{html.escape(str(row.position))}<br>'
+            f'<small>{team}Round {row.round}, Pick {row.pick_no}</small></div>{_value_html(row)}</div>'
+        )
+    return CARD_GRID_STYLE + '<div class="pick-grid">' + ''.join(cards) + '</div>'
+
+
+# Slice one page out of a frame; returns the page and the number of pages
+def paginate(frame, page, page_size):
+    pages = max(1, -(-len(frame) // page_size))
+    page = min(max(page, 1), pages)
+    return frame.iloc[(page - 1) * page_size:page * page_size], pages
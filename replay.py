@@ -0,0 +1,415 @@
+"""Record real Sleeper and NFL.com responses and replay them offline.
+
+``FixtureArchive`` is a SQLite file of responses keyed by host and path,
+with zlib-compressed bodies. A ``RecordingAdapter`` mounted on a
+``requests`` session passes requests through and stores what came back. A
+``ReplayAdapter`` answers every request from the archive and never touches
+the network. ``SleeperClient`` and ``HeadshotPrefetcher`` mount one of them
+when ``SLEEPER_RECORD`` or ``SLEEPER_REPLAY`` names an archive (see
+``install_from_env``). ``ReplayServer`` serves an archive over HTTP, with
+optional latency and injected errors, so the apps and load tests can point
+``SLEEPER_API_URL`` at it.
+
+    SLEEPER_RECORD=fixtures.sqlite python pipeline.py --league 1124850630842675200
+    python replay.py serve fixtures.sqlite --port 8766 --latency 0.05 --error-rate 0.02
+    python replay.py load fixtures.sqlite --concurrency 200 --fetches 1000
+"""
+import argparse
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+import zlib
+from collections import namedtuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from storage import SQLiteStore
+
+# Response headers worth keeping; everything else is regenerated on replay
+KEPT_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+# Path the replay server answers with its counters (never recorded, never counted)
+STATS_PATH = '/_replay/stats'
+
+Recorded = namedtuple('Recorded', ['status', 'headers', 'body'])
+
+
+# Host and path-with-query of a URL, the archive's key
+def archive_key(url):
+    parts = urllib.parse.urlsplit(url)
+    return parts.netloc, parts.path + (f"?{parts.query}" if parts.query else '')
+
+
+class FixtureArchive(SQLiteStore):
+    """Recorded responses in one SQLite file, bodies zlib-compressed."""
+
+    def __init__(self, path):
+        super().__init__(path)
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    host TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    status INTEGER NOT NULL,
+                    headers TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    recorded_at REAL NOT NULL,
+                    PRIMARY KEY (host, path)
+                )
+                """
+            )
+
+    def __len__(self):
+        return self._connect().execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+    # Store (or replace) the response for a URL
+    def save(self, url, status, headers, body):
+        host, path = archive_key(url)
+        kept = {name: headers[name] for name in KEPT_HEADERS if name in headers}
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)',
+                (host, path, status, json.dumps(kept), zlib.compress(body, 9), time.time()),
+            )
+
+    # Recorded response for a host and path, or None
+    def lookup(self, host, path):
+        row = self._connect().execute(
+            'SELECT status, headers, body FROM responses WHERE host = ? AND path = ?', (host, path)
+        ).fetchone()
+        return None if row is None else Recorded(row[0], json.loads(row[1]), zlib.decompress(row[2]))
+
+    # Every recorded response as {path: Recorded}, newest wins when hosts share a path
+    def load_all(self):
+        rows = self._connect().execute('SELECT path, status, headers, body FROM responses ORDER BY recorded_at')
+        return {path: Recorded(status, json.loads(headers), zlib.decompress(body)) for path, status, headers, body in rows}
+
+
+class RecordingAdapter(BaseAdapter):
+    """Transport adapter that sends through ``inner`` and archives successful and not-found responses."""
+
+    def __init__(self, archive, inner):
+        super().__init__()
+        self.archive = archive
+        self.inner = inner
+
+    def send(self, request, **kwargs):
+        response = self.inner.send(request, **kwargs)
+        # 304s carry no body and errors are worth retrying live, not replaying
+        if response.status_code in (200, 404):
+            self.archive.save(request.url, response.status_code, response.headers, response.content)
+        return response
+
+    def close(self):
+        self.inner.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """Transport adapter that answers from an archive; unrecorded URLs get a 404."""
+
+    def __init__(self, archive, latency=0.0):
+        super().__init__()
+        self.archive = archive
+        self.latency = latency
+        self.misses = []
+
+    def send(self, request, **kwargs):
+        if self.latency:
+            time.sleep(self.latency)
+        recorded = self.archive.lookup(*archive_key(request.url))
+        if recorded is None:
+            self.misses.append(request.url)
+            recorded = Recorded(404, {'Content-Type': 'application/json'}, b'null')
+        response = requests.Response()
+        response.status_code = recorded.status
+        response.reason = 'OK' if recorded.status == 200 else 'Not Found'
+        response.headers = CaseInsensitiveDict(recorded.headers)
+        response._content = recorded.body
+        response.url = request.url
+        response.request = request
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        return response
+
+    def close(self):
+        pass
+
+
+# Archive every response a session receives, keeping its existing adapters (pooling, retries) underneath
+def record_session(session, archive):
+    for prefix in ('http://', 'https://'):
+        session.mount(prefix, RecordingAdapter(archive, session.get_adapter(prefix + 'x')))
+    return session
+
+
+# Answer every request a session makes from the archive
+def replay_session(session, archive):
+    adapter = ReplayAdapter(archive)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+# Record or replay a session's traffic when SLEEPER_RECORD or SLEEPER_REPLAY names an archive
+def install_from_env(session):
+    if os.environ.get('SLEEPER_REPLAY'):
+        return replay_session(session, FixtureArchive(os.environ['SLEEPER_REPLAY']))
+    if os.environ.get('SLEEPER_RECORD'):
+        return record_session(session, FixtureArchive(os.environ['SLEEPER_RECORD']))
+    return session
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """Threaded HTTP server answering recorded paths, with latency and error injection.
+
+    Each request sleeps ``latency`` seconds plus up to ``jitter`` more, and a
+    fraction ``error_rate`` of requests fail with ``error_status``. Recorded
+    ETags are honoured with 304s, so the on-disk response cache behaves as it
+    does against the real API.
+    """
+
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, archive, port=0, latency=0.0, jitter=0.0, error_rate=0.0, error_status=503, seed=None):
+        super().__init__(('127.0.0.1', port), _ReplayHandler)
+        self.responses = archive.load_all()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.random = random.Random(seed)
+        self.stats = {'requests': 0, 'errors': 0, 'misses': 0, 'not_modified': 0}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_port}"
+
+    # Delay and whether to fail, drawn under the lock so a seed gives a repeatable run
+    def plan_request(self):
+        with self._lock:
+            self.stats['requests'] += 1
+            delay = self.latency + (self.random.random() * self.jitter if self.jitter else 0.0)
+            fail = self.error_rate and self.random.random() < self.error_rate
+            if fail:
+                self.stats['errors'] += 1
+        return delay, fail
+
+    def count(self, stat):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True, name='replay-server')
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    # Keep-alive like the real API; headers and body go out as separate writes, so Nagle must be off
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, headers, body):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == STATS_PATH:
+            with self.server._lock:
+                body = json.dumps(self.server.stats).encode()
+            self._send(200, {'Content-Type': 'application/json'}, body)
+            return
+        delay, fail = self.server.plan_request()
+        if delay:
+            time.sleep(delay)
+        if fail:
+            self._send(self.server.error_status, {'Content-Type': 'application/json'}, b'{"error": "injected"}')
+            return
+        recorded = self.server.responses.get(self.path)
+        if recorded is None:
+            self.server.count('misses')
+            self._send(404, {'Content-Type': 'application/json'}, b'null')
+            return
+        etag = recorded.headers.get('ETag')
+        if etag and self.headers.get('If-None-Match') == etag:
+            self.server.count('not_modified')
+            self._send(304, {'ETag': etag}, b'')
+            return
+        self._send(recorded.status, recorded.headers, recorded.body)
+
+
+# Recorded (league_id, draft_id) pairs, for load tests that replay every recorded draft
+def recorded_drafts(archive):
+    drafts = []
+    for path, recorded in archive.load_all().items():
+        parts = path.strip('/').split('/')
+        if len(parts) == 3 and parts[1] == 'league' and recorded.status == 200:
+            league = json.loads(recorded.body) or {}
+            if league.get('draft_id'):
+                drafts.append((str(league['league_id']), str(league['draft_id'])))
+    return drafts
+
+
+class ReplayProcess:
+    """``replay.py serve`` in a child process, so load generators never share the server's GIL."""
+
+    def __init__(self, archive_path, latency=0.0, jitter=0.0, error_rate=0.0, error_status=503, seed=None):
+        command = [sys.executable, os.path.abspath(__file__), 'serve', archive_path, '--port', '0',
+                   '--latency', str(latency), '--jitter', str(jitter), '--error-rate', str(error_rate),
+                   '--error-status', str(error_status)]
+        if seed is not None:
+            command += ['--seed', str(seed)]
+        self.process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+        match = re.search(r' at (http://\S+)', self.process.stdout.readline())
+        if match is None:
+            self.stop()
+            raise RuntimeError(f"replay server for {archive_path} did not start")
+        self.url = match.group(1)
+
+    # The server's request, error and miss counters
+    def stats(self):
+        return requests.get(f"{self.url}{STATS_PATH}", timeout=5).json()
+
+    def stop(self):
+        self.process.terminate()
+        self.process.wait(timeout=10)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+# One load-generating process: its share of the simulated viewers, one client and one thread each.
+# Returns per-fetch latencies, the failure count and the wall-clock span of the fetches.
+def _load_worker(url, drafts, viewers, fetches, offset, max_workers, retries):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from sleeper import SleeperClient
+
+    clients = [SleeperClient(url, max_workers=max_workers, retries=retries, backoff_factor=0.05) for _ in range(viewers)]
+    latencies, failures = [], []
+
+    def fetch(i):
+        start = time.perf_counter()
+        try:
+            clients[i % viewers].fetch_draft(*drafts[(offset + i) % len(drafts)])
+        except requests.RequestException:
+            failures.append(i)
+            return
+        latencies.append(time.perf_counter() - start)
+
+    started = time.time()
+    with ThreadPoolExecutor(max_workers=viewers, thread_name_prefix='load') as executor:
+        list(executor.map(fetch, range(fetches)))
+    finished = time.time()
+    for client in clients:
+        client.close()
+    return latencies, len(failures), started, finished
+
+
+# Fetch recorded drafts from a replay server (ideally a ReplayProcess) with `concurrency` simulated
+# viewers spread over several load processes (default: one per core, less one for the server);
+# returns throughput and latency stats
+def load_test(url, drafts, concurrency=200, fetches=1000, processes=None, base_path='/v1', max_workers=4, retries=3):
+    from concurrent.futures import ProcessPoolExecutor
+
+    if processes is None:
+        processes = (os.cpu_count() or 2) - 1
+    processes = max(1, min(processes, concurrency))
+    viewers = [concurrency // processes + (i < concurrency % processes) for i in range(processes)]
+    shares = [fetches // processes + (i < fetches % processes) for i in range(processes)]
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        results = list(executor.map(_load_worker, [url + base_path] * processes, [drafts] * processes, viewers, shares,
+                                    [sum(shares[:i]) for i in range(processes)], [max_workers] * processes,
+                                    [retries] * processes))
+
+    # Process start-up is excluded: the clock runs from the first worker's first fetch to the last one's end
+    latencies = sorted(latency for result in results for latency in result[0])
+    elapsed = max(result[3] for result in results) - min(result[2] for result in results)
+    return {
+        'fetches': fetches,
+        'concurrency': concurrency,
+        'processes': processes,
+        'failed': sum(result[1] for result in results),
+        'seconds': round(elapsed, 3),
+        'fetches_per_second': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(latencies[len(latencies) // 2] * 1000, 1) if latencies else None,
+        'p99_ms': round(latencies[int(len(latencies) * 0.99)] * 1000, 1) if latencies else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve or load-test recorded Sleeper responses.")
+    parser.add_argument('command', choices=['serve', 'load', 'list'])
+    parser.add_argument('archive', help="archive recorded with SLEEPER_RECORD")
+    parser.add_argument('--port', type=int, default=0)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument('--jitter', type=float, default=0.0, help="up to this many extra seconds per response")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fraction of requests answered with --error-status")
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--concurrency', type=int, default=200, help="simulated viewers (load)")
+    parser.add_argument('--fetches', type=int, default=1000, help="draft fetches in total (load)")
+    parser.add_argument('--processes', type=int, help="load-generating processes (load; default one per spare core)")
+    args = parser.parse_args(argv)
+
+    archive = FixtureArchive(args.archive)
+    if args.command == 'list':
+        for (league_id, draft_id) in recorded_drafts(archive):
+            print(f"league {league_id} draft {draft_id}")
+        print(f"{len(archive)} responses recorded")
+        return 0
+
+    if args.command == 'serve':
+        server = ReplayServer(archive, args.port, args.latency, args.jitter, args.error_rate, args.error_status, args.seed)
+        print(f"Replaying {len(server.responses)} responses at {server.url} (SLEEPER_API_URL={server.url}/v1)", flush=True)
+        server.serve_forever()
+        return 0
+
+    drafts = recorded_drafts(archive)
+    if not drafts:
+        print("No recorded leagues with drafts in the archive", file=sys.stderr)
+        return 1
+    # Server, and load generators, each in their own processes
+    with ReplayProcess(args.archive, args.latency, args.jitter, args.error_rate, args.error_status, args.seed) as server:
+        stats = load_test(server.url, drafts, args.concurrency, args.fetches, args.processes)
+        stats.update(server.stats())
+    print(json.dumps(stats, indent=1))
+    return 1 if stats['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""Positional scarcity: tiers, replacement level and what's left at each position.
+
+``PositionIndex`` is built once per ADP table and source. It keeps each
+position's players sorted by ADP, splits them into tiers wherever the gap to
+the next player's ADP is large, and turns per-row lookups into arrays so a
+pick maps to its slot with two gathers. ``PositionScarcity`` tracks one
+draft on top of it. It holds a Fenwick tree of drafted players per position.
+Recording a pick is O(log n), and questions like "how many tier-1 RBs are
+left that ADP says will still be there at pick 40" are binary searches plus
+prefix sums, never DataFrame filters. That lets the live board refresh its
+scarcity table on every pick.
+
+    python scarcity.py [source] [num_teams]
+"""
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Starters per team used for replacement level (flex spots are left out)
+STARTERS = {'QB': 1, 'RB': 2, 'WR': 2, 'TE': 1, 'K': 1, 'DEF': 1}
+
+
+class PositionIndex:
+    """Per-position ADP order, gap-based tiers and replacement ranks for one ADP source."""
+
+    def __init__(self, adp_index, source, min_gap=3.0, relative_gap=0.12):
+        self.source = source
+        adp = adp_index.values[:, adp_index.columns[source]]
+        positions = adp_index.data['Pos'].fillna('Unknown').to_numpy()
+        self.positions = sorted(set(positions))
+        codes = {position: i for i, position in enumerate(self.positions)}
+
+        # For every ADP table row: its position code and its rank within the position (-1 without ADP)
+        self.position_of = np.array([codes[position] for position in positions], dtype=np.int64)
+        self.rank_of = np.full(len(adp), -1, dtype=np.int64)
+        self.adp = {}
+        self.rows = {}
+        self.tier_starts = {}
+        for position, code in codes.items():
+            rows = np.flatnonzero((self.position_of == code) & ~np.isnan(adp))
+            rows = rows[np.argsort(adp[rows], kind='stable')]
+            self.rows[position] = rows
+            self.adp[position] = adp[rows].astype(float)
+            self.rank_of[rows] = np.arange(len(rows))
+            # A new tier starts after a gap that is big both in picks and relative to the ADP
+            gaps = np.diff(self.adp[position])
+            breaks = np.flatnonzero(gaps > np.maximum(min_gap, relative_gap * self.adp[position][:-1])) + 1
+            self.tier_starts[position] = np.concatenate([[0], breaks]).astype(np.int64)
+
+    # Tier number (1-based) of every player at a position, in ADP order
+    def tiers(self, position):
+        return np.searchsorted(self.tier_starts[position], np.arange(len(self.rows[position])), side='right')
+
+    # Rank range [start, stop) of a tier
+    def tier_bounds(self, position, tier):
+        starts = self.tier_starts[position]
+        stop = starts[tier] if tier < len(starts) else len(self.rows[position])
+        return int(starts[tier - 1]), int(stop)
+
+    # Players a league starts at a position; the one ranked just past them is replacement level
+    def replacement_rank(self, position, num_teams):
+        return min(STARTERS.get(position, 0) * num_teams, len(self.rows[position]))
+
+    # Players at a position in ADP order with their tier, as a frame (for display)
+    def table(self, adp_index, position):
+        rows = self.rows[position]
+        return pd.DataFrame({'Name': adp_index.data['Name'].to_numpy()[rows], 'adp': self.adp[position],
+                             'tier': self.tiers(position)})
+
+
+class _Fenwick:
+    """Binary indexed tree of counts: point add and prefix sum in O(log n)."""
+
+    def __init__(self, size):
+        self.tree = [0] * (size + 1)
+
+    def add(self, i, delta=1):
+        i += 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    # Sum of counts at ranks [0, i)
+    def prefix(self, i):
+        total = 0
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+
+class PositionScarcity:
+    """What's left at each position in one draft, updated pick by pick."""
+
+    def __init__(self, position_index, adp_index, num_teams):
+        self.index = position_index
+        self.adp_index = adp_index
+        self.num_teams = num_teams
+        self.drafted_rows = set()
+        self.last_pick_no = 0
+        self._drafted = {position: _Fenwick(len(rows)) for position, rows in position_index.rows.items()}
+
+    # Record graded picks (from grading.grade_picks); picks already recorded are skipped
+    def add_picks(self, graded):
+        if not len(graded):
+            return 0
+        player_ids = graded['player_id'] if 'player_id' in graded and self.adp_index.has_player_ids else None
+        rows = self.adp_index.positions(graded['full_name'], player_ids, graded.get('position'))
+        added = 0
+        for row in rows[rows >= 0]:
+            rank = self.index.rank_of[row]
+            if row in self.drafted_rows or rank < 0:
+                continue
+            self.drafted_rows.add(row)
+            self._drafted[self.index.positions[self.index.position_of[row]]].add(rank)
+            added += 1
+        self.last_pick_no = max(self.last_pick_no, int(graded['pick_no'].max()))
+        return added
+
+    # Undrafted players at a position ranked in [start, stop)
+    def _undrafted(self, position, start, stop):
+        drafted = self._drafted[position]
+        return max(stop - start, 0) - (drafted.prefix(stop) - drafted.prefix(start)) if stop > start else 0
+
+    # Undrafted players at a position (optionally one tier), only those ADP has lasting to pick_no if given
+    def remaining(self, position, tier=None, pick_no=None):
+        start, stop = (0, len(self.index.rows[position])) if tier is None else self.index.tier_bounds(position, tier)
+        if pick_no is not None:
+            start = max(start, int(np.searchsorted(self.index.adp[position], pick_no, side='left')))
+        return self._undrafted(position, start, stop)
+
+    # Best tier with an undrafted player at a position, or None when the position is empty
+    def top_tier(self, position):
+        starts = self.index.tier_starts[position]
+        for tier in range(1, len(starts) + 1):
+            if self.remaining(position, tier):
+                return tier
+        return None
+
+    # Undrafted starter-quality players at a position (ranked above replacement level)
+    def above_replacement(self, position, pick_no=None):
+        stop = self.index.replacement_rank(position, self.num_teams)
+        start = 0 if pick_no is None else int(np.searchsorted(self.index.adp[position][:stop], pick_no, side='left'))
+        return self._undrafted(position, start, stop)
+
+    # One row per position: best tier left, how many are in it, starters left and those expected at pick_no
+    def summary(self, pick_no=None, positions=None):
+        pick_no = self.last_pick_no + 1 if pick_no is None else pick_no
+        records = []
+        for position in positions or [p for p in STARTERS if p in self.index.rows]:
+            tier = self.top_tier(position)
+            records.append({
+                'position': position,
+                'tier': tier,
+                'left_in_tier': self.remaining(position, tier) if tier else 0,
+                'above_replacement': self.above_replacement(position),
+                f'at_pick_{pick_no}': self.above_replacement(position, pick_no),
+                'left': self.remaining(position),
+            })
+        return pd.DataFrame(records).set_index('position')
+
+
+if __name__ == '__main__':
+    from adp import build_adp_index, read_adp_data
+
+    source = sys.argv[1] if len(sys.argv) > 1 else 'Sleeper'
+    num_teams = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+    adp_index = build_adp_index(read_adp_data('data.csv'))
+    position_index = PositionIndex(adp_index, source)
+    for position in STARTERS:
+        if position in position_index.rows:
+            table = position_index.table(adp_index, position)
+            print(f"{position}: {len(table)} players in {table['tier'].max()} tiers, "
+                  f"replacement level at #{position_index.replacement_rank(position, num_teams) + 1}")
+            print(table.groupby('tier')['Name'].agg(lambda names: ', '.join(names[:4])).head(5).to_string())
+    print(PositionScarcity(position_index, adp_index, num_teams).summary(1))
@@ -0,0 +1,151 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from http_cache import is_fresh
+from replay import install_from_env
+from timing import timed
+
+# Base URL for the Sleeper API; override to point the apps at a local stub server
+SLEEPER_API_URL = os.environ.get('SLEEPER_API_URL', 'https://api.sleeper.app/v1')
+
+
+class SleeperClient:
+    """Pooled Sleeper API client with bounded parallel fetches.
+
+    One keep-alive ``requests.Session`` is shared by every call, and
+    independent requests (rosters, picks, user lookups) run on a thread pool
+    capped at ``max_workers``. Transient failures are retried with backoff.
+
+    With a ``cache`` (see ``http_cache.ResponseCache``) responses are kept on
+    disk: picks of completed drafts forever, live drafts for ``live_ttl``
+    seconds, rosters for ``roster_ttl`` and users for ``user_ttl``. Stale
+    entries are revalidated with a conditional request.
+    """
+
+    def __init__(self, base_url=None, max_workers=8, timeout=10, retries=3, backoff_factor=0.5,
+                 cache=None, live_ttl=15, roster_ttl=300, user_ttl=86400):
+        self.base_url = (base_url or SLEEPER_API_URL).rstrip('/')
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.cache = cache
+        self.live_ttl = live_ttl
+        self.roster_ttl = roster_ttl
+        self.user_ttl = user_ttl
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET']),
+        )
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        # Record to or replay from a fixture archive when SLEEPER_RECORD / SLEEPER_REPLAY is set
+        install_from_env(self.session)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='sleeper')
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # GET a Sleeper endpoint and decode the JSON body; ttl=None caches it forever.
+    # revalidate=True ignores a fresh cache entry and asks the server (conditionally).
+    def get(self, path, ttl=0, revalidate=False):
+        path = path.strip('/')
+        url = f"{self.base_url}/{path}"
+        if self.cache is None:
+            response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+            return response.json()
+
+        # Cache entries are keyed by full URL, so a stub or replay server never shares the real API's
+        entry = self.cache.get(url)
+        if entry is not None and not revalidate and is_fresh(entry):
+            return entry.data
+
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304 and entry is not None:
+            self.cache.touch(url, ttl)
+            return entry.data
+        response.raise_for_status()
+        self.cache.set(url, response.text, response.headers.get('ETag'), response.headers.get('Last-Modified'), ttl)
+        return response.json()
+
+    # Run fn over items on the shared pool, preserving order
+    def map(self, fn, items):
+        return list(self.executor.map(fn, items))
+
+    # Fetch draft settings and status; a completed draft is cached forever
+    def fetch_draft_info(self, draft_id):
+        path = f"draft/{draft_id}"
+        draft = self.get(path, ttl=self.live_ttl)
+        if self.cache is not None and (draft or {}).get('status') == 'complete':
+            self.cache.pin(f"{self.base_url}/{path}")
+        return draft
+
+    # Fetch draft picks for a given draft ID
+    def fetch_draft_picks(self, draft_id):
+        if self.cache is None:
+            return self.get(f"draft/{draft_id}/picks")
+        complete = (self.fetch_draft_info(draft_id) or {}).get('status') == 'complete'
+        return self.get(f"draft/{draft_id}/picks", ttl=None if complete else self.live_ttl)
+
+    # Fetch league rosters to get team names
+    def fetch_league_rosters(self, league_id):
+        return self.get(f"league/{league_id}/rosters", ttl=self.roster_ttl)
+
+    # Fetch user details by owner ID
+    def fetch_user_details(self, user_id):
+        return self.get(f"user/{user_id}", ttl=self.user_ttl)
+
+    # Fetch every user in a league in one request
+    def fetch_league_users(self, league_id):
+        return self.get(f"league/{league_id}/users", ttl=self.user_ttl)
+
+    # Map team_id to team name from the league users, fetching only owners missing from them
+    @timed('fetch.team_names')
+    def map_team_id_to_name(self, rosters, users=()):
+        names = {user['user_id']: user.get('display_name') for user in users or ()}
+
+        # Orphaned rosters have no owner; fall back to a co-owner when there is one
+        owners = {}
+        for roster in rosters:
+            candidates = [roster.get('owner_id')] + list(roster.get('co_owners') or [])
+            owners[roster['roster_id']] = next((user_id for user_id in candidates if user_id), None)
+
+        missing = sorted({user_id for user_id in owners.values() if user_id and user_id not in names})
+        for user_id, user_details in zip(missing, self.map(self.fetch_user_details, missing)):
+            names[user_id] = (user_details or {}).get('display_name')
+
+        team_id_to_name = {}
+        for team_id, owner_id in owners.items():
+            team_id_to_name[team_id] = names.get(owner_id) or f"Team {team_id}"
+        return team_id_to_name
+
+    # Fetch rosters, team names and picks for a draft with the requests overlapped
+    @timed('fetch')
+    def fetch_draft(self, league_id, draft_id):
+        rosters_future = self.executor.submit(self.fetch_league_rosters, league_id)
+        users_future = self.executor.submit(self.fetch_league_users, league_id)
+        picks_future = self.executor.submit(self.fetch_draft_picks, draft_id)
+        rosters = rosters_future.result()
+        team_id_to_name = self.map_team_id_to_name(rosters, users_future.result())
+        return rosters, team_id_to_name, picks_future.result()
@@ -0,0 +1,54 @@
+"""Storage helpers shared by the on-disk stores.
+
+``SQLiteStore`` is the base of the SQLite-backed stores: it opens one WAL-mode
+connection per thread, since sqlite3 connections can't be shared across
+threads, and WAL lets any number of app workers read while one writes.
+``atomic_directory`` writes a directory of files (the ADP store, the player
+table) beside its destination and swaps it in with a rename, so readers see
+the old directory or the new one and never a half-written mix.
+"""
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+from contextlib import contextmanager
+
+
+class SQLiteStore:
+    """A SQLite file with one WAL-mode connection per thread, opened on first use."""
+
+    def __init__(self, path, timeout=30):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+
+# Yield a staging directory to fill, then replace path with it atomically; on error the staging is removed
+@contextmanager
+def atomic_directory(path):
+    path = os.path.abspath(path)
+    parent, name = os.path.split(path)
+    staging = tempfile.mkdtemp(prefix=f'.{name}-', dir=parent)
+    try:
+        yield staging
+        if os.path.exists(path):
+            # A directory can't be replaced in one rename, so the old one is moved aside first
+            old = tempfile.mkdtemp(prefix=f'.{name}-old-', dir=parent)
+            os.replace(path, os.path.join(old, name))
+            os.replace(staging, path)
+            shutil.rmtree(old, ignore_errors=True)
+        else:
+            os.replace(staging, path)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
@@ -1,131 +1,210 @@
-import os
-import requests
 import streamlit as st
-import pandas as pd
-import numpy as np
 
-st.set_page_config(layout="wide")
+from grading import select_adp_source
+from draft_cache import GradedDraftCache
+from draft_sim import DraftSimulator
+from draft_store import DraftStore
+from headshots import HeadshotManifest
+from http_cache import ResponseCache
+from keeper_optimizer import keeper_candidates, optimize_keepers, team_keeper_values
+from live_draft import LiveDraft
+from pipeline import AdpResolver, GradedDraft, grade_draft
+from render import paginate, pick_cards_html
+from scarcity import PositionIndex, PositionScarcity
+from sleeper import SleeperClient
+from timing import start_recording, stop_recording
+from value_index import PlayerValueIndex
 
-# Path to the CSV file for storing drafts
-drafts_csv = "saved_drafts.csv"
-
-# Function to load saved drafts
-def load_saved_drafts():
-    if os.path.exists(drafts_csv):
-        return pd.read_csv(drafts_csv)
-    else:
-        return pd.DataFrame(columns(["name", "league_id", "draft_id"]))
-
-# Function to save a new draft
-def save_new_draft(name, league_id, draft_id):
-    new_draft = pd.DataFrame({
-        "name": [name],
-        "league_id": [league_id],
-        "draft_id": [draft_id]
-    })
-    if os.path.exists(drafts_csv):
-        existing_drafts = pd.read_csv(drafts_csv)
-        updated_drafts = pd.concat([existing_drafts, new_draft], ignore_index=True)
-    else:
-        updated_drafts = new_draft
-    updated_drafts.to_csv(drafts_csv, index=False)
-
-# Function to fetch draft picks for a given draft ID
-def fetch_draft_picks(draft_id):
-    draft_picks_url = f"https://api.sleeper.app/v1/draft/{draft_id}/picks"
-    picks_response = requests.get(draft_picks_url)
-    return picks_response.json()
-
-# Function to fetch league rosters to get team names
-def fetch_league_rosters(league_id):
-    rosters_url = f"https://api.sleeper.app/v1/league/{league_id}/rosters"
-    rosters_response = requests.get(rosters_url)
-    return rosters_response.json()
-
-# Function to fetch user details by owner ID
-def fetch_user_details(user_id):
-    user_url = f"https://api.sleeper.app/v1/user/{user_id}"
-    user_response = requests.get(user_url)
-    return user_response.json()
-
-# Function to map team_id to team name
-def map_team_id_to_name(rosters):
-    team_id_to_name = {}
-    for roster in rosters:
-        team_id = roster['roster_id']
-        owner_id = roster['owner_id']
-        user_details = fetch_user_details(owner_id)
-        team_name = user_details.get('display_name', f"Team {team_id}")  # Default to "Team {id}" if no name
-        team_id_to_name[team_id] = team_name
-    return team_id_to_name
-
-# Function to check if player image exists
-def check_player_image_exists(player_name):
-    filename = f"{player_name.replace(' ', '_')}.png"
-    image_path = os.path.join('player_images', filename)
-    if os.path.exists(image_path):
-        return image_path
-    return None
-
-# Load the ADP data
-@st.cache_data
-def load_adp_data():
-    try:
-        data = pd.read_csv('data.csv')
-        data.rename(columns={'Sleeper.1': 'ESPN'}, inplace=True)
-        data[['Underdog', 'Sleeper', 'ESPN']] = data[['Underdog', 'Sleeper', 'ESPN']].apply(pd.to_numeric, errors='coerce')
-        return data
-    except Exception as e:
-        st.write("Error loading data:", e)
-        return None
-
-# Convert ADP to draft round
-def adp_to_round(adp, players_per_round):
-    if pd.isna(adp):
-        return None
-    return int(np.ceil(adp / players_per_round))
-
-# Evaluate keeper value based on ADP and keeper round
-def evaluate_keeper_value(player_name, keeper_round, adp_data, column_name, players_per_round):
-    player_data = adp_data[adp_data['Name'].str.lower() == player_name.lower()]
-    
-    if player_data.empty:
-        return f"Player '{player_name}' not found in the ADP list."
-
-    player_data = player_data.dropna(subset=[column_name])
+st.set_page_config(layout="wide")
 
-    if player_data.empty:
-        return f"ADP data for {player_name} is not available."
+# Saved drafts live in SQLite (saved_drafts.csv is migrated in on first open)
+@st.cache_resource
+def get_draft_store():
+    return DraftStore()
 
-    selected_adp = player_data.iloc[0][column_name]
-    adp_round = adp_to_round(selected_adp, players_per_round)
+# Shared Sleeper API client (pooled session, parallel fetches, on-disk response cache)
+@st.cache_resource
+def get_sleeper_client():
+    return SleeperClient(cache=ResponseCache())
 
-    if adp_round is None:
-        return f"ADP data for {player_name} is not available."
+# Graded drafts shared by every session; session state only holds a reference and its key
+@st.cache_resource
+def get_draft_cache():
+    return GradedDraftCache()
 
-    difference_rounds = adp_round - keeper_round
+# Viewers who fetch the same draft within this many seconds share one fetch
+FETCH_MAX_AGE = 60
 
-    # Determine delta color based on the difference in rounds
-    if difference_rounds < 0:
-        delta_color = "inverse"  # Green for good value
-    else:
-        delta_color = "inverse"  # Red for bad value
+# Cross-league index of where players went against ADP, fed by every graded draft
+@st.cache_resource
+def get_value_index():
+    return PlayerValueIndex()
 
-    insight = f"Keeping {player_name} in round {keeper_round} is calculated with an ADP from {column_name}: {selected_adp:.1f}, which translates to round {adp_round}."
+# Headshot manifest, loaded once per process and refreshed if the prefetcher rewrote it
+@st.cache_resource
+def load_headshots():
+    return HeadshotManifest()
 
-    # Display the metric
-    st.metric(label=f"{player_name} (ADP: {selected_adp:.1f})", value=f"{difference_rounds} rounds", delta=f"{difference_rounds} rounds", delta_color=delta_color)
+# Load the ADP data, its name index and the ADP history once per process
+@st.cache_resource
+def get_adp_resolver():
+    return AdpResolver('data.csv')
 
-    return insight
+def load_adp_data():
+    try:
+        adp = get_adp_resolver()
+        return adp.data, adp.index
+    except Exception as e:
+        st.write("Error loading data:", e)
+        return None, None
+
+# Draft simulator for one league shape, built once per process
+@st.cache_resource
+def get_draft_simulator(_adp_index, num_teams, rounds):
+    return DraftSimulator(_adp_index, num_teams, rounds)
+
+# Per-position ADP order and tiers for one ADP source, built once per process
+@st.cache_resource
+def get_position_index(_adp_index, source):
+    return PositionIndex(_adp_index, source)
+
+# Fetch, grade and store a draft; runs once per fetch however many sessions asked for it
+def fetch_graded_draft(league_id, draft_id):
+    draft = grade_draft(get_sleeper_client(), league_id, draft_id, get_adp_resolver())
+    if draft is None:
+        return None
+    draft_store.save_picks(draft_id, draft.picks)
+    draft_store.save_grades(draft_id, draft.adp_version, draft.frame, draft.players_per_round)
+    get_value_index().add_draft(draft.frame, draft_id, league_id, draft.season, draft.adp_version)
+    # Older copies and their per-source views are stale now
+    get_draft_cache().invalidate(draft_id)
+    add_image_paths(draft.frame)
+    return draft
+
+# Last saved grades for a draft, as a GradedDraft without the raw picks
+def load_saved_draft(draft_id, adp_version):
+    grades = draft_store.load_grades(draft_id, adp_version)
+    if grades is None:
+        return None
+    # Teams without a pick in the frame would be missed by counting roster IDs, so the league size
+    # is saved with the grades (older saves fall back to the count)
+    num_teams = draft_store.grades_num_teams(draft_id, adp_version) or int(grades['roster_id'].nunique())
+    return GradedDraft(add_image_paths(grades), None, num_teams, None, adp_version, None, None)
+
+# Point this session at a cached draft
+def use_draft(key, draft):
+    st.session_state.draft_cache_key = key
+    st.session_state.draft = draft
+    st.session_state.draft_data = draft.frame
+    st.session_state.players_per_round = draft.players_per_round
+    st.session_state.team_id_to_name = draft.team_id_to_name
+
+# One ADP source's view of the session's draft, shared by sessions viewing the same cached draft
+def source_view(adp_source):
+    key = st.session_state.get('draft_cache_key')
+    if key is None:
+        # Live boards are per session
+        return select_adp_source(st.session_state.draft_data, adp_source)
+    current = get_draft_cache().get(key)
+    if current is None:
+        # Evicted; this session still holds its own reference
+        return select_adp_source(st.session_state.draft_data, adp_source)
+    if current is not st.session_state.draft:
+        # Another session refetched the draft; pick up the new copy
+        use_draft(key, current)
+    return get_draft_cache().get_or_compute(key + (adp_source,), lambda: select_adp_source(current.frame, adp_source))
+
+# Positional scarcity for the current board and ADP source. A saved or fetched board of its own starts
+# over, and a refetched copy adds what it's missing.
+def draft_scarcity(adp_index, source):
+    key = (st.session_state.draft_key, st.session_state.draft_cache_key, source)
+    draft_data = st.session_state.draft_data
+    scarcity = st.session_state.get('scarcity')
+    if scarcity is None or st.session_state.get('scarcity_key') != key:
+        scarcity = PositionScarcity(get_position_index(adp_index, source), adp_index, int(st.session_state.players_per_round))
+        st.session_state.scarcity, st.session_state.scarcity_key = scarcity, key
+        scarcity.add_picks(draft_data)
+    elif draft_data is not st.session_state.get('scarcity_frame'):
+        scarcity.add_picks(draft_data[draft_data['pick_no'] > scarcity.last_pick_no])
+    st.session_state.scarcity_frame = draft_data
+    return scarcity
+
+# Positional scarcity for a live draft: built from its board once per draft and ADP source, then fed
+# only the picks each poll grades
+def live_scarcity(live, adp_index, source, new_picks=None):
+    scarcity = st.session_state.get('live_scarcity')
+    if scarcity is None or st.session_state.get('live_scarcity_key') != (live, source):
+        scarcity = PositionScarcity(get_position_index(adp_index, source), adp_index, live.players_per_round)
+        st.session_state.live_scarcity, st.session_state.live_scarcity_key = scarcity, (live, source)
+        if live.last_pick_no:
+            scarcity.add_picks(live.frame)
+    elif new_picks is not None:
+        scarcity.add_picks(new_picks)
+    return scarcity
+
+# Point the full board at a live draft's picks so far; this builds the whole frame, so page runs only
+def use_live_board(live):
+    st.session_state.draft_cache_key = None
+    st.session_state.draft = None
+    st.session_state.draft_data = live.frame
+    st.session_state.live_board_pick_no = live.last_pick_no
+
+# Attach local image paths to a frame of graded picks
+def add_image_paths(graded):
+    headshots = load_headshots()
+    headshots.refresh()
+    graded['image_path'] = headshots.paths_for(graded['full_name'])
+    return graded
+
+# Live draft board: reruns on its own every few seconds, grades only the new picks and redraws only what
+# they change (scarcity, the latest round, the boards of the teams that picked). The full board, keeper
+# optimizer and sidebar are outside it and catch up on the next page run, which the user can ask for.
+@st.fragment(run_every=2)
+def live_draft_board(league_id, draft_id, adp_index, selected_adp_column):
+    live = st.session_state.get('live_draft')
+    if live is None or live.draft_id != draft_id:
+        client = get_sleeper_client()
+        rosters = client.fetch_league_rosters(league_id)
+        team_id_to_name = client.map_team_id_to_name(rosters, client.fetch_league_users(league_id))
+        live = LiveDraft(client, draft_id, adp_index, len(rosters), team_id_to_name, enrich=add_image_paths)
+        st.session_state.live_draft = live
+        st.session_state.team_id_to_name = team_id_to_name
+        st.session_state.players_per_round = len(rosters)
+
+    new_picks = live.poll()
+    scarcity = live_scarcity(live, adp_index, selected_adp_column, new_picks)
+    if new_picks is not None and len(new_picks):
+        st.toast(f"{len(new_picks)} new picks: {', '.join(sorted(live.affected_teams(new_picks)))}")
+    # Set by the page before calling this, so absent on the fragment's own reruns
+    if st.session_state.pop('live_page_run', False) and live.last_pick_no:
+        use_live_board(live)
+
+    st.caption(f"Draft status: {live.status} - {live.last_pick_no} picks made, polling every {live.interval:.0f}s")
+    behind = live.last_pick_no - st.session_state.get('live_board_pick_no', 0)
+    if behind > 0 and st.button(f"Add {behind} new picks to the full board", key="live_refresh"):
+        st.rerun()
+    st.dataframe(scarcity.summary(), hide_index=True)
+    latest = live.recent(live.players_per_round)
+    if latest is not None:
+        latest = select_adp_source(latest, selected_adp_column)
+        st.dataframe(latest[['pick_no', 'round', 'team_name', 'full_name', 'position', 'adp', 'round_diff']].iloc[::-1], hide_index=True)
+    if live.last_update is not None:
+        for team in sorted(live.affected_teams(live.last_update)):
+            st.write(f"{team}:")
+            st.markdown(pick_cards_html(select_adp_source(live.team_picks(team), selected_adp_column)), unsafe_allow_html=True)
 
 # Streamlit app UI
 st.title("Sleeper Draft Results with ADP Analysis")
 
+# Opt-in per-stage timings for this run, shown in the sidebar (and logged)
+show_timings = st.sidebar.toggle("Show stage timings")
+timings = start_recording() if show_timings else None
+
 # Load saved drafts
-saved_drafts = load_saved_drafts()
+draft_store = get_draft_store()
 
 # Dropdown to select saved draft or option to add a new draft
-draft_options = ["Add a new draft"] + saved_drafts["name"].tolist()
+draft_options = ["Add a new draft"] + draft_store.names()
 selected_draft = st.selectbox("Select a saved draft or add a new one:", draft_options)
 
 # If the user selects to add a new draft
@@ -136,121 +215,136 @@ if selected_draft == "Add a new draft":
 
     if st.button("Save Draft"):
         if draft_name and league_id and draft_id:
-            save_new_draft(draft_name, league_id, draft_id)
-            st.success(f"Draft '{draft_name}' saved successfully!")
-            st.experimental_rerun()  # Reload the app to update the saved drafts list
+            try:
+                draft_store.add(draft_name, league_id, draft_id)
+            except ValueError as e:
+                st.error(str(e))
+            else:
+                st.success(f"Draft '{draft_name}' saved successfully!")
+                st.rerun()  # Reload the app to update the saved drafts list
         else:
             st.error("Please fill out all fields.")
 else:
     # Load the selected draft details
-    selected_row = saved_drafts[saved_drafts["name"] == selected_draft]
-    league_id = selected_row["league_id"].values[0]
-    draft_id = selected_row["draft_id"].values[0]
+    saved_draft = draft_store.get(selected_draft)
+    league_id = saved_draft["league_id"]
+    draft_id = saved_draft["draft_id"]
 
     # Load the ADP data
-    adp_data = load_adp_data()
+    adp_data, adp_index = load_adp_data()
 
     # Dropdown to select the ADP source column
     adp_columns = ["Sleeper", "Underdog", "ESPN"]  # Default columns; this list can be expanded
     selected_adp_column = st.selectbox("Select the ADP source:", adp_columns, index=0)
 
-    # Session state to hold draft data to prevent reloading
-    if 'draft_data' not in st.session_state:
+    # Session state to hold draft data to prevent reloading; reset when another draft is selected
+    if st.session_state.get('draft_key') != draft_id:
+        st.session_state.draft_key = draft_id
+        st.session_state.draft_cache_key = None
+        st.session_state.draft = None
         st.session_state.draft_data = None
         st.session_state.team_id_to_name = None
         st.session_state.players_per_round = None
+        st.session_state.live_board_pick_no = 0
+
+        # Reuse another session's fetch if there is one, otherwise show the last saved grades
+        # straight away if the ADP they used hasn't changed
+        fetched_key = (draft_id, get_adp_resolver().version, 'fetched')
+        saved_version = draft_store.latest_grades_version(draft_id)
+        # One lookup: another session may evict or invalidate the entry between two
+        fetched = get_draft_cache().get(fetched_key)
+        if fetched is not None:
+            use_draft(fetched_key, fetched)
+        elif saved_version and (saved_version.startswith('history:') or saved_version == get_adp_resolver().version):
+            saved_key = (draft_id, saved_version, 'saved')
+            saved_draft = get_draft_cache().get_or_compute(saved_key, lambda: load_saved_draft(draft_id, saved_version))
+            if saved_draft is not None:
+                use_draft(saved_key, saved_draft)
 
     if st.button("Fetch Draft Results"):
-        # Fetch rosters to map team IDs to names
-        rosters = fetch_league_rosters(league_id)
-        team_id_to_name = map_team_id_to_name(rosters)
-        
-        # Fetch draft picks
-        draft_picks = fetch_draft_picks(draft_id)
-        
-        if draft_picks:
-            # Calculate the number of players per round based on roster size
-            num_teams = len(rosters)
-            rounds = max(int(pick['round']) for pick in draft_picks)
-            players_per_round = num_teams
-            
-            # Save in session state
-            st.session_state.players_per_round = players_per_round
-            
-            # Extract and clean up relevant information
-            clean_data = []
-            for pick in draft_picks:
-                player_name = f"{pick['metadata'].get('first_name', '')} {pick['metadata'].get('last_name', '')}"
-                image_path = check_player_image_exists(player_name)
-                
-                # Find the ADP for the player
-                adp_row = adp_data[adp_data["Name"].str.lower() == player_name.lower()]
-                
-                if not adp_row.empty:
-                    adp_value = adp_row[selected_adp_column].values[0]
-                    adp_round = adp_to_round(adp_value, players_per_round)
-                    round_diff = adp_round - pick['round'] if adp_round is not None else None
-                else:
-                    adp_value = None
-                    round_diff = None
-                
-                clean_data.append({
-                    'team_name': team_id_to_name.get(pick['roster_id'], "Unknown Team"),
-                    'full_name': player_name,
-                    'position': pick['metadata'].get('position', 'Unknown'),
-                    'round': pick['round'],
-                    'pick_no': pick['pick_no'],
-                    'is_keeper_info': pick.get('is_keeper', 'No'),
-                    'image_path': image_path,
-                    'round_diff': round_diff  # Add round differential to the data
-                })
-            
-            # Convert to DataFrame for easier display
-            clean_df = pd.DataFrame(clean_data)
-
-            # Store data in session state
-            st.session_state.draft_data = clean_df
-            st.session_state.team_id_to_name = team_id_to_name
+        # Fetch rosters, team names and picks, and grade every pick against every ADP source
+        # (using the ADP from the day of the draft when the history has it)
+        # Concurrent and recent fetches of the same draft from other sessions are shared
+        fetched_key = (draft_id, get_adp_resolver().version, 'fetched')
+        draft = get_draft_cache().get_or_compute(fetched_key, lambda: fetch_graded_draft(league_id, draft_id),
+                                                 max_age=FETCH_MAX_AGE)
+
+        if draft is not None:
+            if draft.adp_date:
+                st.caption(f"Graded with ADP as of {draft.adp_date}.")
+            use_draft(fetched_key, draft)
+
+    # Live draft mode: poll for new picks instead of fetching the whole draft
+    live_mode = st.toggle("Live draft mode", key="live_mode")
+    if live_mode:
+        st.session_state.live_page_run = True
+        live_draft_board(league_id, draft_id, adp_index, selected_adp_column)
 
     # Check if draft data is available in session state
     if st.session_state.draft_data is not None:
-        clean_df = st.session_state.draft_data
+        # Switching the ADP source just selects its precomputed columns
+        clean_df = source_view(selected_adp_column)
         players_per_round = st.session_state.players_per_round
+
+        # What's left at each position after the picks so far
+        st.sidebar.subheader("Positional scarcity")
+        live = st.session_state.get('live_draft')
+        if live_mode and live is not None and live.draft_id == draft_id:
+            scarcity = live_scarcity(live, adp_index, selected_adp_column)
+        else:
+            scarcity = draft_scarcity(adp_index, selected_adp_column)
+        st.sidebar.dataframe(scarcity.summary())
         
         # Hide full draft data under a dropdown
         with st.expander("Show Full Draft Data"):
             st.write("Full Draft Data:")
             st.dataframe(clean_df)
         
-        # Dropdown to select a team
-        selected_team = st.selectbox("Select a Team Name:", clean_df['team_name'].unique(), key="team_select")
+        # Best keeper set for every team under the league's keeper rules
+        with st.expander("Keeper Optimizer"):
+            col1, col2, col3 = st.columns(3)
+            max_keepers = col1.number_input("Max keepers per team", min_value=1, max_value=10, value=3, step=1)
+            round_inflation = col2.number_input("Round inflation", min_value=0, max_value=5, value=0, step=1)
+            allow_bump = col3.checkbox("Bump conflicting keepers a round earlier")
+            rosters_only = st.checkbox("Only players still on the roster", value=True)
+            # Solved (and the rosters fetched) only on request, not on every rerun of the page
+            if st.button("Optimize Keepers"):
+                rosters = get_sleeper_client().fetch_league_rosters(league_id) if rosters_only else None
+                keepers = optimize_keepers(keeper_candidates(st.session_state.draft_data, rosters), players_per_round, max_keepers,
+                                           selected_adp_column, round_inflation, allow_bump, team_column='team_name')
+                st.dataframe(team_keeper_values(keepers, 'team_name'))
+                st.dataframe(keepers[['team_name', 'full_name', 'position', 'round', 'keeper_round', 'adp', 'adp_round', 'value']], hide_index=True)
+
+        # Simulate the draft from ADP to see who is likely to be there at each of a slot's picks
+        with st.expander("Draft Simulator"):
+            draft_data = st.session_state.draft_data
+            col1, col2 = st.columns(2)
+            draft_slot = col1.number_input("Draft slot", min_value=1, max_value=int(players_per_round), value=1, step=1)
+            num_sims = col2.number_input("Simulations", min_value=1000, max_value=50000, value=10000, step=1000)
+            lock_all = st.checkbox("Treat every fetched pick as already made (live draft)")
+            locked = draft_data if lock_all else draft_data[draft_data['is_keeper_info'].fillna(False).astype(bool)]
+            if st.button("Run Simulation"):
+                simulator = get_draft_simulator(adp_index, int(players_per_round), int(draft_data['round'].max()))
+                st.dataframe(simulator.availability(draft_slot, num_sims, locked).round(2), hide_index=True)
+
+        # Dropdown to select a team, or page through every pick
+        team_options = ["All teams"] + list(clean_df['team_name'].unique())
+        selected_team = st.selectbox("Select a Team Name:", team_options, index=1 if len(team_options) > 1 else 0, key="team_select")
         
         if selected_team:
             # Filter data for the selected team
-            team_picks = clean_df[clean_df['team_name'] == selected_team]
-            
-            # Display relevant information in a clean format
-            st.write(f"Draft Picks for {selected_team}:")
-            for index, row in team_picks.iterrows():
-                image_path = row['image_path']
-                
-                # Use a horizontal layout with st.image and st.markdown
-                col1, col2, col3 = st.columns([1, 4, 2])
-                
-                with col1:
-                    if image_path:
-                        st.image(image_path, width=90)
-
-                with col2:
-                    st.markdown(f"""
-                    <div style="border:2px solid #ddd; padding:15px; border-radius:10px; background-color:#f9f9f9;">
-                        <strong style="font-size: 1.25em;">{row['full_name']}</strong> - {row['position']}<br>
-                        <small style="font-size: 1.1em;">Round {row['round']}, Pick {row['pick_no']}</small>
-                    </div>
-                    """, unsafe_allow_html=True)
-
-                with col3:
-                    if row['round_diff'] is not None:
-                        evaluate_keeper_value(row['full_name'], row['round'], adp_data, selected_adp_column, players_per_round)
-                    else:
-                        st.write("ADP not available")
+            team_picks = clean_df if selected_team == "All teams" else clean_df[clean_df['team_name'] == selected_team]
+
+            # Render the whole page of cards as one HTML element instead of widgets per pick
+            page_size = 48
+            page = st.number_input("Page", min_value=1, value=1, step=1, key="picks_page") if len(team_picks) > page_size else 1
+            page_picks, pages = paginate(team_picks, page, page_size)
+            st.write(f"Draft Picks for {selected_team}:" + (f" (page {min(page, pages)} of {pages})" if pages > 1 else ""))
+            st.markdown(pick_cards_html(page_picks), unsafe_allow_html=True)
+
+if timings is not None:
+    stop_recording()
+    if timings.records:
+        st.sidebar.dataframe(timings.summary())
+    st.sidebar.caption("Shared draft cache: {entries} entries, {bytes:,} bytes, {hits} hits, {misses} misses, "
+                       "{waits} joined fetches, {evictions} evictions".format(**get_draft_cache().info()))
@@ -0,0 +1,31 @@
+import os
+import sys
+
+import pytest
+
+# The modules live flat in the repository root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(scope='session')
+def adp_data():
+    from adp import read_adp_data
+
+    return read_adp_data(os.path.join(ROOT, 'data.csv'))
+
+
+# A recorded synthetic league: (archive, league) with the league, its draft and picks archived
+@pytest.fixture
+def recorded_league(tmp_path, adp_data):
+    from fake_sleeper import FakeSleeperServer, synthetic_league
+    from replay import FixtureArchive, record_session
+    from sleeper import SleeperClient
+
+    league = synthetic_league(adp_data, '5000', num_teams=4, rounds=3)
+    archive = FixtureArchive(str(tmp_path / 'fixtures.sqlite'))
+    with FakeSleeperServer([league]) as server, SleeperClient(server.url) as client:
+        record_session(client.session, archive)
+        client.get('league/5000')
+        client.fetch_draft('5000', league['draft']['draft_id'])
+    return archive, league
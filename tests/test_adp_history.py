@@ -0,0 +1,60 @@
+import datetime
+import shutil
+
+import pytest
+
+from adp_history import AdpHistory
+
+SNAPSHOTS = {
+    '2024-08-01': {'Player A': 1.0, 'Player B': 2.0, 'Mike Thomas': 3.0, 'Michael Thomas': 4.0},
+    '2024-08-10': {'Player A': 1.5, 'Player B': 2.0, 'Player C': 5.0, 'Mike Thomas': 3.0, 'Michael Thomas': 4.0},
+    # Player B drops off the source
+    '2024-08-20': {'Player A': 1.5, 'Player C': 4.5, 'Mike Thomas': 3.0, 'Michael Thomas': 4.0},
+}
+
+
+@pytest.fixture
+def snapshots(tmp_path):
+    directory = tmp_path / 'snapshots'
+    directory.mkdir()
+    for date, adp in SNAPSHOTS.items():
+        rows = ''.join(f'{name},{value}\n' for name, value in adp.items())
+        (directory / f'{date}-sleeper.csv').write_text('Name,ADP\n' + rows)
+    return directory
+
+
+def sleeper_adp(history, date):
+    data = history.adp_as_of(date)
+    return dict(zip(data['Name'], data['Sleeper']))
+
+
+def test_as_of_lookups_follow_the_change_points(tmp_path, snapshots):
+    history = AdpHistory(str(tmp_path / 'history.sqlite'))
+    # Every player on the first day, then A and C, then C and B dropping off
+    assert history.ingest_directory(str(snapshots), source='Sleeper') == 4 + 2 + 2
+
+    assert not history.has_data('2024-07-31') and history.adp_as_of('2024-07-31').empty
+    assert sleeper_adp(history, '2024-08-01') == SNAPSHOTS['2024-08-01']
+    # Between snapshots the earlier one holds; dates, datetimes and Sleeper's millisecond timestamps all work
+    mid_august = datetime.datetime(2024, 8, 15, 12, tzinfo=datetime.timezone.utc)
+    for date in ['2024-08-15', mid_august.date(), mid_august, int(mid_august.timestamp() * 1000)]:
+        assert sleeper_adp(history, date) == SNAPSHOTS['2024-08-10']
+    assert sleeper_adp(history, '2024-09-01') == SNAPSHOTS['2024-08-20']
+    # Ranked by Sleeper ADP
+    assert list(history.adp_as_of('2024-08-20')['Name']) == ['Player A', 'Mike Thomas', 'Michael Thomas', 'Player C']
+    assert history.latest_dates() == {'Sleeper': '2024-08-20'}
+
+
+def test_reingesting_a_snapshot_writes_nothing(tmp_path, snapshots):
+    history = AdpHistory(str(tmp_path / 'history.sqlite'))
+    history.ingest_directory(str(snapshots), source='Sleeper')
+    assert history.ingest_directory(str(snapshots), source='Sleeper') == 0
+    # Same bytes under another name are the same snapshot
+    shutil.copy(snapshots / '2024-08-20-sleeper.csv', snapshots / '2024-08-21-sleeper.csv')
+    assert history.ingest_directory(str(snapshots), source='Sleeper') == 0
+    assert history.latest_dates() == {'Sleeper': '2024-08-20'}
+
+    # A new snapshot older than the latest is refused
+    (snapshots / 'late.csv').write_text('Name,ADP\nPlayer A,9.0\n')
+    with pytest.raises(ValueError):
+        history.ingest_file(str(snapshots / 'late.csv'), '2024-08-05', 'Sleeper')
@@ -0,0 +1,32 @@
+import mmap
+import os
+
+import numpy as np
+import pandas as pd
+
+from adp import ADP_SOURCES, build_adp_index
+from adp_store import ingest_adp_csv, load_adp_store
+from conftest import ROOT
+
+
+# The buffer at the bottom of an array's chain of views
+def _root(array):
+    while isinstance(array, np.ndarray) and array.base is not None:
+        array = array.base
+    return array
+
+
+def test_loaded_store_shares_the_mapped_arrays(tmp_path):
+    store_path = str(tmp_path / 'adp_store')
+    validated = ingest_adp_csv(os.path.join(ROOT, 'data.csv'), store_path)
+    data = load_adp_store(store_path)
+    pd.testing.assert_frame_equal(data, validated, check_dtype=False, check_categorical=False)
+
+    # The frame's numeric columns are views of the mapped files, and the index's ADP matrix is the same
+    # memory, not a copy
+    adp = data[ADP_SOURCES[0]].to_numpy()
+    assert isinstance(_root(adp), mmap.mmap)
+    assert isinstance(_root(data['Rank'].to_numpy()), mmap.mmap)
+    values = build_adp_index(data).values
+    assert all(np.shares_memory(values, data[source].to_numpy()) for source in ADP_SOURCES)
+    assert _root(values) is _root(adp)
@@ -0,0 +1,69 @@
+import os
+
+import pytest
+
+from conftest import ROOT
+from fake_sleeper import FakeSleeperServer, synthetic_league
+
+AppTest = pytest.importorskip('streamlit.testing.v1').AppTest
+
+
+# test2.py in a scratch directory (its stores and caches are relative paths) against a fake Sleeper
+@pytest.fixture
+def app(tmp_path, monkeypatch, adp_data):
+    import streamlit as st
+
+    import sleeper
+
+    league = synthetic_league(adp_data, '9000', num_teams=10, rounds=15)
+    os.symlink(os.path.join(ROOT, 'data.csv'), tmp_path / 'data.csv')
+    monkeypatch.chdir(tmp_path)
+    st.cache_resource.clear()
+    with FakeSleeperServer([league]) as server:
+        monkeypatch.setattr(sleeper, 'SLEEPER_API_URL', server.url)
+        at = AppTest.from_file(os.path.join(ROOT, 'test2.py'), default_timeout=60).run()
+        at.text_input[0].input('Test League')
+        at.text_input[1].input('9000')
+        at.text_input[2].input(league['draft']['draft_id'])
+        at.button[0].click().run()
+        at.selectbox[0].select('Test League').run()
+        yield at, server
+    st.cache_resource.clear()
+
+
+def test_pick_pages_render_as_one_card_grid(app):
+    at, server = app
+    next(button for button in at.button if button.label == 'Fetch Draft Results').click().run()
+    assert not at.exception
+
+    # One team: its 15 picks in a single markdown element
+    grids = [m.value for m in at.markdown if 'pick-card' in m.value]
+    assert len(grids) == 1 and grids[0].count('<div class="pick-card') == 15
+
+    # Every team: 150 picks paged 48 at a time, still one element per page
+    at.selectbox(key='team_select').select('All teams').run()
+    grids = [m.value for m in at.markdown if 'pick-card' in m.value]
+    assert len(grids) == 1 and grids[0].count('<div class="pick-card') == 48
+    at.number_input(key='picks_page').set_value(4).run()
+    grids = [m.value for m in at.markdown if 'pick-card' in m.value]
+    assert grids[0].count('<div class="pick-card') == 6
+
+    # Reruns come from session state and the shared cache, not the network
+    requests = len(server.requests)
+    at.run()
+    assert not at.exception and len(server.requests) == requests
+
+
+def test_keeper_optimizer_runs_only_when_asked(app):
+    at, server = app
+    next(button for button in at.button if button.label == 'Fetch Draft Results').click().run()
+    tables = len(at.dataframe)
+    requests = len(server.requests)
+    at.run()
+    assert len(at.dataframe) == tables and len(server.requests) == requests
+
+    next(button for button in at.button if button.label == 'Optimize Keepers').click().run()
+    assert not at.exception
+    keepers = next(table.value for table in at.dataframe if 'keeper_round' in table.value)
+    assert len(keepers) and set(keepers['team_name']) <= set(at.session_state.draft_data['team_name'])
+    assert len(at.dataframe) == tables + 2
@@ -0,0 +1,115 @@
+import threading
+import time
+import types
+
+import pandas as pd
+
+import draft_cache
+from draft_cache import GradedDraftCache, estimate_size
+
+
+# Run get_or_compute for key from n threads; returns their results (or exceptions) once all finish
+def concurrent_callers(cache, key, compute, n):
+    results = [None] * n
+
+    def call(i):
+        try:
+            results[i] = cache.get_or_compute(key, compute)
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(n)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+# A compute that blocks until released, so every caller joins the flight before it ends
+def gated(result):
+    calls, release = [], threading.Event()
+
+    def compute():
+        calls.append(1)
+        release.wait(10)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    return compute, calls, release
+
+
+def wait_for_waiters(cache, n):
+    deadline = time.monotonic() + 10
+    while cache.info()['waits'] < n and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert cache.info()['waits'] == n
+
+
+def test_concurrent_callers_share_one_compute():
+    cache = GradedDraftCache()
+    frame = pd.DataFrame({'pick_no': range(10)})
+    compute, calls, release = gated(frame)
+    threads, results = concurrent_callers(cache, ('d1', 'v1'), compute, 8)
+    wait_for_waiters(cache, 7)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert all(result is frame for result in results)
+    assert cache.get(('d1', 'v1')) is frame
+    assert cache.info()['inflight'] == 0
+
+
+def test_exception_reaches_every_waiter_and_is_not_cached():
+    cache = GradedDraftCache()
+    compute, calls, release = gated(ValueError('fetch failed'))
+    threads, results = concurrent_callers(cache, 'd1', compute, 5)
+    wait_for_waiters(cache, 4)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert all(isinstance(result, ValueError) for result in results)
+    assert 'd1' not in cache and cache.info()['inflight'] == 0
+    # The next caller computes again
+    assert cache.get_or_compute('d1', lambda: 'graded') == 'graded'
+
+
+def test_least_recently_used_is_evicted_past_the_budget():
+    frames = {key: pd.DataFrame({'pick_no': range(1000)}) for key in 'abc'}
+    size = estimate_size(frames['a'])
+    cache = GradedDraftCache(max_bytes=2 * size)
+    cache.put('a', frames['a'])
+    cache.put('b', frames['b'])
+    # Reading a makes b the least recently used
+    assert cache.get('a') is frames['a']
+    cache.put('c', frames['c'])
+
+    assert 'b' not in cache and 'a' in cache and 'c' in cache
+    assert cache.bytes == 2 * size and cache.info()['evictions'] == 1
+    # A single entry over budget is still kept
+    big = pd.DataFrame({'pick_no': range(10_000)})
+    cache.put('big', big)
+    assert len(cache) == 1 and cache.get('big') is big
+
+
+def test_max_age_and_invalidate(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(draft_cache, 'time', types.SimpleNamespace(time=lambda: now[0]))
+    cache = GradedDraftCache()
+    cache.put(('d1', 'v1', 'fetched'), 'old')
+    now[0] += 61
+    assert cache.get(('d1', 'v1', 'fetched'), max_age=60) is None
+    assert ('d1', 'v1', 'fetched') not in cache
+    assert cache.get_or_compute(('d1', 'v1', 'fetched'), lambda: 'new', max_age=60) == 'new'
+    assert cache.get(('d1', 'v1', 'fetched'), max_age=60) == 'new'
+
+    cache.put(('d1', 'v1', 'fetched', 'Sleeper'), 'view')
+    cache.put('d1', 'bare')
+    cache.put(('d2', 'v1', 'fetched'), 'other')
+    assert cache.invalidate('d1') == 3
+    assert len(cache) == 1 and ('d2', 'v1', 'fetched') in cache
+    assert cache.invalidate() == 1
+    assert len(cache) == 0 and cache.bytes == 0
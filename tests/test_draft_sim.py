@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from adp import build_adp_index
+from draft_sim import DraftSimulator, snake_pick_numbers
+
+
+# 40 players one pick apart, the three sources a pick apart from each other
+@pytest.fixture(scope='module')
+def simulator():
+    ranks = np.arange(1, 41)
+    data = pd.DataFrame({'Rank': ranks, 'Name': [f'Player {i}' for i in ranks], 'Pos': 'WR',
+                         'Underdog': ranks.astype(float), 'Sleeper': ranks + 0.5, 'ESPN': ranks - 0.5})
+    return DraftSimulator(build_adp_index(data), num_teams=4, rounds=5)
+
+
+def test_snake_pick_numbers():
+    assert list(snake_pick_numbers(2, 4, 5)) == [2, 7, 10, 15, 18]
+    assert list(snake_pick_numbers(4, 4, 3)) == [4, 5, 12]
+
+
+def test_fixed_seed_availability(simulator):
+    frame = simulator.availability(2, num_sims=2000, seed=7)
+    assert list(frame.columns[:7]) == ['full_name', 'adp', 'pick_2', 'pick_7', 'pick_10', 'pick_15', 'pick_18']
+    first = frame.iloc[0]
+    assert first['full_name'] == 'Player 1'
+    assert first['pick_2'] == pytest.approx(0.4355)
+    assert first['expected_pick'] == pytest.approx(1.721)
+    assert frame.loc[7, 'pick_7'] == pytest.approx(0.7895)
+    # The same seed gives the same result; availability only falls as the draft goes on
+    pd.testing.assert_frame_equal(frame, simulator.availability(2, num_sims=2000, seed=7))
+    picks = frame[['pick_2', 'pick_7', 'pick_10', 'pick_15', 'pick_18']].to_numpy()
+    assert (np.diff(picks, axis=1) <= 0).all()
+
+
+def test_locked_picks_are_kept_out(simulator):
+    keeper = pd.DataFrame({'full_name': ['Player 1'], 'pick_no': [1]})
+    drafts = simulator.simulate(500, keeper, seed=7)
+    assert (drafts[:, 0] == -1).all()
+    # Nobody goes twice, and the keeper is never drafted
+    assert all(len(set(draft[draft >= 0])) == (draft >= 0).sum() for draft in drafts)
+    assert not (drafts == 0).any()
+    frame = simulator.availability(2, num_sims=2000, locked_picks=keeper, seed=7)
+    assert 'Player 1' not in set(frame['full_name'])
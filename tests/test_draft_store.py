@@ -0,0 +1,67 @@
+import sqlite3
+import time
+
+import pandas as pd
+import pytest
+
+from draft_store import DraftStore
+
+GRADED = pd.DataFrame({
+    'pick_no': [1, 2, 3],
+    'full_name': ['Player A', 'Player B', 'Player C'],
+    'roster_id': [1, 2, 1],
+    'adp_Sleeper': [1.5, None, 7.25],
+})
+
+
+def test_opening_a_baseline_store_adds_the_team_count(tmp_path):
+    # A store from before grades recorded num_teams, with one saved draft and its grades
+    path = str(tmp_path / 'keepers.sqlite')
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.executescript(
+            """
+            CREATE TABLE drafts (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE, league_id TEXT NOT NULL,
+                                 draft_id TEXT NOT NULL, created_at REAL NOT NULL);
+            CREATE TABLE grades (draft_id TEXT NOT NULL, adp_version TEXT NOT NULL, frame TEXT NOT NULL,
+                                 graded_at REAL NOT NULL, PRIMARY KEY (draft_id, adp_version));
+            """
+        )
+        conn.execute("INSERT INTO drafts VALUES (1, 'Old', '10', '20', ?)", (time.time(),))
+        conn.execute("INSERT INTO grades VALUES ('20', 'v1', ?, ?)", (GRADED.to_json(orient='split', index=False), time.time()))
+    conn.close()
+
+    store = DraftStore(path, csv_path=None)
+    assert store.names() == ['Old']
+    pd.testing.assert_frame_equal(store.load_grades('20', 'v1'), GRADED)
+    # Rows saved before the column existed have no team count
+    assert store.grades_num_teams('20', 'v1') is None
+    store.save_grades('20', 'v2', GRADED, num_teams=12)
+    assert store.grades_num_teams('20', 'v2') == 12
+    # Reopening doesn't add the column again
+    assert DraftStore(path, csv_path=None).grades_num_teams('20', 'v2') == 12
+
+
+def test_grades_round_trip_with_team_count(tmp_path):
+    store = DraftStore(str(tmp_path / 'keepers.sqlite'), csv_path=None)
+    store.save_grades('20', 'v1', GRADED, num_teams=10)
+    pd.testing.assert_frame_equal(store.load_grades('20', 'v1'), GRADED)
+    assert store.grades_num_teams('20', 'v1') == 10
+    assert store.latest_grades_version('20') == 'v1'
+    assert store.load_grades('20', 'v2') is None and store.grades_num_teams('20', 'v2') is None
+
+
+def test_names_are_unique_and_the_csv_is_migrated_once(tmp_path):
+    csv_path = tmp_path / 'saved_drafts.csv'
+    csv_path.write_text('name,league_id,draft_id\nFirst,10,20\nSecond,11,21\n')
+    path = str(tmp_path / 'keepers.sqlite')
+    store = DraftStore(path, csv_path=str(csv_path))
+    assert store.names() == ['First', 'Second']
+    assert store.get('Second') == {'name': 'Second', 'league_id': '11', 'draft_id': '21'}
+
+    with pytest.raises(ValueError):
+        store.add('First', '12', '22')
+    store.add('Third', '12', '22')
+    store.remove('First')
+    # A later open doesn't import the CSV again
+    assert DraftStore(path, csv_path=str(csv_path)).names() == ['Second', 'Third']
@@ -0,0 +1,77 @@
+import io
+import json
+
+import pytest
+
+from headshots import HeadshotManifest, HeadshotPrefetcher
+from replay import FixtureArchive, ReplayServer
+
+pytest.importorskip('bs4')
+Image = pytest.importorskip('PIL.Image')
+
+SITE = 'http://nfl.test'
+
+
+def _png():
+    output = io.BytesIO()
+    Image.new('RGB', (300, 300), 'red').save(output, format='PNG')
+    return output.getvalue()
+
+
+# A recorded NFL.com: search and player pages for two players, one whose "headshot" is an HTML error page
+@pytest.fixture
+def nfl_site(tmp_path):
+    archive = FixtureArchive(str(tmp_path / 'nfl.sqlite'))
+    html = {'Content-Type': 'text/html'}
+    for slug, name, image in [('good-player', 'Good%20Player', _png()), ('bad-image', 'Bad%20Image', b'<html>oops</html>')]:
+        archive.save(f"{SITE}/players/search?name={name}", 200, html,
+                     f'<a class="d3-o-player-fullname" href="/players/{slug}/">x</a>'.encode())
+        archive.save(f"{SITE}/players/{slug}/", 200, html,
+                     f'<img class="d3-o-player-headshot" src="/images/{slug}.png">'.encode())
+        archive.save(f"{SITE}/images/{slug}.png", 200, {'Content-Type': 'image/png'}, image)
+    with ReplayServer(archive) as server:
+        yield server
+
+
+def test_failures_are_marked_and_skipped_on_resume(tmp_path, nfl_site):
+    manifest = HeadshotManifest(str(tmp_path / 'images'))
+    names = ['Good Player', 'Bad Image', 'Not Recorded']
+    progress = HeadshotPrefetcher(manifest, nfl_site.url, requests_per_second=0).run(names)
+
+    assert progress == {'done': 3, 'found': 1, 'failed': 2, 'total': 3}
+    assert manifest.path_for('Good Player') is not None
+    assert manifest.failed['bad image']['reason'].startswith('bad image')
+    assert '404' in manifest.failed['not recorded']['reason']
+    # Nothing half-written for the image that couldn't be decoded
+    assert sorted(p.name for p in (tmp_path / 'images' / 'thumbs').iterdir()) == ['Good_Player.png']
+
+    # A resumed run loads the saved manifest and fetches nothing; retry_failed tries the failures again
+    requests_before = nfl_site.stats['requests']
+    resumed = HeadshotPrefetcher(HeadshotManifest(str(tmp_path / 'images')), nfl_site.url, requests_per_second=0)
+    assert resumed.run(names)['total'] == 0
+    assert nfl_site.stats['requests'] == requests_before
+    assert resumed.run(names, retry_failed=True) == {'done': 2, 'found': 0, 'failed': 2, 'total': 2}
+
+
+def test_nicknames_get_their_own_images(tmp_path):
+    manifest = HeadshotManifest(str(tmp_path / 'images'))
+    manifest.add('Michael Thomas', _png())
+    assert 'Mike Thomas' not in manifest
+    manifest.add('Mike Thomas', _png())
+    assert manifest.path_for('Mike Thomas').endswith('Mike_Thomas.png')
+    assert manifest.path_for('Michael Thomas').endswith('Michael_Thomas.png')
+
+
+# Manifests written before keys kept nicknames are re-keyed from their filenames
+def test_old_manifest_is_rekeyed(tmp_path):
+    directory = tmp_path / 'images'
+    directory.mkdir()
+    (directory / 'manifest.json').write_text(json.dumps({
+        'images': {'michael thomas': 'thumbs/Mike_Thomas.png', 'justin jefferson': 'thumbs/Justin_Jefferson.png'},
+        'failed': {'michael evans': {'reason': 'not found', 'at': 0}},
+    }))
+    manifest = HeadshotManifest(str(directory))
+    assert manifest.path_for('Mike Thomas').endswith('Mike_Thomas.png')
+    assert manifest.path_for('Michael Thomas') is None
+    assert manifest.path_for('Justin Jefferson').endswith('Justin_Jefferson.png')
+    assert manifest.failed == {}
@@ -0,0 +1,13 @@
+from fake_sleeper import FakeSleeperServer, synthetic_league
+from http_cache import ResponseCache
+from sleeper import SleeperClient
+
+
+def test_cache_keeps_hosts_apart(tmp_path, adp_data):
+    league = synthetic_league(adp_data, '6000', num_teams=4, rounds=2)
+    cache = ResponseCache(str(tmp_path / 'cache.sqlite'))
+    with FakeSleeperServer([league]) as first, FakeSleeperServer([league]) as second:
+        for server in (first, second):
+            with SleeperClient(server.url, cache=cache) as client:
+                client.get('league/6000', ttl=None)
+        assert first.requests == second.requests == ['/v1/league/6000']
@@ -0,0 +1,50 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from keeper_optimizer import solve_team_keepers
+
+
+# Best total value by trying every keeper set (and, with bumping, every order the bumps can happen in)
+def brute_force(keeper_rounds, adp_rounds, max_keepers, allow_bump, min_value):
+    best = 0.0
+    candidates = [i for i in range(len(keeper_rounds)) if not np.isnan(adp_rounds[i])]
+    for size in range(1, max_keepers + 1):
+        for subset in itertools.combinations(candidates, size):
+            for order in itertools.permutations(subset) if allow_bump else [subset]:
+                taken, value = set(), 0.0
+                for i in order:
+                    assigned = keeper_rounds[i]
+                    while allow_bump and assigned in taken:
+                        assigned -= 1
+                    gain = assigned - adp_rounds[i]
+                    if assigned < 1 or assigned in taken or gain < min_value:
+                        break
+                    taken.add(assigned)
+                    value += gain
+                else:
+                    best = max(best, value)
+    return best
+
+
+@pytest.mark.parametrize('allow_bump', [False, True])
+@pytest.mark.parametrize('min_value', [0, 1])
+def test_matches_brute_force_on_random_rosters(allow_bump, min_value):
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        size = int(rng.integers(1, 11))
+        keeper_rounds = rng.integers(1, 9, size)
+        adp_rounds = np.round(rng.uniform(1, 12, size), 1)
+        adp_rounds[rng.random(size) < 0.15] = np.nan
+        max_keepers = int(rng.integers(1, 5))
+
+        picks = solve_team_keepers(keeper_rounds, adp_rounds, max_keepers, allow_bump, min_value)
+        rounds = [assigned for _, assigned in picks]
+        assert len(picks) <= max_keepers
+        assert len(set(rounds)) == len(rounds)
+        assert all(1 <= assigned <= keeper_rounds[i] and assigned - adp_rounds[i] >= min_value for i, assigned in picks)
+        if not allow_bump:
+            assert all(assigned == keeper_rounds[i] for i, assigned in picks)
+        value = sum(assigned - adp_rounds[i] for i, assigned in picks)
+        assert value == pytest.approx(brute_force(keeper_rounds, adp_rounds, max_keepers, allow_bump, min_value))
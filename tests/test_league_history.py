@@ -0,0 +1,61 @@
+import pytest
+
+from draft_store import DraftStore
+from fake_sleeper import FakeSleeperServer, synthetic_league
+from league_history import LeagueCrawler
+from sleeper import SleeperClient
+
+
+# Two seasons of one league: 7001 (this year) continues 7000
+@pytest.fixture
+def league_server(adp_data):
+    older = synthetic_league(adp_data, '7000', num_teams=4, rounds=3, seed=0)
+    newer = synthetic_league(adp_data, '7001', num_teams=4, rounds=3, seed=1)
+    newer['league']['previous_league_id'] = '7000'
+    with FakeSleeperServer([older, newer]) as server:
+        yield server
+
+
+def test_crawl_stores_every_season(tmp_path, league_server):
+    store = DraftStore(str(tmp_path / 'keepers.sqlite'), csv_path=None)
+    with SleeperClient(league_server.url) as client:
+        chain = LeagueCrawler(client, store).crawl('7001')
+    assert [league['league_id'] for league in chain] == ['7001', '7000']
+    assert set(store.league_drafts()['draft_id']) == {'70000', '70010'}
+    assert len(store.load_picks('70000')) == 12
+    assert store.load_rosters('7000')[1][1] == 'Owner 1'
+
+
+def test_interrupted_crawl_resumes_and_recrawl_fetches_nothing(tmp_path, league_server, monkeypatch):
+    store = DraftStore(str(tmp_path / 'keepers.sqlite'), csv_path=None)
+    with SleeperClient(league_server.url) as client:
+        # The older season's drafts can't be fetched the first time
+        get = client.get
+
+        def flaky_get(path, *args, **kwargs):
+            if path == 'league/7000/drafts':
+                raise ConnectionError('network down')
+            return get(path, *args, **kwargs)
+
+        monkeypatch.setattr(client, 'get', flaky_get)
+        with pytest.raises(ConnectionError):
+            LeagueCrawler(client, store).crawl('7001')
+        assert store.league('7001')['crawled_at'] is not None
+        assert store.league('7000') is None
+        monkeypatch.undo()
+
+        # The resumed crawl only fetches the season that didn't finish
+        league_server.requests.clear()
+        crawler = LeagueCrawler(client, store)
+        crawler.crawl('7001')
+        assert crawler.progress == {'seasons': 1, 'skipped': 1, 'drafts': 1}
+        assert not any('7001' in path for path in league_server.requests)
+        assert store.has_picks('70000')
+
+        # Everything is stored and complete now: a recrawl, or the same league twice, makes no requests
+        league_server.requests.clear()
+        crawler = LeagueCrawler(client, store)
+        crawler.crawl('7001')
+        crawler.crawl('7000')
+        assert league_server.requests == []
+        assert crawler.progress == {'seasons': 0, 'skipped': 3, 'drafts': 0}
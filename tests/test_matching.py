@@ -0,0 +1,62 @@
+import pytest
+
+from matching import PlayerMatcher, canonical_key
+
+SHEET = [
+    ('DJ Moore', 'WR'),
+    ('Kenneth Walker III', 'RB'),
+    ('Marvin Harrison Jr.', 'WR'),
+    ('Darnell Washington II', 'TE'),
+    ('Joe Mixon', 'RB'),
+    ('Michael Thomas', 'WR'),
+    ('Michael Mayer', 'TE'),
+]
+
+
+@pytest.fixture
+def matcher():
+    names, positions = zip(*SHEET)
+    return PlayerMatcher(list(names), positions=list(positions))
+
+
+def row(name):
+    return [sheet_name for sheet_name, _ in SHEET].index(name)
+
+
+def test_initials_with_and_without_periods(matcher):
+    assert canonical_key('D.J. Moore') == canonical_key('DJ Moore') == 'dj moore'
+    assert matcher.match('D.J. Moore') == matcher.match('DJ Moore') == row('DJ Moore')
+
+
+@pytest.mark.parametrize('query, name', [
+    ('Kenneth Walker', 'Kenneth Walker III'),
+    ('Marvin Harrison', 'Marvin Harrison Jr.'),
+    ('Marvin Harrison Jr', 'Marvin Harrison Jr.'),
+    ('Darnell Washington', 'Darnell Washington II'),
+    ('Darnell Washington Jr.', 'Darnell Washington II'),
+])
+def test_suffixes_are_ignored(matcher, query, name):
+    assert matcher.match(query) == row(name)
+
+
+def test_similar_name_of_another_player_stays_unmatched(matcher):
+    assert matcher.match('Joe Milton') is None
+    assert matcher.match('Joe Milton', player_position='QB') is None
+    # A typo of a listed player still matches
+    assert matcher.match('Joe Mixonn', player_position='RB') == row('Joe Mixon')
+
+
+def test_position_guards_fuzzy_and_nickname_matches(matcher):
+    assert matcher.match('Kenneth Walkr', player_position='RB') == row('Kenneth Walker III')
+    assert matcher.match('Kenneth Walkr', player_position='WR') is None
+    assert matcher.match('Mike Mayer', player_position='TE') == row('Michael Mayer')
+    assert matcher.match('Mike Mayer', player_position='LB') is None
+
+
+def test_nicknames_are_only_aliases():
+    assert canonical_key('Mike Thomas') == canonical_key('Michael Thomas')
+    assert canonical_key('Mike Thomas', nicknames=False) != canonical_key('Michael Thomas', nicknames=False)
+    # With only Michael listed, Mike resolves to him; with both listed, each is his own player
+    assert PlayerMatcher(['Michael Thomas']).match('Mike Thomas') == 0
+    both = PlayerMatcher(['Michael Thomas', 'Mike Thomas'])
+    assert both.match('Mike Thomas') == 1 and both.match('Michael Thomas') == 0
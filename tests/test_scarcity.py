@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from adp import build_adp_index
+from scarcity import PositionIndex, PositionScarcity, _Fenwick
+
+
+def test_fenwick_prefix_sums_match_a_running_count():
+    rng = np.random.default_rng(0)
+    tree, counts = _Fenwick(50), np.zeros(50, dtype=int)
+    for i in rng.integers(0, 50, 300):
+        tree.add(int(i))
+        counts[i] += 1
+        assert all(tree.prefix(j) == counts[:j].sum() for j in range(51))
+
+
+# Undrafted players at a position (optionally one tier, only those with ADP at or past pick_no), by scanning
+def naive_remaining(index, drafted, position, tier=None, pick_no=None):
+    rows, adp = index.rows[position], index.adp[position]
+    keep = np.ones(len(rows), dtype=bool)
+    if tier is not None:
+        keep &= index.tiers(position) == tier
+    if pick_no is not None:
+        keep &= adp >= pick_no
+    return sum(1 for row in rows[keep] if row not in drafted)
+
+
+@pytest.mark.parametrize('source', ['Sleeper', 'ESPN'])
+def test_counts_match_a_naive_count_after_each_pick(adp_data, source):
+    adp_index = build_adp_index(adp_data)
+    index = PositionIndex(adp_index, source)
+    scarcity = PositionScarcity(index, adp_index, num_teams=10)
+
+    # Roughly ADP order with some reaches, plus a pick that isn't in the ADP table
+    rng = np.random.default_rng(1)
+    listed = adp_data[adp_data[source].notna()]
+    order = np.argsort(listed[source].to_numpy() + rng.normal(0, 8, len(listed)))[:150]
+    picks = pd.DataFrame({'full_name': listed['Name'].to_numpy()[order], 'position': listed['Pos'].astype(str).to_numpy()[order]})
+    picks.loc[40] = ['Not A Player', 'WR']
+    picks['pick_no'] = np.arange(1, len(picks) + 1)
+
+    drafted = set()
+    for i in range(len(picks)):
+        pick = picks.iloc[[i]]
+        scarcity.add_picks(pick)
+        row = adp_index.positions(pick['full_name'], None, pick['position'])[0]
+        if row >= 0:
+            drafted.add(row)
+        pick_no = i + 2
+        for position in index.positions:
+            assert scarcity.remaining(position) == naive_remaining(index, drafted, position)
+            assert scarcity.remaining(position, pick_no=pick_no) == naive_remaining(index, drafted, position, pick_no=pick_no)
+            starters = index.rows[position][:index.replacement_rank(position, 10)]
+            assert scarcity.above_replacement(position) == sum(1 for row in starters if row not in drafted)
+            for tier in range(1, len(index.tier_starts[position]) + 1):
+                assert scarcity.remaining(position, tier) == naive_remaining(index, drafted, position, tier)
+    assert scarcity.last_pick_no == len(picks)
+    # Re-adding picks already recorded changes nothing
+    assert scarcity.add_picks(picks) == 0
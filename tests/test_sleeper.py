@@ -0,0 +1,33 @@
+import time
+
+import pytest
+import requests
+
+from replay import ReplayServer
+from sleeper import SleeperClient
+
+
+def test_fetch_draft_retries_injected_errors(recorded_league):
+    archive, league = recorded_league
+    with ReplayServer(archive, error_rate=0.3, seed=1) as server:
+        with SleeperClient(server.url + '/v1', retries=8, backoff_factor=0.001) as client:
+            for _ in range(5):
+                rosters, team_id_to_name, picks = client.fetch_draft('5000', league['draft']['draft_id'])
+                assert len(picks) == len(league['picks'])
+                assert len(team_id_to_name) == len(league['rosters'])
+    assert server.stats['errors'] > 0
+    assert server.stats['misses'] == 0
+
+
+def test_get_gives_up_after_retries_with_backoff(recorded_league):
+    archive, _ = recorded_league
+    with ReplayServer(archive, error_rate=1.0, error_status=503) as server:
+        with SleeperClient(server.url + '/v1', retries=3, backoff_factor=0.1) as client:
+            start = time.perf_counter()
+            with pytest.raises(requests.RequestException):
+                client.get('league/5000')
+            elapsed = time.perf_counter() - start
+    # One try plus three retries, sleeping 0, 0.2 and 0.4 seconds between them
+    assert server.stats['requests'] == 4
+    assert elapsed >= 0.5
+
@@ -0,0 +1,22 @@
+import logging
+
+import timing
+
+
+def test_enabling_timing_prints_stages_once(monkeypatch, capsys):
+    monkeypatch.setattr(timing.logger, 'handlers', [])
+    monkeypatch.setattr(timing.logger, 'propagate', True)
+    monkeypatch.setattr(timing.logger, 'level', logging.NOTSET)
+    monkeypatch.setattr(timing, '_enabled', False)
+
+    with timing.timed('grade'):
+        pass
+    assert capsys.readouterr().err == ''
+
+    # Enabling twice still leaves one handler
+    timing.enable()
+    timing.enable()
+    with timing.timed('grade'):
+        pass
+    assert capsys.readouterr().err.count('sleeperkeepers.timing: grade took') == 1
+    timing.logger.handlers[0].close()
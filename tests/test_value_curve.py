@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from value_curve import ValueCurve
+
+# Sources for four players: consensus (median) ADPs 2, 4, 3 and 10; the last row is unlisted
+ADP = np.array([
+    [1.0, 2.0, 3.0],
+    [4.0, np.nan, 4.0],
+    [3.0, 3.0, 9.0],
+    [10.0, 10.0, 10.0],
+    [np.nan, np.nan, np.nan],
+])
+
+
+def test_value_halves_every_half_life():
+    curve = ValueCurve(ADP, half_life=4)
+    assert curve.value(1) == pytest.approx(100.0)
+    assert curve.value([5, 9]) == pytest.approx([50.0, 25.0])
+    assert np.isnan(curve.value(np.nan))
+
+
+def test_pick_values_follow_the_consensus_adp():
+    curve = ValueCurve(ADP, half_life=4)
+    assert list(curve.consensus) == [2.0, 3.0, 4.0, 10.0]
+    assert curve.pick_values([1, 2, 3, 4]) == pytest.approx(curve.value([2.0, 3.0, 4.0, 10.0]))
+    # Past the listed pool the ADP keeps climbing one pick at a time, and values never rise
+    assert curve.pick_values(6) == pytest.approx(curve.value(12.0))
+    assert (np.diff(curve.by_pick) <= 0).all()
+
+
+def test_league_tables_are_a_snake_over_the_curve():
+    curve = ValueCurve(ADP, half_life=4)
+    tables = curve.tables(3, 4)
+    assert tables is curve.tables(3, 4)
+    assert tables.pick_numbers[:, 0].tolist() == [1, 6, 7, 12]
+    assert tables.pick_numbers[1].tolist() == [6, 5, 4]
+    assert tables.values == pytest.approx(curve.pick_values(tables.pick_numbers))
+    assert tables.slot_capital == pytest.approx(tables.values.sum(axis=0))
+    # The inverse lookups take every overall pick back to its round and slot
+    for pick in range(1, 13):
+        assert tables.pick_number(tables.round_of_pick[pick], tables.slot_of_pick[pick]) == pick
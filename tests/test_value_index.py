@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from adp import ADP_SOURCES
+from value_index import PlayerValueIndex
+
+NAMES = ['Mike Thomas', 'Michael Thomas', 'Justin Jefferson', 'Bijan Robinson', 'Puka Nacua', 'Sam LaPorta']
+
+
+# A graded draft of the same players in a random order; some ungraded, some with Sleeper IDs
+def graded_draft(rng, with_ids):
+    order = rng.permutation(len(NAMES))
+    graded = pd.DataFrame({
+        'pick_no': np.arange(1, len(NAMES) + 1),
+        'full_name': [NAMES[i] for i in order],
+        'position': 'WR',
+        'team_name': 'Team',
+        'round': np.arange(len(NAMES)) // 3 + 1,
+    })
+    if with_ids:
+        graded['player_id'] = [str(1000 + i) if i % 2 else '' for i in order]
+    for source in ADP_SOURCES:
+        graded[f'adp_{source}'] = rng.uniform(1, 30, len(NAMES))
+        graded[f'round_diff_{source}'] = np.where(rng.random(len(NAMES)) < 0.2, np.nan, rng.normal(0, 2, len(NAMES)))
+    return graded
+
+
+def aggregates(index):
+    frame = pd.read_sql_query('SELECT * FROM player_season', index._connect())
+    return frame.drop(columns=['full_name', 'position']).sort_values(['player_key', 'season', 'source'], ignore_index=True)
+
+
+def test_incremental_aggregates_match_a_full_recompute(tmp_path):
+    rng = np.random.default_rng(0)
+    index = PlayerValueIndex(str(tmp_path / 'values.sqlite'))
+    for draft in range(12):
+        index.add_draft(graded_draft(rng, draft % 2), f'd{draft}', league_id=None if draft == 5 else f'l{draft % 4}',
+                        season=str(2023 + draft % 2))
+    # Regrade a few drafts and remove others
+    for draft in (1, 4, 7):
+        index.add_draft(graded_draft(rng, draft % 2), f'd{draft}', league_id=f'l{draft % 4}', season=str(2023 + draft % 2))
+    for draft in (0, 5, 6):
+        index.remove_draft(f'd{draft}')
+
+    incremental = aggregates(index)
+    index.rebuild()
+    pd.testing.assert_frame_equal(incremental, aggregates(index), check_exact=False, rtol=1e-9, atol=1e-9)
+
+    # Name keys keep nicknames: Mike and Michael Thomas are two players
+    assert {'name:mike thomas', 'name:michael thomas'} <= set(incremental['player_key'])
+    assert set(index.player_history('Mike Thomas')['full_name']) == {'Mike Thomas'}
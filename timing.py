@@ -0,0 +1,88 @@
+"""Opt-in per-stage timing.
+
+Wrap a stage in ``with timed('grade'):`` or decorate a function with
+``@timed('fetch')``. Timing is off by default and then costs one check per
+stage. It is on for the whole process with ``SLEEPER_TIMING=1`` (or
+``enable()``), or for the current run only while a ``start_recording()``
+recorder is active, which is how the app shows a per-stage breakdown in its
+sidebar. Finished stages are also logged to the ``sleeperkeepers.timing``
+logger at INFO; turning timing on for the process sets that logger to INFO
+and, unless it already has a handler, gives it one writing to stderr.
+"""
+import contextlib
+import contextvars
+import logging
+import os
+import threading
+import time
+
+import pandas as pd
+
+logger = logging.getLogger('sleeperkeepers.timing')
+
+_enabled = False
+_recorder = contextvars.ContextVar('timing_recorder', default=None)
+
+
+def enable(on=True):
+    global _enabled
+    _enabled = on
+    if on:
+        logger.setLevel(logging.INFO)
+        if not logger.handlers:
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter('%(asctime)s %(name)s: %(message)s'))
+            logger.addHandler(handler)
+            # Already printed here; don't print it again through a root handler
+            logger.propagate = False
+
+
+if os.environ.get('SLEEPER_TIMING') == '1':
+    enable()
+
+
+class StageTimings:
+    """Stage latencies collected during one run (one app rerun or one batch job)."""
+
+    def __init__(self):
+        self.records = []
+        self._lock = threading.Lock()
+
+    def add(self, stage, seconds):
+        with self._lock:
+            self.records.append((stage, seconds))
+
+    # Count, total and slowest call per stage, in milliseconds, in first-seen order
+    def summary(self):
+        frame = pd.DataFrame(self.records, columns=['stage', 'seconds'])
+        summary = frame.groupby('stage', sort=False)['seconds'].agg(['count', 'sum', 'max'])
+        return (summary[['sum', 'max']] * 1000).round(1).rename(columns={'sum': 'total_ms', 'max': 'max_ms'}).assign(
+            calls=summary['count']
+        )
+
+
+# Record stages timed in this context (and this thread) into a fresh StageTimings
+def start_recording():
+    recorder = StageTimings()
+    _recorder.set(recorder)
+    return recorder
+
+
+def stop_recording():
+    _recorder.set(None)
+
+
+@contextlib.contextmanager
+def timed(stage):
+    recorder = _recorder.get()
+    if not _enabled and recorder is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        if recorder is not None:
+            recorder.add(stage, elapsed)
+        logger.info("%s took %.1f ms", stage, elapsed * 1000)
@@ -0,0 +1,90 @@
+"""Pick-value curves: what an overall pick, and a snake slot, is worth.
+
+``adp_to_round`` treats every pick in a round alike and the ADP app compares
+raw pick numbers, but early picks are worth far more than late ones. A
+``ValueCurve`` is built once per ADP table: a player is worth an exponential
+decay of their ADP (halving every ``half_life`` picks), and overall pick p
+is worth the p-th player by consensus (median) ADP, so picks are dearer
+where ADP is sparse and cheaper where it bunches. ``LeagueValueTables`` lay
+the curve out as (rounds, teams) arrays of pick numbers and values for a
+snake draft, built once per league shape, so grading a draft is a gather by
+``pick_no``.
+"""
+import threading
+
+import numpy as np
+
+from draft_sim import snake_pick_numbers
+
+# Picks for a player's value to halve; about two rounds in a 12-team league
+DEFAULT_HALF_LIFE = 24
+
+
+class ValueCurve:
+    """Value of every overall pick, from the consensus ADP of a player pool."""
+
+    def __init__(self, adp_values, half_life=DEFAULT_HALF_LIFE):
+        self.half_life = half_life
+        listed = ~np.isnan(adp_values).all(axis=1)
+        self.consensus = np.sort(np.nanmedian(adp_values[listed], axis=1))
+        self.by_pick = self._curve(len(self.consensus))
+        self._tables = {}
+        self._lock = threading.Lock()
+
+    # Value of a player at an ADP (scalar or array); NaN stays NaN
+    def value(self, adp):
+        return 100.0 * np.exp2(-(np.asarray(adp, dtype=float) - 1) / self.half_life)
+
+    # Curve for picks 1..length; past the listed pool the ADP keeps climbing one pick at a time
+    def _curve(self, length):
+        adp = self.consensus
+        if length > len(adp):
+            last = adp[-1] if len(adp) else 0.0
+            adp = np.concatenate([adp, last + np.arange(1, length - len(adp) + 1)])
+        # Never worth more than an earlier pick, even where two sources disagree
+        return np.minimum.accumulate(self.value(adp[:length])).astype(np.float32)
+
+    # Value of overall picks (1-based, scalar or array) in one gather
+    def pick_values(self, pick_no):
+        picks = np.asarray(pick_no, dtype=np.int64)
+        if picks.size and picks.max() > len(self.by_pick):
+            self.by_pick = self._curve(int(picks.max()))
+        return self.by_pick[np.maximum(picks, 1) - 1]
+
+    # Round/slot tables for a league shape, built once
+    def tables(self, num_teams, rounds):
+        key = (int(num_teams), int(rounds))
+        with self._lock:
+            if key not in self._tables:
+                self._tables[key] = LeagueValueTables(self, *key)
+            return self._tables[key]
+
+
+class LeagueValueTables:
+    """Snake-draft lookup tables for one (teams, rounds) league shape."""
+
+    def __init__(self, curve, num_teams, rounds):
+        self.num_teams = num_teams
+        self.rounds = rounds
+        # pick_numbers[round - 1, slot - 1] is the overall pick that slot makes in that round
+        self.pick_numbers = np.stack(
+            [snake_pick_numbers(slot, num_teams, rounds) for slot in range(1, num_teams + 1)], axis=1
+        )
+        self.values = curve.pick_values(self.pick_numbers)
+        # Total draft capital each slot gets over the whole draft
+        self.slot_capital = self.values.sum(axis=0)
+        # Inverse lookups, indexed by overall pick (index 0 unused)
+        total = num_teams * rounds
+        self.round_of_pick = np.zeros(total + 1, dtype=np.int32)
+        self.slot_of_pick = np.zeros(total + 1, dtype=np.int32)
+        rounds_grid, slots_grid = np.indices(self.pick_numbers.shape)
+        self.round_of_pick[self.pick_numbers] = rounds_grid + 1
+        self.slot_of_pick[self.pick_numbers] = slots_grid + 1
+
+    # Overall pick number for a round and draft slot
+    def pick_number(self, round_no, slot):
+        return int(self.pick_numbers[round_no - 1, slot - 1])
+
+    # Value of a round and draft slot's pick
+    def value(self, round_no, slot):
+        return float(self.values[round_no - 1, slot - 1])
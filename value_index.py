@@ -0,0 +1,304 @@
+"""Cross-league index of where players were drafted against ADP.
+
+Graded pick tables (``grading.grade_picks`` / ``pipeline.grade_draft``
+output) are added one draft at a time. Every pick is kept in ``draft_picks``
+(one row per player per league draft), and a ``player_season`` table holds
+per player, season and ADP source the draft and league counts, pick and
+round averages and ``round_diff`` stats as running sums. Adding a draft is
+one upsert per pick; regrading or removing one recomputes only its players.
+The rankings read an indexed ``mean_round_diff`` column, so they stay a few
+milliseconds however many drafts are indexed.
+
+``round_diff`` is ``adp_round - round``. A value went later than ADP
+(negative), a reach went earlier (positive).
+
+    python value_index.py values [season]
+    python value_index.py reaches [season]
+    python value_index.py player "Player Name"
+"""
+import sys
+import time
+
+import pandas as pd
+
+from adp import ADP_SOURCES
+from matching import canonical_key
+from storage import SQLiteStore
+
+VALUE_INDEX_PATH = 'value_index.sqlite'
+
+
+# Player key for a name: normalized, but nicknames are kept so Mike Thomas and Michael Thomas stay apart
+def name_key(name):
+    return 'name:' + canonical_key(name, nicknames=False)
+
+
+# Stable player key: the Sleeper player_id when there is one, else the name key
+def player_keys(frame):
+    names = frame['full_name'].map(name_key)
+    if 'player_id' not in frame:
+        return names
+    ids = frame['player_id'].astype(object).where(frame['player_id'].notna())
+    return ids.map(lambda player_id: None if player_id is None or player_id == '' else str(player_id)).fillna(names)
+
+
+class PlayerValueIndex(SQLiteStore):
+    """Per-pick rows plus incrementally maintained player/season aggregates."""
+
+    def __init__(self, path=VALUE_INDEX_PATH):
+        super().__init__(path)
+        diff_columns = ', '.join(f'adp_{s} REAL, round_diff_{s} REAL' for s in ADP_SOURCES)
+        conn = self._connect()
+        with conn:
+            conn.executescript(
+                f"""
+                CREATE TABLE IF NOT EXISTS draft_picks (
+                    draft_id TEXT NOT NULL,
+                    pick_no INTEGER NOT NULL,
+                    league_id TEXT,
+                    season TEXT,
+                    player_key TEXT NOT NULL,
+                    full_name TEXT,
+                    position TEXT,
+                    team_name TEXT,
+                    round INTEGER,
+                    {diff_columns},
+                    PRIMARY KEY (draft_id, pick_no)
+                );
+                CREATE INDEX IF NOT EXISTS draft_picks_player ON draft_picks (player_key, season, league_id);
+                CREATE INDEX IF NOT EXISTS draft_picks_name ON draft_picks (full_name);
+                CREATE TABLE IF NOT EXISTS player_season (
+                    player_key TEXT NOT NULL,
+                    season TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    full_name TEXT,
+                    position TEXT,
+                    drafts INTEGER NOT NULL,
+                    leagues INTEGER NOT NULL,
+                    sum_pick REAL NOT NULL,
+                    min_pick INTEGER,
+                    max_pick INTEGER,
+                    sum_round REAL NOT NULL,
+                    graded INTEGER NOT NULL,
+                    sum_round_diff REAL NOT NULL,
+                    min_round_diff REAL,
+                    max_round_diff REAL,
+                    mean_pick REAL,
+                    mean_round REAL,
+                    mean_round_diff REAL,
+                    PRIMARY KEY (player_key, season, source)
+                );
+                CREATE INDEX IF NOT EXISTS player_season_rank ON player_season (source, season, mean_round_diff);
+                CREATE INDEX IF NOT EXISTS player_season_rank_all ON player_season (source, mean_round_diff);
+                CREATE TABLE IF NOT EXISTS indexed_drafts (
+                    draft_id TEXT PRIMARY KEY,
+                    league_id TEXT,
+                    season TEXT,
+                    adp_version TEXT,
+                    indexed_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS migrations (
+                    name TEXT PRIMARY KEY,
+                    applied_at REAL NOT NULL
+                );
+                """
+            )
+            # Name keys used to fold nicknames; re-key those picks and recompute the aggregates once
+            if not conn.execute("SELECT 1 FROM migrations WHERE name = 'name_keys_keep_nicknames'").fetchone():
+                names = [name for (name,) in conn.execute(
+                    "SELECT DISTINCT full_name FROM draft_picks WHERE player_key LIKE 'name:%' AND full_name IS NOT NULL")]
+                conn.executemany("UPDATE draft_picks SET player_key = ? WHERE player_key LIKE 'name:%' AND full_name = ?",
+                                 [(name_key(name), name) for name in names])
+                self._rebuild(conn)
+                conn.execute("INSERT INTO migrations VALUES ('name_keys_keep_nicknames', ?)", (time.time(),))
+
+    # ADP version a draft was indexed with, or None if it isn't indexed
+    def indexed_version(self, draft_id):
+        row = self._connect().execute('SELECT adp_version FROM indexed_drafts WHERE draft_id = ?', (str(draft_id),)).fetchone()
+        return row[0] if row else None
+
+    # Add (or replace) one graded draft and re-aggregate only the players it touches
+    def add_draft(self, graded, draft_id, league_id=None, season=None, adp_version=None):
+        draft_id, season = str(draft_id), str(season or '')
+        rows = pd.DataFrame({
+            'draft_id': draft_id,
+            'pick_no': graded['pick_no'].astype(int),
+            'league_id': None if league_id is None else str(league_id),
+            'season': season,
+            'player_key': player_keys(graded),
+            'full_name': graded['full_name'],
+            'position': graded['position'],
+            'team_name': graded['team_name'] if 'team_name' in graded else None,
+            'round': graded['round'].astype(int),
+        })
+        for source in ADP_SOURCES:
+            rows[f'adp_{source}'] = graded[f'adp_{source}'].astype(float)
+            rows[f'round_diff_{source}'] = graded[f'round_diff_{source}'].astype(float)
+        records = list(rows.astype(object).where(rows.notna(), None).itertuples(index=False, name=None))
+
+        conn = self._connect()
+        with conn:
+            if conn.execute('SELECT 1 FROM indexed_drafts WHERE draft_id = ?', (draft_id,)).fetchone():
+                self._remove(conn, draft_id)
+            conn.executemany(
+                f"INSERT INTO draft_picks ({', '.join(rows.columns)}) VALUES ({', '.join('?' * len(rows.columns))})",
+                records,
+            )
+            self._accumulate(conn, draft_id)
+            conn.execute(
+                'INSERT OR REPLACE INTO indexed_drafts VALUES (?, ?, ?, ?, ?)',
+                (draft_id, None if league_id is None else str(league_id), season, adp_version, time.time()),
+            )
+        return len(records)
+
+    # Remove a draft's picks and re-aggregate its players
+    def remove_draft(self, draft_id):
+        conn = self._connect()
+        with conn:
+            self._remove(conn, str(draft_id))
+
+    # Fold one newly inserted draft into the running sums; one primary-key upsert per pick and source
+    def _accumulate(self, conn, draft_id):
+        for source in ADP_SOURCES:
+            diff = f'p.round_diff_{source}'
+            conn.execute(
+                f"""
+                INSERT INTO player_season
+                SELECT p.player_key, p.season, ?, p.full_name, p.position, 1,
+                       NOT EXISTS (SELECT 1 FROM draft_picks o WHERE o.player_key = p.player_key AND o.season = p.season
+                                   AND o.league_id IS p.league_id AND o.draft_id != p.draft_id),
+                       p.pick_no, p.pick_no, p.pick_no, p.round,
+                       {diff} IS NOT NULL, COALESCE({diff}, 0), {diff}, {diff},
+                       p.pick_no, p.round, {diff}
+                FROM draft_picks p WHERE p.draft_id = ?
+                ON CONFLICT (player_key, season, source) DO UPDATE SET
+                    drafts = drafts + 1,
+                    leagues = leagues + excluded.leagues,
+                    sum_pick = sum_pick + excluded.sum_pick,
+                    min_pick = MIN(min_pick, excluded.min_pick),
+                    max_pick = MAX(max_pick, excluded.max_pick),
+                    sum_round = sum_round + excluded.sum_round,
+                    graded = graded + excluded.graded,
+                    sum_round_diff = sum_round_diff + excluded.sum_round_diff,
+                    min_round_diff = COALESCE(MIN(min_round_diff, excluded.min_round_diff), min_round_diff, excluded.min_round_diff),
+                    max_round_diff = COALESCE(MAX(max_round_diff, excluded.max_round_diff), max_round_diff, excluded.max_round_diff),
+                    mean_pick = (sum_pick + excluded.sum_pick) / (drafts + 1),
+                    mean_round = (sum_round + excluded.sum_round) / (drafts + 1),
+                    mean_round_diff = (sum_round_diff + excluded.sum_round_diff) / NULLIF(graded + excluded.graded, 0)
+                """,
+                (source, draft_id),
+            )
+
+    # Take a draft back out of the running sums; min/max are rescanned only where the draft held the bound
+    def _remove(self, conn, draft_id):
+        for source in ADP_SOURCES:
+            diff = f'p.round_diff_{source}'
+            conn.execute(
+                f"""
+                UPDATE player_season AS ps SET
+                    drafts = drafts - 1,
+                    leagues = leagues - (NOT EXISTS (
+                        SELECT 1 FROM draft_picks o WHERE o.player_key = p.player_key AND o.season = p.season
+                        AND o.league_id IS p.league_id AND o.draft_id != p.draft_id)),
+                    sum_pick = sum_pick - p.pick_no,
+                    sum_round = sum_round - p.round,
+                    graded = graded - ({diff} IS NOT NULL),
+                    sum_round_diff = sum_round_diff - COALESCE({diff}, 0),
+                    min_pick = CASE WHEN p.pick_no = min_pick THEN NULL ELSE min_pick END,
+                    max_pick = CASE WHEN p.pick_no = max_pick THEN NULL ELSE max_pick END,
+                    min_round_diff = CASE WHEN {diff} = min_round_diff THEN NULL ELSE min_round_diff END,
+                    max_round_diff = CASE WHEN {diff} = max_round_diff THEN NULL ELSE max_round_diff END,
+                    mean_pick = (sum_pick - p.pick_no) / NULLIF(drafts - 1, 0),
+                    mean_round = (sum_round - p.round) / NULLIF(drafts - 1, 0),
+                    mean_round_diff = (sum_round_diff - COALESCE({diff}, 0)) / NULLIF(graded - ({diff} IS NOT NULL), 0)
+                FROM draft_picks p
+                WHERE p.draft_id = ? AND ps.player_key = p.player_key AND ps.season = p.season AND ps.source = ?
+                """,
+                (draft_id, source),
+            )
+        conn.execute('DELETE FROM draft_picks WHERE draft_id = ?', (draft_id,))
+        conn.execute('DELETE FROM indexed_drafts WHERE draft_id = ?', (draft_id,))
+        conn.execute('DELETE FROM player_season WHERE drafts = 0')
+
+        # Bounds cleared above are rescanned from the player's remaining picks
+        for source in ADP_SOURCES:
+            scan = f"FROM draft_picks o WHERE o.player_key = player_season.player_key AND o.season = player_season.season"
+            conn.execute(
+                f"""
+                UPDATE player_season SET
+                    min_pick = COALESCE(min_pick, (SELECT MIN(o.pick_no) {scan})),
+                    max_pick = COALESCE(max_pick, (SELECT MAX(o.pick_no) {scan})),
+                    min_round_diff = COALESCE(min_round_diff, (SELECT MIN(o.round_diff_{source}) {scan})),
+                    max_round_diff = COALESCE(max_round_diff, (SELECT MAX(o.round_diff_{source}) {scan}))
+                WHERE source = ? AND (min_pick IS NULL OR max_pick IS NULL
+                    OR (graded > 0 AND (min_round_diff IS NULL OR max_round_diff IS NULL)))
+                """,
+                (source,),
+            )
+
+    # Recompute every player/season aggregate from draft_picks (the running sums, from scratch)
+    def rebuild(self):
+        conn = self._connect()
+        with conn:
+            self._rebuild(conn)
+
+    def _rebuild(self, conn):
+        conn.execute('DELETE FROM player_season')
+        for source in ADP_SOURCES:
+            diff = f'round_diff_{source}'
+            conn.execute(
+                f"""
+                INSERT INTO player_season
+                SELECT player_key, season, ?, MIN(full_name), MIN(position), COUNT(*),
+                       COUNT(DISTINCT league_id) + MAX(league_id IS NULL),
+                       SUM(pick_no), MIN(pick_no), MAX(pick_no), SUM(round),
+                       COUNT({diff}), COALESCE(SUM({diff}), 0), MIN({diff}), MAX({diff}),
+                       AVG(pick_no), AVG(round), AVG({diff})
+                FROM draft_picks GROUP BY player_key, season
+                """,
+                (source,),
+            )
+
+    def _ranked(self, order, season, source, limit, min_drafts):
+        query = 'SELECT * FROM player_season WHERE source = ? AND mean_round_diff IS NOT NULL AND drafts >= ?'
+        args = [source, min_drafts]
+        if season is not None:
+            query += ' AND season = ?'
+            args.append(str(season))
+        query += f' ORDER BY mean_round_diff {order} LIMIT ?'
+        return pd.read_sql_query(query, self._connect(), params=args + [limit])
+
+    # Players who went furthest after their ADP on average
+    def top_values(self, season=None, source='Sleeper', limit=25, min_drafts=1):
+        return self._ranked('ASC', season, source, limit, min_drafts)
+
+    # Players who went furthest before their ADP on average
+    def biggest_reaches(self, season=None, source='Sleeper', limit=25, min_drafts=1):
+        return self._ranked('DESC', season, source, limit, min_drafts)
+
+    # Every indexed pick of a player, by Sleeper player_id or name
+    def player_history(self, player):
+        key = str(player) if str(player).isdigit() else name_key(player)
+        return pd.read_sql_query(
+            'SELECT * FROM draft_picks WHERE player_key = ? OR full_name = ? ORDER BY season, league_id',
+            self._connect(), params=(key, str(player)),
+        )
+
+    # Per-season summary of one player across every league (one row per season and source)
+    def player_seasons(self, player_key):
+        return pd.read_sql_query(
+            'SELECT * FROM player_season WHERE player_key = ? ORDER BY season, source', self._connect(), params=(str(player_key),)
+        )
+
+
+if __name__ == '__main__':
+    index = PlayerValueIndex()
+    command = sys.argv[1] if len(sys.argv) > 1 else 'values'
+    pd.set_option('display.width', 200)
+    columns = ['full_name', 'position', 'season', 'drafts', 'leagues', 'mean_pick', 'mean_round', 'mean_round_diff']
+    if command == 'player':
+        print(index.player_history(sys.argv[2]).to_string(index=False))
+    elif command == 'reaches':
+        print(index.biggest_reaches(sys.argv[2] if len(sys.argv) > 2 else None)[columns].to_string(index=False))
+    else:
+        print(index.top_values(sys.argv[2] if len(sys.argv) > 2 else None)[columns].to_string(index=False))